@@ -294,6 +294,34 @@ resume_retries: Callable[..., Option] = partial(
     "(default: %default)",
 )
 
+
+def _handle_download_concurrency(
+    option: Option, opt_str: str, value: int, parser: OptionParser
+) -> None:
+    """
+    Handle a provided --download-concurrency value.
+    """
+    # More connections than this aren't kept open for reuse by the session.
+    if not 1 <= value <= 10:
+        msg = f"invalid --download-concurrency value: {value!r}: must be 1 to 10"
+        raise_option_error(parser, option=option, msg=msg)
+
+    parser.values.download_concurrency = value
+
+
+download_concurrency: Callable[..., Option] = partial(
+    Option,
+    "--download-concurrency",
+    dest="download_concurrency",
+    metavar="n",
+    action="callback",
+    callback=_handle_download_concurrency,
+    type="int",
+    default=1,
+    help="Maximum number of files to download at once, from 1 to 10, when "
+    "several are needed after resolving with metadata only. (default: %default)",
+)
+
 timeout: Callable[..., Option] = partial(
     Option,
     "--timeout",
@@ -1067,6 +1095,7 @@ use_new_feature: Callable[..., Option] = partial(
     default=[],
     choices=[
         "fast-deps",
+        "parallel-index",
     ]
     + ALWAYS_ENABLED_FEATURES,
     help="Enable new functionality, that may be backward incompatible.",
@@ -1119,6 +1148,7 @@ general_group: Dict[str, Any] = {
         use_new_feature,
         use_deprecated_feature,
         resume_retries,
+        download_concurrency,
     ],
 }
 
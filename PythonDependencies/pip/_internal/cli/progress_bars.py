@@ -1,6 +1,16 @@
 import functools
 import sys
-from typing import Callable, Generator, Iterable, Iterator, Optional, Tuple, TypeVar
+import threading
+from typing import (
+    Any,
+    Callable,
+    Generator,
+    Iterable,
+    Iterator,
+    Optional,
+    Tuple,
+    TypeVar,
+)
 
 from pip._vendor.rich.progress import (
     BarColumn,
@@ -108,6 +118,107 @@ def _raw_progress_bar(
         yield chunk
 
 
+class BatchDownloadProgress:
+    """Render the progress of several downloads running at once.
+
+    The default bar shows a row for the whole batch and one for each running
+    download, while the raw bar reports the bytes of the whole batch. Use it
+    as a context manager around the downloads, which may run in any thread.
+    """
+
+    def __init__(self, *, bar_type: str, count: int) -> None:
+        self._bar_type = bar_type
+        self._count = count
+        self._finished = 0
+        self._current = 0
+        self._total = 0
+        self._lock = threading.Lock()
+        self._rate_limiter = RateLimiter(0.25)
+        self._progress: Optional[Progress] = None
+        if bar_type == "on":
+            self._progress = Progress(
+                TextColumn("[progress.description]{task.description}"),
+                BarColumn(),
+                DownloadColumn(),
+                TransferSpeedColumn(),
+                TextColumn("eta"),
+                TimeRemainingColumn(),
+                refresh_per_second=5,
+                console=get_console(),
+            )
+            self._batch_task = self._progress.add_task(
+                self._batch_description(), total=None
+            )
+
+    def __enter__(self) -> "BatchDownloadProgress":
+        if self._progress is not None:
+            self._progress.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if self._progress is not None:
+            self._progress.stop()
+
+    def _batch_description(self) -> str:
+        indent = " " * (get_indentation() + 2)
+        return f"{indent}{self._finished}/{self._count} files"
+
+    def _write_raw_progress(self) -> None:
+        sys.stdout.write(f"Progress {self._current} of {self._total}\n")
+        sys.stdout.flush()
+        self._rate_limiter.reset()
+
+    def track(
+        self,
+        iterable: Iterable[bytes],
+        *,
+        description: str,
+        size: Optional[int],
+        initial_progress: Optional[int] = None,
+    ) -> Generator[bytes, None, None]:
+        """Wrap the chunks of one download of the batch."""
+        if self._bar_type not in ("on", "raw"):
+            yield from iterable
+            return
+
+        with self._lock:
+            # A resumed download was already counted when it started.
+            if size and not initial_progress:
+                self._total += size
+            if self._progress is not None:
+                if self._total:
+                    self._progress.update(self._batch_task, total=self._total)
+                task_id = self._progress.add_task(
+                    " " * (get_indentation() + 4) + description,
+                    total=size,
+                    completed=initial_progress or 0,
+                )
+        try:
+            for chunk in iterable:
+                yield chunk
+                with self._lock:
+                    self._current += len(chunk)
+                    if self._progress is not None:
+                        self._progress.advance(task_id, len(chunk))
+                        self._progress.advance(self._batch_task, len(chunk))
+                    elif self._rate_limiter.ready():
+                        self._write_raw_progress()
+        finally:
+            if self._progress is not None:
+                self._progress.remove_task(task_id)
+
+    def finished(self) -> None:
+        """Record that one download of the batch is complete."""
+        with self._lock:
+            self._finished += 1
+            if self._progress is not None:
+                self._progress.update(
+                    self._batch_task, description=self._batch_description()
+                )
+            elif self._bar_type == "raw" and self._finished == self._count:
+                self._write_raw_progress()
+
+
 def get_download_progress_renderer(
     *, bar_type: str, size: Optional[int] = None, initial_progress: Optional[int] = None
 ) -> ProgressRenderer[bytes]:
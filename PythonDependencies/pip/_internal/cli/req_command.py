@@ -47,6 +47,10 @@ KEEPABLE_TEMPDIR_TYPES = [
     tempdir_kinds.REQ_BUILD,
 ]
 
+# Threads fetching index pages with --use-feature=parallel-index. This stays
+# below the number of connections a PipSession keeps open to each host.
+INDEX_PREFETCH_WORKERS = 8
+
 
 def with_cleanup(func: Any) -> Any:
     """Decorator for common logic related to managing temporary
@@ -145,6 +149,7 @@ class RequirementCommand(IndexGroupCommand):
             verbosity=verbosity,
             legacy_resolver=legacy_resolver,
             resume_retries=options.resume_retries,
+            download_concurrency=options.download_concurrency,
         )
 
     @classmethod
@@ -339,9 +344,14 @@ class RequirementCommand(IndexGroupCommand):
             prefer_binary=options.prefer_binary,
             ignore_requires_python=ignore_requires_python,
         )
+        if "parallel-index" in options.features_enabled:
+            prefetch_workers = INDEX_PREFETCH_WORKERS
+        else:
+            prefetch_workers = 0
 
         return PackageFinder.create(
             link_collector=link_collector,
             selection_prefs=selection_prefs,
             target_python=target_python,
+            prefetch_workers=prefetch_workers,
         )
@@ -97,9 +97,11 @@ class CacheCommand(Command):
         http_cache_location = self._cache_dir(options, "http-v2")
         old_http_cache_location = self._cache_dir(options, "http")
         wheels_cache_location = self._cache_dir(options, "wheels")
+        links_cache_location = self._cache_dir(options, "links-v1")
         http_cache_size = filesystem.format_size(
             filesystem.directory_size(http_cache_location)
             + filesystem.directory_size(old_http_cache_location)
+            + filesystem.directory_size(links_cache_location)
         )
         wheels_cache_size = filesystem.format_directory_size(wheels_cache_location)
 
@@ -200,8 +202,12 @@ class CacheCommand(Command):
     def _find_http_files(self, options: Values) -> List[str]:
         old_http_dir = self._cache_dir(options, "http")
         new_http_dir = self._cache_dir(options, "http-v2")
-        return filesystem.find_files(old_http_dir, "*") + filesystem.find_files(
-            new_http_dir, "*"
+        # The links parsed from index pages are cached along with the pages.
+        links_dir = self._cache_dir(options, "links-v1")
+        return (
+            filesystem.find_files(old_http_dir, "*")
+            + filesystem.find_files(new_http_dir, "*")
+            + filesystem.find_files(links_dir, "*")
         )
 
     def _find_wheels(self, options: Values, pattern: str) -> List[str]:
@@ -226,6 +226,19 @@ class InstallCommand(RequirementCommand):
             help="Do not compile Python source files to bytecode",
         )
 
+        self.cmd_opts.add_option(
+            "--compile-workers",
+            dest="compile_workers",
+            type="int",
+            default=1,
+            metavar="n",
+            help=(
+                "Number of processes to compile Python source files to bytecode "
+                "with. With more than one, packages are compiled while the next "
+                "ones are installed. (default: %default)"
+            ),
+        )
+
         self.cmd_opts.add_option(
             "--no-warn-script-location",
             action="store_false",
@@ -275,6 +288,8 @@ class InstallCommand(RequirementCommand):
     def run(self, options: Values, args: List[str]) -> int:
         if options.use_user_site and options.target_dir is not None:
             raise CommandError("Can not combine '--user' and '--target'")
+        if options.compile_workers < 1:
+            raise CommandError("--compile-workers must be at least 1")
 
         # Check whether the environment we're installing into is externally
         # managed, as specified in PEP 668. Specifying --root, --target, or
@@ -466,6 +481,7 @@ class InstallCommand(RequirementCommand):
                 use_user_site=options.use_user_site,
                 pycompile=options.compile,
                 progress_bar=options.progress_bar,
+                compile_workers=options.compile_workers,
             )
 
             lib_locations = get_lib_location_guesses(
@@ -5,6 +5,7 @@ The main purpose of this module is to expose LinkCollector.collect_sources().
 import collections
 import email.message
 import functools
+import hashlib
 import itertools
 import json
 import logging
@@ -15,6 +16,7 @@ from dataclasses import dataclass
 from html.parser import HTMLParser
 from optparse import Values
 from typing import (
+    Any,
     Callable,
     Dict,
     Iterable,
@@ -35,10 +37,12 @@ from pip._vendor.requests.exceptions import RetryError, SSLError
 from pip._internal.exceptions import NetworkConnectionError
 from pip._internal.models.link import Link
 from pip._internal.models.search_scope import SearchScope
+from pip._internal.network.cache import suppressed_cache_errors
 from pip._internal.network.session import PipSession
 from pip._internal.network.utils import raise_for_status
+from pip._internal.utils.filesystem import adjacent_tmp_file, replace
 from pip._internal.utils.filetypes import is_archive_file
-from pip._internal.utils.misc import redact_auth_from_url
+from pip._internal.utils.misc import ensure_dir, redact_auth_from_url
 from pip._internal.vcs import vcs
 
 from .sources import CandidatesFromPage, LinkSource, build_source
@@ -258,6 +262,8 @@ class IndexContent:
     :param cache_link_parsing: whether links parsed from this page's url
                                should be cached. PyPI index urls should
                                have this set to False, for example.
+    :param etag: the ETag of the response, if any.
+    :param last_modified: the Last-Modified date of the response, if any.
     """
 
     content: bytes
@@ -265,6 +271,8 @@ class IndexContent:
     encoding: Optional[str]
     url: str
     cache_link_parsing: bool = True
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
 
     def __str__(self) -> str:
         return redact_auth_from_url(self.url)
@@ -318,6 +326,8 @@ def _make_index_content(
         encoding=encoding,
         url=response.url,
         cache_link_parsing=cache_link_parsing,
+        etag=response.headers.get("ETag"),
+        last_modified=response.headers.get("Last-Modified"),
     )
 
 
@@ -382,6 +392,80 @@ def _get_index_content(link: Link, *, session: PipSession) -> Optional["IndexCon
     return None
 
 
+class LinkTableCache:
+    """
+    A file based cache of the links parsed from index pages.
+
+    Each entry holds the links of one page, and is only used for a response
+    with the same URL, Content-Type and validators (ETag or Last-Modified)
+    as the one it was parsed from. A page that the HTTP cache revalidated
+    with a 304 therefore isn't parsed again.
+    """
+
+    # Bump this when the layout of the entries changes.
+    VERSION = 1
+
+    def __init__(self, directory: str) -> None:
+        assert directory is not None, "Cache directory must not be None."
+        self.directory = directory
+
+    def _get_cache_path(self, page: IndexContent) -> str:
+        key = f"{page.url}\n{page.content_type}"
+        hashed = hashlib.sha224(key.encode("utf-8")).hexdigest()
+        parts = list(hashed[:5]) + [hashed]
+        return os.path.join(self.directory, *parts)
+
+    def _header(self, page: IndexContent) -> Optional[List[Any]]:
+        # Pages without validators can't be told apart from a changed page,
+        # and the Last-Modified of a local file is only precise to the second.
+        if page.etag is None and page.last_modified is None:
+            return None
+        if not page.url.startswith(("http:", "https:")):
+            return None
+        return [
+            self.VERSION,
+            page.url,
+            page.content_type,
+            page.etag,
+            page.last_modified,
+        ]
+
+    def get(self, page: IndexContent) -> Optional[List[Link]]:
+        """Return the links of the page, if they are in the cache."""
+        header = self._header(page)
+        if header is None:
+            return None
+        data = None
+        with suppressed_cache_errors():
+            with open(self._get_cache_path(page), "rb") as f:
+                data = f.read()
+        if data is None:
+            return None
+        try:
+            entry = json.loads(data)
+            if entry[:-1] != header:
+                return None
+            return [Link.from_cache_row(row, comes_from=page.url) for row in entry[-1]]
+        except (ValueError, TypeError, LookupError):
+            logger.debug("Ignoring invalid link cache entry for %s", page)
+            return None
+
+    def set(self, page: IndexContent, links: List[Link]) -> None:
+        """Store the links parsed from the page."""
+        header = self._header(page)
+        if header is None:
+            return
+        entry = header + [[link.as_cache_row() for link in links]]
+        data = json.dumps(entry, separators=(",", ":")).encode("utf-8")
+
+        path = self._get_cache_path(page)
+        with suppressed_cache_errors():
+            ensure_dir(os.path.dirname(path))
+            with adjacent_tmp_file(path) as f:
+                f.write(data)
+            replace(f.name, path)
+
+
 class CollectedSources(NamedTuple):
     find_links: Sequence[Optional[LinkSource]]
     index_urls: Sequence[Optional[LinkSource]]
@@ -399,9 +483,14 @@ class LinkCollector:
         self,
         session: PipSession,
         search_scope: SearchScope,
+        link_cache: Optional[LinkTableCache] = None,
     ) -> None:
         self.search_scope = search_scope
         self.session = session
+        self.link_cache = link_cache
+        # Pages of --find-links are fetched again for each project, so their
+        # links are kept in memory too, as parse_links() does without a cache.
+        self._parse_cached_links = with_cached_index_content(self._load_links)
 
     @classmethod
     def create(
@@ -431,9 +520,13 @@ class LinkCollector:
             index_urls=index_urls,
             no_index=options.no_index,
         )
+        link_cache = None
+        if options.cache_dir:
+            link_cache = LinkTableCache(os.path.join(options.cache_dir, "links-v1"))
         link_collector = LinkCollector(
             session=session,
             search_scope=search_scope,
+            link_cache=link_cache,
         )
         return link_collector
 
@@ -447,6 +540,23 @@ class LinkCollector:
         """
         return _get_index_content(location, session=self.session)
 
+    def parse_links(self, page: IndexContent) -> List[Link]:
+        """
+        Return the links of a page fetched by fetch_response(), using the
+        cached links when the page didn't change since they were parsed.
+        """
+        if self.link_cache is None:
+            return list(parse_links(page))
+        return list(self._parse_cached_links(page))
+
+    def _load_links(self, page: IndexContent) -> List[Link]:
+        assert self.link_cache is not None
+        links = self.link_cache.get(page)
+        if links is None:
+            links = list(parse_links(page))
+            self.link_cache.set(page, links)
+        return links
+
     def collect_sources(
         self,
         project_name: str,
@@ -5,6 +5,7 @@ import functools
 import itertools
 import logging
 import re
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import (
     TYPE_CHECKING,
@@ -30,14 +31,14 @@ from pip._internal.exceptions import (
     InvalidWheelFilename,
     UnsupportedWheel,
 )
-from pip._internal.index.collector import LinkCollector, parse_links
+from pip._internal.index.collector import LinkCollector
 from pip._internal.models.candidate import InstallationCandidate
 from pip._internal.models.format_control import FormatControl
 from pip._internal.models.link import Link
 from pip._internal.models.search_scope import SearchScope
 from pip._internal.models.selection_prefs import SelectionPreferences
 from pip._internal.models.target_python import TargetPython
-from pip._internal.models.wheel import Wheel
+from pip._internal.models.wheel import Wheel, peek_wheel_filename
 from pip._internal.req import InstallRequirement
 from pip._internal.utils._log import getLogger
 from pip._internal.utils.filetypes import WHEEL_EXTENSION
@@ -116,6 +117,17 @@ class LinkType(enum.Enum):
     requires_python_mismatch = enum.auto()
 
 
+def _unsupported_wheel_tags(file_tags: Iterable[Tag]) -> Tuple[LinkType, str]:
+    # Include the wheel's tags in the reason string to simplify
+    # troubleshooting compatibility issues.
+    formatted_tags = ", ".join(sorted(str(tag) for tag in file_tags))
+    reason = (
+        f"none of the wheel's tags ({formatted_tags}) are compatible "
+        f"(run pip debug --verbose to show compatible tags)"
+    )
+    return (LinkType.platform_mismatch, reason)
+
+
 class LinkEvaluator:
     """
     Responsible for evaluating links for a particular project.
@@ -197,6 +209,17 @@ class LinkEvaluator:
             if "macosx10" in link.path and ext == ".zip":
                 return (LinkType.format_unsupported, "macosx10 one")
             if ext == WHEEL_EXTENSION:
+                supported_tags = self._target_python.get_unsorted_tags()
+                # Most wheels of a project with many of them are built for
+                # other platforms, so skip those before parsing their version.
+                peeked = peek_wheel_filename(link.filename)
+                if (
+                    peeked is not None
+                    and peeked[0] == self._canonical_name
+                    and supported_tags.isdisjoint(peeked[1])
+                ):
+                    return _unsupported_wheel_tags(peeked[1])
+
                 try:
                     wheel = Wheel(link.filename)
                 except InvalidWheelFilename:
@@ -208,16 +231,8 @@ class LinkEvaluator:
                     reason = f"wrong project name (not {self.project_name})"
                     return (LinkType.different_project, reason)
 
-                supported_tags = self._target_python.get_unsorted_tags()
                 if not wheel.supported(supported_tags):
-                    # Include the wheel's tags in the reason string to
-                    # simplify troubleshooting compatibility issues.
-                    file_tags = ", ".join(wheel.get_formatted_file_tags())
-                    reason = (
-                        f"none of the wheel's tags ({file_tags}) are compatible "
-                        f"(run pip debug --verbose to show compatible tags)"
-                    )
-                    return (LinkType.platform_mismatch, reason)
+                    return _unsupported_wheel_tags(wheel.file_tags)
 
                 version = wheel.version
 
@@ -410,6 +425,7 @@ class CandidateEvaluator:
             prefer_binary=prefer_binary,
             allow_all_prereleases=allow_all_prereleases,
             hashes=hashes,
+            tag_priorities=target_python.get_tag_priorities(),
         )
 
     def __init__(
@@ -420,10 +436,14 @@ class CandidateEvaluator:
         prefer_binary: bool = False,
         allow_all_prereleases: bool = False,
         hashes: Optional[Hashes] = None,
+        tag_priorities: Optional[Dict[Tag, int]] = None,
     ) -> None:
         """
         :param supported_tags: The PEP 425 tags supported by the target
             Python in order of preference (most preferred first).
+        :param tag_priorities: An optional mapping from each of the
+            supported_tags to its index, as TargetPython.get_tag_priorities()
+            returns, to share between evaluators.
         """
         self._allow_all_prereleases = allow_all_prereleases
         self._hashes = hashes
@@ -434,9 +454,9 @@ class CandidateEvaluator:
         # Since the index of the tag in the _supported_tags list is used
         # as a priority, precompute a map from tag to index/priority to be
         # used in wheel.find_most_preferred_tag.
-        self._wheel_tag_preferences = {
-            tag: idx for idx, tag in enumerate(supported_tags)
-        }
+        if tag_priorities is None:
+            tag_priorities = {tag: idx for idx, tag in enumerate(supported_tags)}
+        self._wheel_tag_preferences = tag_priorities
 
     def get_applicable_candidates(
         self,
@@ -584,6 +604,7 @@ class PackageFinder:
         format_control: Optional[FormatControl] = None,
         candidate_prefs: Optional[CandidatePreferences] = None,
         ignore_requires_python: Optional[bool] = None,
+        prefetch_workers: int = 0,
     ) -> None:
         """
         This constructor is primarily meant to be used by the create() class
@@ -594,6 +615,8 @@ class PackageFinder:
             the index and links.
         :param candidate_prefs: Options to use when creating a
             CandidateEvaluator object.
+        :param prefetch_workers: The number of threads prefetch() finds
+            candidates on. If 0 (the default), prefetch() does nothing.
         """
         if candidate_prefs is None:
             candidate_prefs = CandidatePreferences()
@@ -613,6 +636,10 @@ class PackageFinder:
 
         # Cache of the result of finding candidates
         self._all_candidates: Dict[str, List[InstallationCandidate]] = {}
+        # Candidates being found in the background, see prefetch()
+        self._prefetch_workers = prefetch_workers
+        self._prefetch_executor: Optional[ThreadPoolExecutor] = None
+        self._prefetched: Dict[str, Future[List[InstallationCandidate]]] = {}
         self._best_candidates: Dict[
             Tuple[str, Optional[specifiers.BaseSpecifier], Optional[Hashes]],
             BestCandidateResult,
@@ -628,6 +655,7 @@ class PackageFinder:
         link_collector: LinkCollector,
         selection_prefs: SelectionPreferences,
         target_python: Optional[TargetPython] = None,
+        prefetch_workers: int = 0,
     ) -> "PackageFinder":
         """Create a PackageFinder.
 
@@ -636,6 +664,8 @@ class PackageFinder:
         :param target_python: The target Python interpreter to use when
             checking compatibility. If None (the default), a TargetPython
             object will be constructed from the running Python.
+        :param prefetch_workers: The number of threads prefetch() finds
+            candidates on. If 0 (the default), prefetch() does nothing.
         """
         if target_python is None:
             target_python = TargetPython()
@@ -652,12 +682,17 @@ class PackageFinder:
             allow_yanked=selection_prefs.allow_yanked,
             format_control=selection_prefs.format_control,
             ignore_requires_python=selection_prefs.ignore_requires_python,
+            prefetch_workers=prefetch_workers,
         )
 
     @property
     def target_python(self) -> TargetPython:
         return self._target_python
 
+    @property
+    def prefetch_workers(self) -> int:
+        return self._prefetch_workers
+
     @property
     def search_scope(self) -> SearchScope:
         return self._link_collector.search_scope
@@ -802,7 +837,7 @@ class PackageFinder:
         if index_response is None:
             return []
 
-        page_links = list(parse_links(index_response))
+        page_links = self._link_collector.parse_links(index_response)
 
         with indent_log():
             package_links = self.evaluate_links(
@@ -824,6 +859,21 @@ class PackageFinder:
         if project_name in self._all_candidates:
             return self._all_candidates[project_name]
 
+        candidates = None
+        future = self._prefetched.pop(project_name, None)
+        if future is not None:
+            try:
+                candidates = future.result()
+            except Exception:
+                # Find them again below, so that the error is raised here.
+                logger.debug("Prefetching %s failed", project_name, exc_info=True)
+        if candidates is None:
+            candidates = self._find_all_candidates(project_name)
+
+        self._all_candidates[project_name] = candidates
+        return candidates
+
+    def _find_all_candidates(self, project_name: str) -> List[InstallationCandidate]:
         link_evaluator = self.make_link_evaluator(project_name)
 
         collected_sources = self._link_collector.collect_sources(
@@ -865,9 +915,49 @@ class PackageFinder:
             logger.debug("Local files found: %s", ", ".join(paths))
 
         # This is an intentional priority ordering
-        self._all_candidates[project_name] = file_candidates + page_candidates
+        return file_candidates + page_candidates
 
-        return self._all_candidates[project_name]
+    def prefetch(self, project_names: Iterable[str]) -> None:
+        """Start finding the candidates of project_names in the background
+
+        The index pages of the projects are fetched concurrently, sharing the
+        session's connection pool, and find_all_candidates() picks the
+        results up instead of fetching the pages itself. This does nothing
+        unless the finder was created with prefetch_workers. It must only be
+        called from the thread calling find_all_candidates().
+        """
+        if not self._prefetch_workers:
+            return
+        names = [
+            name
+            for name in dict.fromkeys(project_names)
+            if name not in self._all_candidates and name not in self._prefetched
+        ]
+        if not names:
+            return
+        if not self._all_candidates:
+            # Fetch one project in the foreground first, so that credentials
+            # the index asks for are only prompted for once.
+            self.find_all_candidates(names.pop(0))
+
+        if self._prefetch_executor is None:
+            self._prefetch_executor = ThreadPoolExecutor(
+                max_workers=self._prefetch_workers,
+                thread_name_prefix="pip-prefetch",
+            )
+        for name in names:
+            self._prefetched[name] = self._prefetch_executor.submit(
+                self._find_all_candidates, name
+            )
+
+    def stop_prefetching(self) -> None:
+        """Cancel the prefetches that haven't started yet, and drop the results
+        of the others.
+        """
+        if self._prefetch_executor is not None:
+            self._prefetch_executor.shutdown(wait=False, cancel_futures=True)
+            self._prefetch_executor = None
+        self._prefetched.clear()
 
     def make_candidate_evaluator(
         self,
@@ -1,3 +1,4 @@
+import functools
 from dataclasses import dataclass
 
 from pip._vendor.packaging.version import Version
@@ -6,6 +7,13 @@ from pip._vendor.packaging.version import parse as parse_version
 from pip._internal.models.link import Link
 
 
+@functools.lru_cache(maxsize=10000)
+def _parse_version(version: str) -> Version:
+    # A project has many files for each of its versions. Versions are
+    # immutable, so the candidates of one version can share one.
+    return parse_version(version)
+
+
 @dataclass(frozen=True)
 class InstallationCandidate:
     """Represents a potential "candidate" for installation."""
@@ -18,7 +26,7 @@ class InstallationCandidate:
 
     def __init__(self, name: str, version: str, link: Link) -> None:
         object.__setattr__(self, "name", name)
-        object.__setattr__(self, "version", parse_version(version))
+        object.__setattr__(self, "version", _parse_version(version))
         object.__setattr__(self, "link", link)
 
     def __str__(self) -> str:
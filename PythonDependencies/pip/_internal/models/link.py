@@ -14,6 +14,7 @@ from typing import (
     Mapping,
     NamedTuple,
     Optional,
+    Sequence,
     Tuple,
     Union,
 )
@@ -374,6 +375,64 @@ class Link:
             metadata_file_data=metadata_file_data,
         )
 
+    def as_cache_row(self) -> List[Any]:
+        """
+        Return the state of the link as plain values, to be cached and passed
+        to from_cache_row() later.
+        """
+        if self.metadata_file_data is None:
+            metadata: Union[None, bool, Dict[str, str]] = None
+        else:
+            metadata = self.metadata_file_data.hashes or True
+        return [
+            self._url,
+            list(self._parsed_url),
+            self._path,
+            self._hashes,
+            self.requires_python,
+            self.yanked_reason,
+            metadata,
+            self.cache_link_parsing,
+            self.egg_fragment,
+        ]
+
+    @classmethod
+    def from_cache_row(
+        cls, row: Sequence[Any], comes_from: Optional[str] = None
+    ) -> "Link":
+        """
+        Recreate a link from the result of as_cache_row(), without parsing its
+        URL again.
+        """
+        (
+            url,
+            parsed_url,
+            path,
+            hashes,
+            requires_python,
+            yanked_reason,
+            metadata,
+            cache_link_parsing,
+            egg_fragment,
+        ) = row
+        link = cls.__new__(cls)
+        link._url = url
+        link._parsed_url = urllib.parse.SplitResult(*parsed_url)
+        link._path = path
+        link._hashes = hashes
+        link.comes_from = comes_from
+        link.requires_python = requires_python
+        link.yanked_reason = yanked_reason
+        if metadata is None:
+            link.metadata_file_data = None
+        elif metadata is True:
+            link.metadata_file_data = MetadataFile(None)
+        else:
+            link.metadata_file_data = MetadataFile(metadata)
+        link.cache_link_parsing = cache_link_parsing
+        link.egg_fragment = egg_fragment
+        return link
+
     def __str__(self) -> str:
         if self.requires_python:
             rp = f" (requires-python:{self.requires_python})"
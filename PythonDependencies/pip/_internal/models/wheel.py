@@ -2,11 +2,17 @@
 name that have meaning.
 """
 
+import functools
 import re
-from typing import Dict, Iterable, List, Optional
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
 
-from pip._vendor.packaging.tags import Tag
-from pip._vendor.packaging.utils import BuildTag, parse_wheel_filename
+from pip._vendor.packaging.tags import Tag, parse_tag
+from pip._vendor.packaging.utils import (
+    BuildTag,
+    NormalizedName,
+    canonicalize_name,
+    parse_wheel_filename,
+)
 from pip._vendor.packaging.utils import (
     InvalidWheelFilename as _PackagingInvalidWheelFilename,
 )
@@ -15,6 +21,39 @@ from pip._internal.exceptions import InvalidWheelFilename
 from pip._internal.utils.deprecation import deprecated
 
 
+@functools.lru_cache(maxsize=10000)
+def _parse_wheel_filename(filename: str) -> Tuple[str, str, BuildTag, FrozenSet[Tag]]:
+    # The same filenames are parsed when evaluating the links of a project and
+    # again when sorting its candidates, and parsing the version and tags of
+    # thousands of them is expensive.
+    name, version, build_tag, file_tags = parse_wheel_filename(filename)
+    return name, str(version), build_tag, file_tags
+
+
+@functools.lru_cache(maxsize=1000)
+def _parse_file_tags(tags: str) -> FrozenSet[Tag]:
+    # Most wheels of a project share their tags with many others.
+    return parse_tag(tags)
+
+
+def peek_wheel_filename(
+    filename: str,
+) -> Optional[Tuple[NormalizedName, FrozenSet[Tag]]]:
+    """Return the canonical name and the tags of a wheel filename without
+    parsing or validating its version, or None if it doesn't have the parts
+    of one.
+
+    This is much cheaper than creating a Wheel, so it can be used to skip the
+    wheels of a project built for other platforms.
+    """
+    if not filename.endswith(".whl"):
+        return None
+    parts = filename[: -len(".whl")].split("-")
+    if len(parts) not in (5, 6):
+        return None
+    return canonicalize_name(parts[0]), _parse_file_tags("-".join(parts[-3:]))
+
+
 class Wheel:
     """A wheel file"""
 
@@ -34,9 +73,8 @@ class Wheel:
         self._build_tag: Optional[BuildTag] = None
 
         try:
-            wheel_info = parse_wheel_filename(filename)
-            self.name, _version, self._build_tag, self.file_tags = wheel_info
-            self.version = str(_version)
+            wheel_info = _parse_wheel_filename(filename)
+            self.name, self.version, self._build_tag, self.file_tags = wheel_info
         except _PackagingInvalidWheelFilename as e:
             # Check if the wheel filename is in the legacy format
             legacy_wheel_info = self.legacy_wheel_file_re.match(filename)
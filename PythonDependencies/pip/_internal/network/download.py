@@ -1,24 +1,43 @@
 """Download files with progress indicators."""
 
 import email.message
+import hashlib
 import logging
 import mimetypes
 import os
+import threading
+from concurrent.futures import FIRST_EXCEPTION, Future, ThreadPoolExecutor, wait
 from http import HTTPStatus
-from typing import BinaryIO, Iterable, Optional, Tuple
+from typing import (
+    TYPE_CHECKING,
+    BinaryIO,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
 
 from pip._vendor.requests.models import Response
 from pip._vendor.urllib3.exceptions import ReadTimeoutError
 
-from pip._internal.cli.progress_bars import get_download_progress_renderer
+from pip._internal.cli.progress_bars import (
+    BatchDownloadProgress,
+    get_download_progress_renderer,
+)
 from pip._internal.exceptions import IncompleteDownloadError, NetworkConnectionError
 from pip._internal.models.index import PyPI
 from pip._internal.models.link import Link
 from pip._internal.network.cache import is_from_cache
 from pip._internal.network.session import PipSession
 from pip._internal.network.utils import HEADERS, raise_for_status, response_chunks
+from pip._internal.utils.hashes import Hashes
 from pip._internal.utils.misc import format_size, redact_auth_from_url, splitext
 
+if TYPE_CHECKING:
+    from hashlib import _Hash
+
 logger = logging.getLogger(__name__)
 
 
@@ -43,6 +62,7 @@ def _prepare_download(
     progress_bar: str,
     total_length: Optional[int],
     range_start: Optional[int] = 0,
+    batch_progress: Optional[BatchDownloadProgress] = None,
 ) -> Iterable[bytes]:
     if link.netloc == PyPI.file_storage_domain:
         url = link.show_url
@@ -82,6 +102,14 @@ def _prepare_download(
     if not show_progress:
         return chunks
 
+    if batch_progress is not None:
+        return batch_progress.track(
+            chunks,
+            description=link.filename,
+            size=total_length,
+            initial_progress=range_start,
+        )
+
     renderer = get_download_progress_renderer(
         bar_type=progress_bar, size=total_length, initial_progress=range_start
     )
@@ -155,12 +183,18 @@ def _http_get_download(
     return resp
 
 
+class _DownloadCancelled(Exception):
+    """Raised in a download of a batch that is being abandoned."""
+
+
 class Downloader:
     def __init__(
         self,
         session: PipSession,
         progress_bar: str,
         resume_retries: int,
+        batch_progress: Optional[BatchDownloadProgress] = None,
+        cancelled: Optional[threading.Event] = None,
     ) -> None:
         assert (
             resume_retries >= 0
@@ -168,9 +202,17 @@ class Downloader:
         self._session = session
         self._progress_bar = progress_bar
         self._resume_retries = resume_retries
+        self._batch_progress = batch_progress
+        self._cancelled = cancelled
 
-    def __call__(self, link: Link, location: str) -> Tuple[str, str]:
-        """Download the file given by link into location."""
+    def __call__(
+        self, link: Link, location: str, hashes: Optional[Hashes] = None
+    ) -> Tuple[str, str]:
+        """Download the file given by link into location.
+
+        If hashes are given, the file is checked against them as it arrives,
+        raising HashMismatch (or HashMissing) once it is complete.
+        """
         resp = _http_get_download(self._session, link)
         # NOTE: The original download size needs to be passed down everywhere
         # so if the download is resumed (with a HTTP Range request) the progress
@@ -181,16 +223,19 @@ class Downloader:
         filename = _get_http_response_filename(resp, link)
         filepath = os.path.join(location, filename)
 
+        hashers = hashes.new_hashers() if hashes else None
         with open(filepath, "wb") as content_file:
             bytes_received = self._process_response(
-                resp, link, content_file, 0, total_length
+                resp, link, content_file, 0, total_length, hashers
             )
             # If possible, check for an incomplete download and attempt resuming.
             if total_length and bytes_received < total_length:
                 self._attempt_resume(
-                    resp, link, content_file, total_length, bytes_received
+                    resp, link, content_file, total_length, bytes_received, hashers
                 )
 
+        if hashes and hashers is not None:
+            hashes.check_against_hashers(hashers)
         return filepath, content_type
 
     def _process_response(
@@ -200,24 +245,40 @@ class Downloader:
         content_file: BinaryIO,
         bytes_received: int,
         total_length: Optional[int],
+        hashers: Optional[Dict[str, "_Hash"]] = None,
     ) -> int:
         """Process the response and write the chunks to the file."""
         chunks = _prepare_download(
-            resp, link, self._progress_bar, total_length, range_start=bytes_received
+            resp,
+            link,
+            self._progress_bar,
+            total_length,
+            range_start=bytes_received,
+            batch_progress=self._batch_progress,
         )
         return self._write_chunks_to_file(
-            chunks, content_file, allow_partial=bool(total_length)
+            chunks, content_file, allow_partial=bool(total_length), hashers=hashers
         )
 
     def _write_chunks_to_file(
-        self, chunks: Iterable[bytes], content_file: BinaryIO, *, allow_partial: bool
+        self,
+        chunks: Iterable[bytes],
+        content_file: BinaryIO,
+        *,
+        allow_partial: bool,
+        hashers: Optional[Dict[str, "_Hash"]] = None,
     ) -> int:
         """Write the chunks to the file and return the number of bytes received."""
         bytes_received = 0
         try:
             for chunk in chunks:
+                if self._cancelled is not None and self._cancelled.is_set():
+                    raise _DownloadCancelled()
                 bytes_received += len(chunk)
                 content_file.write(chunk)
+                if hashers is not None:
+                    for hasher in hashers.values():
+                        hasher.update(chunk)
         except ReadTimeoutError as e:
             # If partial downloads are OK (the download will be retried), don't bail.
             if not allow_partial:
@@ -235,6 +296,7 @@ class Downloader:
         content_file: BinaryIO,
         total_length: Optional[int],
         bytes_received: int,
+        hashers: Optional[Dict[str, "_Hash"]] = None,
     ) -> None:
         """Attempt to resume the download if connection was dropped."""
         etag_or_last_modified = _get_http_response_etag_or_last_modified(resp)
@@ -265,11 +327,16 @@ class Downloader:
                 must_restart = resume_resp.status_code != HTTPStatus.PARTIAL_CONTENT
                 if must_restart:
                     bytes_received, total_length, etag_or_last_modified = (
-                        self._reset_download_state(resume_resp, content_file)
+                        self._reset_download_state(resume_resp, content_file, hashers)
                     )
 
                 bytes_received += self._process_response(
-                    resume_resp, link, content_file, bytes_received, total_length
+                    resume_resp,
+                    link,
+                    content_file,
+                    bytes_received,
+                    total_length,
+                    hashers,
                 )
             except (ConnectionError, ReadTimeoutError, OSError):
                 continue
@@ -285,10 +352,14 @@ class Downloader:
         self,
         resp: Response,
         content_file: BinaryIO,
+        hashers: Optional[Dict[str, "_Hash"]] = None,
     ) -> Tuple[int, Optional[int], Optional[str]]:
         """Reset the download state to restart downloading from the beginning."""
         content_file.seek(0)
         content_file.truncate()
+        if hashers is not None:
+            for hash_name in hashers:
+                hashers[hash_name] = hashlib.new(hash_name)
         bytes_received = 0
         total_length = _get_http_response_size(resp)
         etag_or_last_modified = _get_http_response_etag_or_last_modified(resp)
@@ -302,13 +373,70 @@ class BatchDownloader:
         session: PipSession,
         progress_bar: str,
         resume_retries: int,
+        concurrency: int = 1,
     ) -> None:
+        assert concurrency >= 1, "Download concurrency must be at least one"
+        self._session = session
+        self._progress_bar = progress_bar
+        self._resume_retries = resume_retries
+        self._concurrency = concurrency
         self._downloader = Downloader(session, progress_bar, resume_retries)
 
     def __call__(
-        self, links: Iterable[Link], location: str
+        self,
+        links: Iterable[Link],
+        location: str,
+        hashes: Optional[Mapping[Link, Hashes]] = None,
     ) -> Iterable[Tuple[Link, Tuple[str, str]]]:
-        """Download the files given by links into location."""
-        for link in links:
-            filepath, content_type = self._downloader(link, location)
-            yield link, (filepath, content_type)
+        """Download the files given by links into location.
+
+        Files are checked against the hashes given for their link, if any, as
+        they arrive. With a concurrency above one, several files are
+        downloaded at once, and yielded once all of them are downloaded so
+        that nothing is left running if the caller stops early or fails.
+        """
+        links = list(links)
+        hashes = hashes or {}
+        if self._concurrency == 1 or len(links) <= 1:
+            for link in links:
+                filepath, content_type = self._downloader(
+                    link, location, hashes.get(link)
+                )
+                yield link, (filepath, content_type)
+            return
+
+        cancelled = threading.Event()
+        results: List[Tuple[Link, Tuple[str, str]]] = []
+        with BatchDownloadProgress(
+            bar_type=self._progress_bar, count=len(links)
+        ) as progress:
+            downloader = Downloader(
+                self._session,
+                self._progress_bar,
+                self._resume_retries,
+                batch_progress=progress,
+                cancelled=cancelled,
+            )
+            executor = ThreadPoolExecutor(
+                max_workers=min(self._concurrency, len(links)),
+                thread_name_prefix="pip-download",
+            )
+            try:
+                pending: Dict["Future[Tuple[str, str]]", Link] = {
+                    executor.submit(downloader, link, location, hashes.get(link)): link
+                    for link in links
+                }
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_EXCEPTION)
+                    for future in done:
+                        link = pending.pop(future)
+                        # The first failure stops the whole batch.
+                        result = future.result()
+                        progress.finished()
+                        results.append((link, result))
+            finally:
+                # Stop the downloads still running, and wait for them so that
+                # no thread writes to location once the batch is over.
+                cancelled.set()
+                executor.shutdown(wait=True, cancel_futures=True)
+        yield from results
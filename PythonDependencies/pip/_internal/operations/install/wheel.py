@@ -12,6 +12,7 @@ import shutil
 import sys
 import warnings
 from base64 import urlsafe_b64encode
+from concurrent.futures import Future, ProcessPoolExecutor
 from email.message import Message
 from itertools import chain, filterfalse, starmap
 from typing import (
@@ -416,6 +417,118 @@ class PipScriptMaker(ScriptMaker):
         return super().make(specification, options)
 
 
+# Python files handed to a worker process at a time.
+_COMPILE_BATCH_SIZE = 50
+
+
+def _compile_files(paths: List[str]) -> Tuple[List[bool], str]:
+    """Byte-compile the given Python files.
+
+    This also runs in the worker processes of BytecodeCompiler, so whether
+    each file was compiled and what compileall printed are returned instead
+    of recorded or logged.
+    """
+    with contextlib.redirect_stdout(StreamWrapper.from_stream(sys.stdout)) as stdout:
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore")
+            compiled = [
+                bool(compileall.compile_file(path, force=True, quiet=True))
+                for path in paths
+            ]
+    return compiled, stdout.getvalue()
+
+
+def _add_to_record(record_path: str, lib_dir: str, paths: List[str]) -> None:
+    """Add rows without a hash for the given files to a RECORD file."""
+    with open(record_path, **csv_io_kwargs("r")) as record_file:
+        rows = [tuple(row) for row in csv.reader(record_file)]
+    recorded = {row[0] for row in rows}
+    for path in paths:
+        new_record_path = _fs_to_record_path(path, lib_dir)
+        if new_record_path not in recorded:
+            rows.append((new_record_path, "", ""))
+
+    with adjacent_tmp_file(record_path, **csv_io_kwargs("w")) as record_file:
+        writer = csv.writer(cast("IO[str]", record_file))
+        writer.writerows(_normalized_outrows(cast(List[InstalledCSVRow], rows)))
+    os.chmod(record_file.name, 0o666 & ~current_umask())
+    replace(record_file.name, record_path)
+
+
+class BytecodeCompiler:
+    """Byte-compiles the Python files of installed wheels in a pool of worker
+    processes, while the next wheels are installed.
+
+    The .pyc files are added to the RECORD file of each wheel by finish(),
+    which also runs on leaving the context, so the wheels installed before
+    one that fails still record theirs.
+    """
+
+    def __init__(self, workers: int) -> None:
+        self._workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending: List[
+            Tuple[str, str, List[Tuple[List[str], "Future[Tuple[List[bool], str]]"]]]
+        ] = []
+
+    def __enter__(self) -> "BytecodeCompiler":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        try:
+            self.finish()
+        finally:
+            self.close()
+
+    def submit(self, paths: List[str], lib_dir: str, record_path: str) -> None:
+        """Start compiling the given files of the wheel installed in lib_dir
+        with the given RECORD file.
+        """
+        if not paths:
+            return
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self._workers)
+        batches = []
+        for i in range(0, len(paths), _COMPILE_BATCH_SIZE):
+            batch = paths[i : i + _COMPILE_BATCH_SIZE]
+            batches.append((batch, self._executor.submit(_compile_files, batch)))
+        self._pending.append((record_path, lib_dir, batches))
+
+    def finish(self) -> None:
+        """Wait for all the submitted files and record the compiled ones.
+
+        Files in a batch that failed as a whole, e.g. because its worker
+        died, are left out, like files that don't compile.
+        """
+        pending, self._pending = self._pending, []
+        for record_path, lib_dir, batches in pending:
+            pyc_paths = []
+            for paths, future in batches:
+                try:
+                    compiled, output = future.result()
+                except Exception:
+                    logger.debug("Failed to byte-compile %s", paths, exc_info=True)
+                    continue
+                logger.debug(output)
+                pyc_paths.extend(
+                    importlib.util.cache_from_source(path)
+                    for path, success in zip(paths, compiled)
+                    if success
+                )
+            if not pyc_paths:
+                continue
+            try:
+                _add_to_record(record_path, lib_dir, pyc_paths)
+            except FileNotFoundError:
+                # The wheel failed to install before its RECORD was written.
+                pass
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
 def _install_wheel(  # noqa: C901, PLR0915 function is too long
     name: str,
     wheel_zip: ZipFile,
@@ -425,6 +538,7 @@ def _install_wheel(  # noqa: C901, PLR0915 function is too long
     warn_script_location: bool = True,
     direct_url: Optional[DirectUrl] = None,
     requested: bool = False,
+    bytecode_compiler: Optional[BytecodeCompiler] = None,
 ) -> None:
     """Install a wheel.
 
@@ -436,6 +550,8 @@ def _install_wheel(  # noqa: C901, PLR0915 function is too long
     :param pycompile: Whether to byte-compile installed Python files
     :param warn_script_location: Whether to check that scripts are installed
         into a directory on PATH
+    :param bytecode_compiler: If given, byte-compile the installed Python
+        files with it instead of before returning
     :raises UnsupportedWheel:
         * when the directory holds an unpacked wheel with incompatible
           Wheel-Version
@@ -605,22 +721,22 @@ def _install_wheel(  # noqa: C901, PLR0915 function is too long
         return importlib.util.cache_from_source(path)
 
     # Compile all of the pyc files for the installed files
-    if pycompile:
-        with contextlib.redirect_stdout(
-            StreamWrapper.from_stream(sys.stdout)
-        ) as stdout:
-            with warnings.catch_warnings():
-                warnings.filterwarnings("ignore")
-                for path in pyc_source_file_paths():
-                    success = compileall.compile_file(path, force=True, quiet=True)
-                    if success:
-                        pyc_path = pyc_output_path(path)
-                        assert os.path.exists(pyc_path)
-                        pyc_record_path = cast(
-                            "RecordPath", pyc_path.replace(os.path.sep, "/")
-                        )
-                        record_installed(pyc_record_path, pyc_path)
-        logger.debug(stdout.getvalue())
+    if pycompile and bytecode_compiler is not None:
+        bytecode_compiler.submit(
+            list(pyc_source_file_paths()),
+            lib_dir,
+            os.path.join(lib_dir, info_dir, "RECORD"),
+        )
+    elif pycompile:
+        source_paths = list(pyc_source_file_paths())
+        compiled, output = _compile_files(source_paths)
+        for path, success in zip(source_paths, compiled):
+            if success:
+                pyc_path = pyc_output_path(path)
+                assert os.path.exists(pyc_path)
+                pyc_record_path = cast("RecordPath", pyc_path.replace(os.path.sep, "/"))
+                record_installed(pyc_record_path, pyc_path)
+        logger.debug(output)
 
     maker = PipScriptMaker(None, scheme.scripts)
 
@@ -723,6 +839,7 @@ def install_wheel(
     warn_script_location: bool = True,
     direct_url: Optional[DirectUrl] = None,
     requested: bool = False,
+    bytecode_compiler: Optional[BytecodeCompiler] = None,
 ) -> None:
     with ZipFile(wheel_path, allowZip64=True) as z:
         with req_error_context(req_description):
@@ -735,4 +852,5 @@ def install_wheel(
                 warn_script_location=warn_script_location,
                 direct_url=direct_url,
                 requested=requested,
+                bytecode_compiler=bytecode_compiler,
             )
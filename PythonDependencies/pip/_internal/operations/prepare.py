@@ -112,9 +112,7 @@ def get_http_url(
         content_type = None
     else:
         # let's download to a tmp dir
-        from_path, content_type = download(link, temp_dir.path)
-        if hashes:
-            hashes.check_against_path(from_path)
+        from_path, content_type = download(link, temp_dir.path, hashes)
 
     return File(from_path, content_type)
 
@@ -236,6 +234,7 @@ class RequirementPreparer:
         verbosity: int,
         legacy_resolver: bool,
         resume_retries: int,
+        download_concurrency: int,
     ) -> None:
         super().__init__()
 
@@ -244,7 +243,9 @@ class RequirementPreparer:
         self.build_tracker = build_tracker
         self._session = session
         self._download = Downloader(session, progress_bar, resume_retries)
-        self._batch_download = BatchDownloader(session, progress_bar, resume_retries)
+        self._batch_download = BatchDownloader(
+            session, progress_bar, resume_retries, download_concurrency
+        )
         self.finder = finder
 
         # Where still-packed archives should be written to. If None, they are
@@ -275,6 +276,10 @@ class RequirementPreparer:
         # Memoized downloaded files, as mapping of url: path.
         self._downloaded: Dict[str, str] = {}
 
+        # The hashes that downloaded files were checked against while they were
+        # downloaded, as mapping of url: hashes.
+        self._checked_hashes: Dict[str, Hashes] = {}
+
         # Previous "header" printed for a link-based InstallRequirement
         self._previous_requirement_header = ("", "")
 
@@ -463,13 +468,16 @@ class RequirementPreparer:
         # `req.local_file_path` on the appropriate requirement after passing
         # all the links at once into BatchDownloader.
         links_to_fully_download: Dict[Link, InstallRequirement] = {}
+        links_hashes: Dict[Link, Hashes] = {}
         for req in partially_downloaded_reqs:
             assert req.link
             links_to_fully_download[req.link] = req
+            links_hashes[req.link] = self._get_linked_req_hashes(req)
 
         batch_download = self._batch_download(
             links_to_fully_download.keys(),
             temp_dir,
+            links_hashes,
         )
         for link, (filepath, _) in batch_download:
             logger.debug("Downloading link %s to %s", link, filepath)
@@ -480,6 +488,7 @@ class RequirementPreparer:
             # Record that the file is downloaded so we don't do it again in
             # _prepare_linked_requirement().
             self._downloaded[req.link.url] = filepath
+            self._checked_hashes[req.link.url] = links_hashes[link]
 
             # If this is an sdist, we need to unpack it after downloading, but the
             # .source_dir won't be set up until we are in _prepare_linked_requirement().
@@ -615,7 +624,7 @@ class RequirementPreparer:
                 )
         else:
             file_path = self._downloaded[link.url]
-            if hashes:
+            if hashes and self._checked_hashes.get(link.url) != hashes:
                 hashes.check_against_path(file_path)
             local_file = File(file_path, content_type=None)
 
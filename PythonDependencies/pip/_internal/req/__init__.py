@@ -1,9 +1,11 @@
 import collections
+import contextlib
 import logging
 from dataclasses import dataclass
 from typing import Generator, List, Optional, Sequence, Tuple
 
 from pip._internal.cli.progress_bars import get_install_progress_renderer
+from pip._internal.operations.install.wheel import BytecodeCompiler
 from pip._internal.utils.logging import indent_log
 
 from .req_file import parse_requirements
@@ -43,11 +45,15 @@ def install_given_reqs(
     use_user_site: bool,
     pycompile: bool,
     progress_bar: str,
+    compile_workers: int = 1,
 ) -> List[InstallationResult]:
     """
     Install everything in the given list.
 
     (to be called after having downloaded and unpacked the packages)
+
+    With more than one compile worker, the Python files of each package are
+    byte-compiled in worker processes while the next packages are installed.
     """
     to_install = collections.OrderedDict(_validate_requirements(requirements))
 
@@ -68,7 +74,15 @@ def install_given_reqs(
         )
         items = renderer(items)
 
-    with indent_log():
+    bytecode_compiler = None
+    if pycompile and compile_workers > 1:
+        bytecode_compiler = BytecodeCompiler(compile_workers)
+
+    # Leaving the block records the compiled files of every installed package,
+    # even if a later one fails to install.
+    with indent_log(), contextlib.ExitStack() as stack:
+        if bytecode_compiler is not None:
+            stack.enter_context(bytecode_compiler)
         for requirement in items:
             req_name = requirement.name
             assert req_name is not None
@@ -88,6 +102,7 @@ def install_given_reqs(
                     warn_script_location=warn_script_location,
                     use_user_site=use_user_site,
                     pycompile=pycompile,
+                    bytecode_compiler=bytecode_compiler,
                 )
             except Exception:
                 # if install did not succeed, rollback previous uninstall
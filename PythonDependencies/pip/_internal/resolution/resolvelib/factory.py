@@ -137,6 +137,34 @@ class Factory:
     def force_reinstall(self) -> bool:
         return self._force_reinstall
 
+    @property
+    def prefetching(self) -> bool:
+        return self._finder.prefetch_workers > 0
+
+    def prefetch(self, requirements: Iterable[Requirement]) -> None:
+        """Start fetching the index pages the requirements are looked up in.
+
+        Nothing is fetched if one of them can't be satisfied at all, since
+        whatever requires them is going to be rejected. Installed projects
+        are skipped: the index is usually only asked about them if the
+        installed version is rejected.
+        """
+        names = []
+        for req in requirements:
+            cand, ireq = req.get_candidate_lookup()
+            if cand is None and ireq is None:
+                return
+            if ireq is None or ireq.link is not None:
+                continue
+            name = req.project_name
+            if name in self._installed_dists and not self._force_reinstall:
+                continue
+            names.append(name)
+        self._finder.prefetch(names)
+
+    def stop_prefetching(self) -> None:
+        self._finder.stop_prefetching()
+
     def _fail_if_link_is_unsupported_wheel(self, link: Link) -> None:
         if not link.is_wheel:
             return
@@ -563,6 +591,7 @@ class Factory:
         # Python's list sort is stable, meaning relative order is kept for objects with
         # the same key.
         collected.requirements.sort(key=lambda r: r.name != r.project_name)
+        self.prefetch(collected.requirements)
         return collected
 
     def make_requirement_from_candidate(
@@ -278,4 +278,13 @@ class PipProvider(_ProviderBase):
     def get_dependencies(self, candidate: Candidate) -> Iterable[Requirement]:
         with_requires = not self._ignore_dependencies
         # iter_dependencies() can perform nontrivial work so delay until needed.
-        return (r for r in candidate.iter_dependencies(with_requires) if r is not None)
+        dependencies = (
+            r for r in candidate.iter_dependencies(with_requires) if r is not None
+        )
+        if not self._factory.prefetching:
+            return dependencies
+        # The resolver looks the dependencies up one after another, so fetch
+        # the index pages of all of them now.
+        dependencies = list(dependencies)
+        self._factory.prefetch(dependencies)
+        return dependencies
@@ -105,6 +105,8 @@ class Resolver(BaseResolver):
             raise error from e
         except ResolutionTooDeep:
             raise ResolutionTooDeepError from None
+        finally:
+            self.factory.stop_prefetching()
 
         req_set = RequirementSet(check_supported_wheels=check_supported_wheels)
         # process candidates with extras last to ensure their base equivalent is
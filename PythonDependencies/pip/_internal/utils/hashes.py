@@ -63,11 +63,9 @@ class Hashes:
         """Return whether the given hex digest is allowed."""
         return hex_digest in self._allowed.get(hash_name, [])
 
-    def check_against_chunks(self, chunks: Iterable[bytes]) -> None:
-        """Check good hashes against ones built from iterable of chunks of
-        data.
-
-        Raise HashMismatch if none match.
+    def new_hashers(self) -> Dict[str, "_Hash"]:
+        """Return an empty hasher for each algorithm with good hashes, to
+        be fed the data and passed to check_against_hashers().
 
         """
         gots = {}
@@ -76,11 +74,28 @@ class Hashes:
                 gots[hash_name] = hashlib.new(hash_name)
             except (ValueError, TypeError):
                 raise InstallationError(f"Unknown hash name: {hash_name}")
+        return gots
+
+    def check_against_chunks(self, chunks: Iterable[bytes]) -> None:
+        """Check good hashes against ones built from iterable of chunks of
+        data.
+
+        Raise HashMismatch if none match.
 
+        """
+        gots = self.new_hashers()
         for chunk in chunks:
             for hash in gots.values():
                 hash.update(chunk)
+        self.check_against_hashers(gots)
 
+    def check_against_hashers(self, gots: Dict[str, "_Hash"]) -> None:
+        """Check good hashes against hashers from new_hashers() that were
+        fed all of the data.
+
+        Raise HashMismatch if none match.
+
+        """
         for hash_name, got in gots.items():
             if got.hexdigest() in self._allowed[hash_name]:
                 return
@@ -120,6 +120,17 @@ if brotli is not None:
             return b""
 
 
+# Content-Encoding tokens mapped to the factories of their decoders, and the
+# exceptions those decoders raise on malformed data. Brotli is only registered
+# when its module is set above, which pip's vendored copy never does, so its
+# decoding doesn't depend on what else is installed.
+_DECODERS = {"gzip": GzipDecoder, "deflate": DeflateDecoder}
+_DECODER_ERRORS = (IOError, zlib.error)
+if brotli is not None:
+    _DECODERS["br"] = BrotliDecoder
+    _DECODER_ERRORS += (brotli.error,)
+
+
 class MultiDecoder(object):
     """
     From RFC7231:
@@ -145,13 +156,7 @@ def _get_decoder(mode):
     if "," in mode:
         return MultiDecoder(mode)
 
-    if mode == "gzip":
-        return GzipDecoder()
-
-    if brotli is not None and mode == "br":
-        return BrotliDecoder()
-
-    return DeflateDecoder()
+    return _DECODERS.get(mode, DeflateDecoder)()
 
 
 class HTTPResponse(io.IOBase):
@@ -187,9 +192,7 @@ class HTTPResponse(io.IOBase):
         value of Content-Length header, if present. Otherwise, raise error.
     """
 
-    CONTENT_DECODERS = ["gzip", "deflate"]
-    if brotli is not None:
-        CONTENT_DECODERS += ["br"]
+    CONTENT_DECODERS = list(_DECODERS)
     REDIRECT_STATUSES = [301, 302, 303, 307, 308]
 
     def __init__(
@@ -385,9 +388,7 @@ class HTTPResponse(io.IOBase):
                 if len(encodings):
                     self._decoder = _get_decoder(content_encoding)
 
-    DECODER_ERROR_CLASSES = (IOError, zlib.error)
-    if brotli is not None:
-        DECODER_ERROR_CLASSES += (brotli.error,)
+    DECODER_ERROR_CLASSES = _DECODER_ERRORS
 
     def _decode(self, data, decode_content, flush_decoder):
         """
@@ -795,6 +796,8 @@ class HTTPResponse(io.IOBase):
             'content-encoding' header.
         """
         self._init_decoder()
+        if decode_content is None:
+            decode_content = self.decode_content
         # FIXME: Rewrite this method and make it a class with a better structured logic.
         if not self.chunked:
             raise ResponseNotChunked(
@@ -162,6 +162,7 @@ from .__version__ import (
     __version__,
 )
 from .api import delete, get, head, options, patch, post, put, request
+from .async_sessions import AsyncSession
 from .exceptions import (
     ConnectionError,
     ConnectTimeout,
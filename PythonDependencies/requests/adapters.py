@@ -7,9 +7,16 @@ and maintain connections.
 """
 
 import os.path
-import socket  # noqa: F401
+import socket
+import threading
 import typing
 import warnings
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
 
 from urllib3.exceptions import ClosedPoolError, ConnectTimeoutError
 from urllib3.exceptions import HTTPError as _HTTPError
@@ -26,6 +33,8 @@ from urllib3.exceptions import SSLError as _SSLError
 from urllib3.poolmanager import PoolManager, proxy_from_url
 from urllib3.util import Timeout as TimeoutSauce
 from urllib3.util import parse_url
+from urllib3.util.connection import allowed_gai_family
+from urllib3.util.proxy import connection_requires_http_tunnel
 from urllib3.util.retry import Retry
 from urllib3.util.ssl_ import create_urllib3_context
 
@@ -33,6 +42,7 @@ from .auth import _basic_auth_str
 from .compat import basestring, urlparse
 from .cookies import extract_cookies_to_jar
 from .exceptions import (
+    CircuitOpenError,
     ConnectionError,
     ConnectTimeout,
     InvalidHeader,
@@ -44,10 +54,12 @@ from .exceptions import (
     RetryError,
     SSLError,
 )
-from .models import Response
+from .metrics import PoolStats, Timings, clock
+from .models import PreparedRequest, Response
 from .structures import CaseInsensitiveDict
 from .utils import (
     DEFAULT_CA_BUNDLE_PATH,
+    DEFAULT_PORTS,
     extract_zipped_paths,
     get_auth_from_url,
     get_encoding_from_headers,
@@ -74,10 +86,24 @@ DEFAULT_RETRIES = 0
 DEFAULT_POOL_TIMEOUT = None
 
 
+# Upper bounds on the SSLContexts and TLS sessions kept for reuse.
+SSL_CONTEXT_CACHE_SIZE = 32
+TLS_SESSION_CACHE_SIZE = 1024
+
+
+def _create_ssl_context():
+    """Returns a new urllib3 SSLContext that asks for TLS session tickets,
+    so that connections made with it can be resumed.
+    """
+    context = create_urllib3_context()
+    context.options &= ~ssl.OP_NO_TICKET
+    return context
+
+
 try:
-    import ssl  # noqa: F401
+    import ssl
 
-    _preloaded_ssl_context = create_urllib3_context()
+    _preloaded_ssl_context = _create_ssl_context()
     _preloaded_ssl_context.load_verify_locations(
         extract_zipped_paths(DEFAULT_CA_BUNDLE_PATH)
     )
@@ -87,6 +113,149 @@ except ImportError:
     _preloaded_ssl_context = None
 
 
+def _file_signature(path):
+    """Returns what identifies the current contents of ``path``, or None if
+    it can't be read.
+    """
+    try:
+        st = os.stat(path)
+    except (OSError, TypeError, ValueError):
+        return None
+    return (path, st.st_mtime_ns, st.st_size)
+
+
+class _SSLContextCache:
+    """Process-wide cache of SSLContexts by ``verify`` and client ``cert``.
+
+    Loading a CA bundle or a certificate chain takes milliseconds, so pools
+    and connections with the same settings share one context instead of
+    loading the files for each of them. Contexts are keyed on the files'
+    modification time and size as well, so edited files are picked up.
+    """
+
+    def __init__(self, maxsize=SSL_CONTEXT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._contexts = OrderedDict()
+        self._created = weakref.WeakSet()
+
+    def __contains__(self, context):
+        return context is not None and (
+            context is _preloaded_ssl_context or context in self._created
+        )
+
+    def get(self, verify, cert=None):
+        """Returns the shared context for ``verify`` and ``cert``, or None
+        when they can't be handled here and urllib3 must load the files.
+        """
+        if _preloaded_ssl_context is None:
+            return None
+        if verify is True and not cert:
+            return _preloaded_ssl_context
+
+        if verify is True or verify is False:
+            ca = verify
+        elif isinstance(verify, str):
+            ca = _file_signature(verify)
+        else:
+            return None
+
+        if not cert:
+            chain = None
+        elif isinstance(cert, str):
+            chain = (_file_signature(cert),)
+        else:
+            chain = (_file_signature(cert[0]), _file_signature(cert[1]))
+        if ca is None or (chain is not None and None in chain):
+            return None
+
+        key = (ca, chain)
+        with self._lock:
+            context = self._contexts.get(key)
+            if context is not None:
+                self._contexts.move_to_end(key)
+                return context
+
+        # Build outside the lock; a concurrent duplicate is merely wasted.
+        context = self._create(verify, cert)
+        with self._lock:
+            context = self._contexts.setdefault(key, context)
+            self._created.add(context)
+            while len(self._contexts) > self.maxsize:
+                self._contexts.popitem(last=False)
+        return context
+
+    @staticmethod
+    def _create(verify, cert):
+        context = _create_ssl_context()
+        if verify is False:
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+        elif verify is True:
+            context.load_verify_locations(extract_zipped_paths(DEFAULT_CA_BUNDLE_PATH))
+        elif os.path.isdir(verify):
+            context.load_verify_locations(capath=verify)
+        else:
+            context.load_verify_locations(cafile=verify)
+
+        if cert:
+            if isinstance(cert, str):
+                context.load_cert_chain(cert)
+            else:
+                context.load_cert_chain(cert[0], cert[1])
+        return context
+
+
+_ssl_contexts = _SSLContextCache()
+
+
+class _TLSSessionCache:
+    """Process-wide cache of the last TLS session of each (SSLContext, host,
+    port), offered to new connections so that they can resume it instead of
+    doing a full handshake.
+    """
+
+    def __init__(self, maxsize=TLS_SESSION_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._sessions = OrderedDict()
+
+    def get(self, key):
+        with self._lock:
+            return self._sessions.get(key)
+
+    def put(self, key, session):
+        with self._lock:
+            self._sessions[key] = session
+            self._sessions.move_to_end(key)
+            while len(self._sessions) > self.maxsize:
+                self._sessions.popitem(last=False)
+
+
+_tls_sessions = _TLSSessionCache()
+
+
+class _ResumingSSLContext:
+    """Stands in for a shared SSLContext while one connection is made,
+    offering ``session`` to the socket it wraps. Everything else, including
+    the settings urllib3 makes, goes to the shared context.
+    """
+
+    def __init__(self, context, session):
+        object.__setattr__(self, "_context", context)
+        object.__setattr__(self, "_session", session)
+
+    def __getattr__(self, name):
+        return getattr(self._context, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._context, name, value)
+
+    def wrap_socket(self, sock, *args, **kwargs):
+        kwargs.setdefault("session", self._session)
+        return self._context.wrap_socket(sock, *args, **kwargs)
+
+
 def _urllib3_request_context(
     request: "PreparedRequest",
     verify: "bool | str | None",
@@ -99,19 +268,21 @@ def _urllib3_request_context(
     scheme = parsed_request_url.scheme.lower()
     port = parsed_request_url.port
 
-    # Determine if we have and should use our default SSLContext
+    # Determine if we have and should use a shared SSLContext
     # to optimize performance on standard requests.
     poolmanager_kwargs = getattr(poolmanager, "connection_pool_kw", {})
     has_poolmanager_ssl_context = poolmanager_kwargs.get("ssl_context")
-    should_use_default_ssl_context = (
-        _preloaded_ssl_context is not None and not has_poolmanager_ssl_context
-    )
+    ssl_context = None
+    if not has_poolmanager_ssl_context:
+        ssl_context = _ssl_contexts.get(verify, client_cert)
 
     cert_reqs = "CERT_REQUIRED"
     if verify is False:
         cert_reqs = "CERT_NONE"
-    elif verify is True and should_use_default_ssl_context:
-        pool_kwargs["ssl_context"] = _preloaded_ssl_context
+    if ssl_context is not None:
+        # The context has the CA certificates and client cert loaded.
+        pool_kwargs["ssl_context"] = ssl_context
+        client_cert = None
     elif isinstance(verify, str):
         if not os.path.isdir(verify):
             pool_kwargs["ca_certs"] = verify
@@ -134,6 +305,362 @@ def _urllib3_request_context(
     return host_params, pool_kwargs
 
 
+# The Timings of the request being sent on this thread, for the connection
+# classes below to fill in while HTTPAdapter.send is in urlopen.
+_timings = threading.local()
+
+
+class _ConnectionMixin:
+    """Records the DNS, connect and TLS time of new connections, and the
+    time to the response headers, into the current thread's Timings. Also
+    keeps the bookkeeping the pools below need for their statistics and for
+    expiring idle connections.
+    """
+
+    _setup = None
+    _stats = None
+    _connected_at = None
+    _idle_since = None
+
+    def _new_conn(self):
+        started = clock()
+        try:
+            addresses = socket.getaddrinfo(
+                self._dns_host.strip("[]"),
+                self.port,
+                allowed_gai_family(),
+                socket.SOCK_STREAM,
+            )
+        except (OSError, UnicodeError):
+            # Let urllib3 fail (or succeed, on a retry) and report it its way.
+            self._setup = None
+            return super()._new_conn()
+        resolved = clock()
+
+        # Connect to the resolved addresses in turn, as create_connection()
+        # would, without resolving the name a second time.
+        dns_host, error = self._dns_host, None
+        try:
+            for *_, sockaddr in addresses:
+                self._dns_host = sockaddr[0]
+                try:
+                    sock = super()._new_conn()
+                    break
+                except ConnectTimeoutError as e:
+                    error = e
+            else:
+                raise error
+        finally:
+            self._dns_host = dns_host
+
+        self._setup = (resolved - started, clock() - resolved)
+        return sock
+
+    def connect(self):
+        started = clock()
+        super().connect()
+        self._connected_at = clock()
+        if self._stats is not None:
+            self._stats.connection_created()
+
+        timings = getattr(_timings, "current", None)
+        if timings is not None and self._setup is not None:
+            dns, tcp = self._setup
+            tls = None
+            if isinstance(self, HTTPSConnection) or self._tunnel_host:
+                tls = max(0.0, self._connected_at - started - dns - tcp)
+            resumed = getattr(self.sock, "session_reused", None)
+            timings.connected(dns, tcp, tls, resumed)
+        self._setup = None
+
+    def getresponse(self, *args, **kwargs):
+        timings = getattr(_timings, "current", None)
+        if timings is not None:
+            timings.request_sent()
+        response = super().getresponse(*args, **kwargs)
+        if timings is not None:
+            timings.headers_received()
+        return response
+
+
+class _HTTPConnection(_ConnectionMixin, HTTPConnection):
+    pass
+
+
+class _HTTPSConnection(_ConnectionMixin, HTTPSConnection):
+    _tls_session_saved = False
+
+    def _tls_session_key(self):
+        return (
+            self.ssl_context,
+            self._tunnel_host or self.host,
+            self._tunnel_port or self.port,
+        )
+
+    def connect(self):
+        context = self.ssl_context
+        session = None
+        if context is not None:
+            session = _tls_sessions.get(self._tls_session_key())
+        if session is not None:
+            self.ssl_context = _ResumingSSLContext(context, session)
+        try:
+            super().connect()
+        finally:
+            self.ssl_context = context
+        self._tls_session_saved = False
+
+    @property
+    def is_connected(self):
+        connected = super().is_connected
+        if connected or not isinstance(self.sock, ssl.SSLSocket):
+            return connected
+
+        # TLS 1.3 servers send session tickets after the handshake, which
+        # makes a connection that has not been used yet readable. Let
+        # OpenSSL consume them and see whether anything else is there.
+        timeout = self.sock.gettimeout()
+        self.sock.settimeout(0)
+        try:
+            self.sock.recv(1)
+        except ssl.SSLWantReadError:
+            return True
+        except OSError:
+            pass
+        finally:
+            self.sock.settimeout(timeout)
+        return False
+
+    def getresponse(self, *args, **kwargs):
+        response = super().getresponse(*args, **kwargs)
+        # TLS 1.3 tickets arrive after the handshake, so the session is
+        # worth keeping once a response has been read from the connection.
+        if not self._tls_session_saved and self.ssl_context is not None:
+            session = getattr(self.sock, "session", None)
+            if session is not None:
+                _tls_sessions.put(self._tls_session_key(), session)
+            self._tls_session_saved = True
+        return response
+
+
+class _PoolMixin:
+    """Counts connections for :class:`PoolStats <requests.metrics.PoolStats>`
+    and closes connections that outlived ``max_idle_time`` or
+    ``max_lifetime`` before they are reused.
+    """
+
+    #: Seconds a connection may sit idle in the pool, or None for no limit.
+    max_idle_time = None
+    #: Seconds a connection may be used for after connecting, or None.
+    max_lifetime = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _new_conn(self):
+        conn = super()._new_conn()
+        conn._stats = self.stats
+        return conn
+
+    def _expired(self, conn, now):
+        return (
+            self.max_idle_time is not None
+            and now - conn._idle_since > self.max_idle_time
+        ) or (
+            self.max_lifetime is not None
+            and now - conn._connected_at > self.max_lifetime
+        )
+
+    def _get_conn(self, timeout=None):
+        started = clock()
+        conn = super()._get_conn(timeout=timeout)
+        now = clock()
+
+        if conn._idle_since is not None:
+            # urllib3 closes connections the server dropped while idle.
+            if conn.sock is None:
+                self.stats.connection_discarded()
+            elif self._expired(conn, now):
+                conn.close()
+                self.stats.connection_discarded()
+            conn._idle_since = None
+
+        self.stats.checked_out(now - started)
+        return conn
+
+    def _put_conn(self, conn):
+        self.stats.checked_in()
+        self._return_conn(conn)
+
+    def _return_conn(self, conn):
+        """Puts ``conn`` back in the pool without counting a check-in."""
+        if conn is None or conn.sock is None:
+            return super()._put_conn(conn)
+
+        if conn._idle_since is None:
+            conn._idle_since = clock()
+        super()._put_conn(conn)
+        # A full (or closed) pool closes what is handed back.
+        if conn.sock is None:
+            conn._idle_since = None
+            self.stats.connection_discarded()
+
+    def reap(self):
+        """Closes the idle connections that have expired.
+
+        :returns: The number of connections closed.
+        """
+        queue = self.pool
+        if queue is None or (self.max_idle_time is None and self.max_lifetime is None):
+            return 0
+
+        closed = 0
+        now = clock()
+        # Under the queue's lock no other thread can take a connection; the
+        # closed ones stay queued and reconnect when they are next used.
+        with queue.mutex:
+            for conn in queue.queue:
+                if conn is None or conn._idle_since is None or conn.sock is None:
+                    continue
+                if self._expired(conn, now):
+                    conn.close()
+                    conn._idle_since = None
+                    closed += 1
+        for _ in range(closed):
+            self.stats.connection_discarded()
+        return closed
+
+    def warm_up(self, connections=1, timeout=None):
+        """Opens up to ``connections`` connections, at most the size of the
+        pool, concurrently and leaves them idle in the pool.
+
+        :returns: The number of connections opened.
+        """
+        conns = []
+        try:
+            # The pool's own methods are used so that warming up isn't counted
+            # as checkouts in pool_stats().
+            for _ in range(min(connections, self.pool.maxsize)):
+                conn = super()._get_conn()
+                if conn.sock is None and conn._idle_since is not None:
+                    # urllib3 closed it because the server dropped it.
+                    self.stats.connection_discarded()
+                    conn._idle_since = None
+                conns.append(conn)
+            pending = [conn for conn in conns if conn.sock is None]
+            if pending:
+                for conn in pending:
+                    if timeout is not None:
+                        conn.timeout = timeout
+                with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+                    list(executor.map(self._connect, pending))
+            return len(pending)
+        finally:
+            for conn in conns:
+                self._return_conn(conn)
+
+    def _connect(self, conn):
+        if self.proxy is not None and connection_requires_http_tunnel(
+            self.proxy, self.proxy_config, self.scheme
+        ):
+            self._prepare_proxy(conn)
+        else:
+            conn.connect()
+
+    def pool_stats(self):
+        """Returns the statistics of the pool, with the number of idle
+        connections in it.
+
+        :rtype: dict
+        """
+        queue = self.pool
+        idle = 0
+        if queue is not None:
+            with queue.mutex:
+                idle = sum(
+                    1
+                    for conn in queue.queue
+                    if conn is not None and conn.sock is not None
+                )
+        stats = self.stats.as_dict()
+        stats.update(
+            origin=f"{self.scheme}://{self.host}:{self.port}",
+            maxsize=queue.maxsize if queue is not None else None,
+            idle=idle,
+        )
+        return stats
+
+
+class _HTTPConnectionPool(_PoolMixin, HTTPConnectionPool):
+    ConnectionCls = _HTTPConnection
+
+
+class _HTTPSConnectionPool(_PoolMixin, HTTPSConnectionPool):
+    ConnectionCls = _HTTPSConnection
+
+
+_pool_classes = {
+    "http": _HTTPConnectionPool,
+    "https": _HTTPSConnectionPool,
+}
+
+
+class _IdleReaper:
+    """Periodically closes the expired idle connections of every adapter
+    with ``max_idle_time`` or ``max_lifetime`` set, from one daemon thread.
+    """
+
+    def __init__(self):
+        self._adapters = weakref.WeakSet()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def register(self, adapter):
+        with self._lock:
+            self._adapters.add(adapter)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="requests-idle-reaper", daemon=True
+                )
+                self._thread.start()
+        self._wakeup.set()
+
+    def unregister(self, adapter):
+        with self._lock:
+            self._adapters.discard(adapter)
+
+    def _run(self):
+        while True:
+            interval = self._reap()
+            if interval is None:
+                return
+            self._wakeup.wait(interval)
+            self._wakeup.clear()
+
+    def _reap(self):
+        """Reaps every adapter once and returns how long to sleep, or None
+        once no adapter is left. Returning drops the references to them.
+        """
+        with self._lock:
+            adapters = list(self._adapters)
+            if not adapters:
+                self._thread = None
+                return None
+
+        for adapter in adapters:
+            try:
+                adapter.reap_idle_connections()
+            except Exception:
+                # One failing adapter mustn't stop reaping for the others.
+                pass
+        return min(adapter._reap_interval() for adapter in adapters)
+
+
+_idle_reaper = _IdleReaper()
+
+
 class BaseAdapter:
     """The Base Transport Adapter"""
 
@@ -180,8 +707,18 @@ class HTTPAdapter(BaseAdapter):
         made it to the server. By default, Requests does not retry failed
         connections. If you need granular control over the conditions under
         which we retry a request, import urllib3's ``Retry`` class and pass
-        that instead.
+        that instead. A :class:`~requests.retry.BudgetedRetry` also limits
+        retries to its :class:`~requests.retry.RetryBudget`, which each
+        request sent adds to.
     :param pool_block: Whether the connection pool should block for connections.
+    :param max_idle_time: (optional) Seconds a connection may sit idle in the
+        pool before it is closed, instead of failing when it is next used
+        because the server has given up on it.
+    :param max_lifetime: (optional) Seconds after which a connection is
+        closed once it is idle, however busy it was.
+    :param circuit_breaker: (optional) A
+        :class:`~requests.retry.CircuitBreaker` that fails requests fast
+        while the error rate of their origin is too high.
 
     Usage::
 
@@ -197,6 +734,9 @@ class HTTPAdapter(BaseAdapter):
         "_pool_connections",
         "_pool_maxsize",
         "_pool_block",
+        "max_idle_time",
+        "max_lifetime",
+        "circuit_breaker",
     ]
 
     def __init__(
@@ -205,6 +745,9 @@ class HTTPAdapter(BaseAdapter):
         pool_maxsize=DEFAULT_POOLSIZE,
         max_retries=DEFAULT_RETRIES,
         pool_block=DEFAULT_POOLBLOCK,
+        max_idle_time=None,
+        max_lifetime=None,
+        circuit_breaker=None,
     ):
         if max_retries == DEFAULT_RETRIES:
             self.max_retries = Retry(0, read=False)
@@ -218,6 +761,9 @@ class HTTPAdapter(BaseAdapter):
         self._pool_connections = pool_connections
         self._pool_maxsize = pool_maxsize
         self._pool_block = pool_block
+        self.max_idle_time = max_idle_time
+        self.max_lifetime = max_lifetime
+        self.circuit_breaker = circuit_breaker
 
         self.init_poolmanager(pool_connections, pool_maxsize, block=pool_block)
 
@@ -229,6 +775,9 @@ class HTTPAdapter(BaseAdapter):
         # self.poolmanager uses a lambda function, which isn't pickleable.
         self.proxy_manager = {}
         self.config = {}
+        self.max_idle_time = None
+        self.max_lifetime = None
+        self.circuit_breaker = None
 
         for attr, value in state.items():
             setattr(self, attr, value)
@@ -262,6 +811,9 @@ class HTTPAdapter(BaseAdapter):
             block=block,
             **pool_kwargs,
         )
+        self.poolmanager.pool_classes_by_scheme = _pool_classes
+        if self.max_idle_time is not None or self.max_lifetime is not None:
+            _idle_reaper.register(self)
 
     def proxy_manager_for(self, proxy, **proxy_kwargs):
         """Return urllib3 ProxyManager for the given proxy.
@@ -298,6 +850,7 @@ class HTTPAdapter(BaseAdapter):
                 block=self._pool_block,
                 **proxy_kwargs,
             )
+            manager.pool_classes_by_scheme = _pool_classes
 
         return manager
 
@@ -313,6 +866,11 @@ class HTTPAdapter(BaseAdapter):
             to a CA bundle to use
         :param cert: The SSL certificate to verify.
         """
+        # A shared context already has the files loaded; setting them on the
+        # pool would load them again for every connection.
+        conn_kw = getattr(conn, "conn_kw", None) or {}
+        shared_context = conn_kw.get("ssl_context") in _ssl_contexts
+
         if url.lower().startswith("https") and verify:
             conn.cert_reqs = "CERT_REQUIRED"
 
@@ -330,7 +888,9 @@ class HTTPAdapter(BaseAdapter):
                         f"invalid path: {cert_loc}"
                     )
 
-                if not os.path.isdir(cert_loc):
+                if shared_context:
+                    pass
+                elif not os.path.isdir(cert_loc):
                     conn.ca_certs = cert_loc
                 else:
                     conn.ca_cert_dir = cert_loc
@@ -341,19 +901,20 @@ class HTTPAdapter(BaseAdapter):
 
         if cert:
             if not isinstance(cert, basestring):
-                conn.cert_file = cert[0]
-                conn.key_file = cert[1]
+                cert_file, key_file = cert[0], cert[1]
             else:
-                conn.cert_file = cert
-                conn.key_file = None
-            if conn.cert_file and not os.path.exists(conn.cert_file):
+                cert_file, key_file = cert, None
+            if not shared_context:
+                conn.cert_file = cert_file
+                conn.key_file = key_file
+            if cert_file and not os.path.exists(cert_file):
                 raise OSError(
                     f"Could not find the TLS certificate file, "
-                    f"invalid path: {conn.cert_file}"
+                    f"invalid path: {cert_file}"
                 )
-            if conn.key_file and not os.path.exists(conn.key_file):
+            if key_file and not os.path.exists(key_file):
                 raise OSError(
-                    f"Could not find the TLS key file, invalid path: {conn.key_file}"
+                    f"Could not find the TLS key file, invalid path: {key_file}"
                 )
 
     def build_response(self, req, resp):
@@ -404,17 +965,18 @@ class HTTPAdapter(BaseAdapter):
         this writing, use the following to determine what keys may be in that
         dictionary:
 
-        * If ``verify`` is ``True``, ``"ssl_context"`` will be set and will be the
-          default Requests SSL Context
-        * If ``verify`` is ``False``, ``"ssl_context"`` will not be set but
-          ``"cert_reqs"`` will be set
-        * If ``verify`` is a string, (i.e., it is a user-specified trust bundle)
-          ``"ca_certs"`` will be set if the string is not a directory recognized
-          by :py:func:`os.path.isdir`, otherwise ``"ca_certs_dir"`` will be
-          set.
-        * If ``"cert"`` is specified, ``"cert_file"`` will always be set. If
-          ``"cert"`` is a tuple with a second item, ``"key_file"`` will also
-          be present
+        * ``"cert_reqs"`` will always be set.
+        * Unless the PoolManager has an ``"ssl_context"`` of its own,
+          ``"ssl_context"`` will be set to a context shared by every pool with
+          the same ``verify`` and ``cert``, with the CA certificates and the
+          client certificate already loaded; with ``verify=True`` and no
+          ``cert`` it is the default Requests SSL Context.
+        * Otherwise, if ``verify`` is a string, (i.e., it is a user-specified
+          trust bundle) ``"ca_certs"`` will be set if the string is not a
+          directory recognized by :py:func:`os.path.isdir`, otherwise
+          ``"ca_certs_dir"`` will be set; and if ``"cert"`` is specified,
+          ``"cert_file"`` will be set, and ``"key_file"`` too if ``"cert"``
+          is a tuple with a second item.
 
         To override these settings, one may subclass this class, call this
         method and use the above logic to change parameters as desired. For
@@ -539,10 +1101,92 @@ class HTTPAdapter(BaseAdapter):
         Currently, this closes the PoolManager and any active ProxyManager,
         which closes any pooled connections.
         """
+        _idle_reaper.unregister(self)
         self.poolmanager.clear()
         for proxy in self.proxy_manager.values():
             proxy.clear()
 
+    def _pools(self):
+        """Returns the connection pools of the pool and proxy managers."""
+        pools = []
+        for manager in (self.poolmanager, *self.proxy_manager.values()):
+            with manager.pools.lock:
+                pools.extend(manager.pools._container.values())
+        return pools
+
+    def warm_up(
+        self, url, connections=1, verify=True, cert=None, proxies=None, timeout=None
+    ):
+        """Opens connections to the origin of ``url`` ahead of the requests
+        that will use them, so that a burst of requests doesn't pay for
+        connecting one handshake at a time.
+
+        :param url: A URL of the origin to connect to.
+        :param connections: (optional) How many idle connections the pool
+            should hold, at most ``pool_maxsize``.
+        :param verify: (optional) As for :meth:`send`; it selects the pool.
+        :param cert: (optional) As for :meth:`send`; it selects the pool.
+        :param proxies: (optional) The proxies dictionary to apply.
+        :param timeout: (optional) Connect timeout, in seconds.
+        :returns: The number of connections opened.
+        :rtype: int
+        """
+        request = PreparedRequest()
+        request.prepare_url(url, None)
+        try:
+            conn = self.get_connection_with_tls_context(
+                request, verify, proxies=proxies, cert=cert
+            )
+        except LocationValueError as e:
+            raise InvalidURL(e, request=request)
+        self.cert_verify(conn, request.url, verify, cert)
+        self._configure_pool(conn)
+
+        if not hasattr(conn, "warm_up"):
+            return 0
+        try:
+            return conn.warm_up(connections, timeout=timeout)
+        except _SSLError as e:
+            raise SSLError(e, request=request)
+        except (_HTTPError, OSError) as e:
+            raise ConnectionError(e, request=request)
+
+    def pool_stats(self):
+        """Returns usage statistics of every connection pool: its origin and
+        size, connections ``in_use`` (with ``peak_in_use``) and ``idle``,
+        the number ``created`` and ``discarded``, and a histogram of the
+        ``wait`` for a connection, in seconds. See
+        :class:`PoolStats <requests.metrics.PoolStats>`.
+
+        :rtype: list
+        """
+        return [
+            pool.pool_stats() for pool in self._pools() if hasattr(pool, "pool_stats")
+        ]
+
+    def reap_idle_connections(self):
+        """Closes the pooled connections that have been idle longer than
+        ``max_idle_time`` or connected longer than ``max_lifetime``. This
+        runs in the background when either is set.
+
+        :returns: The number of connections closed.
+        :rtype: int
+        """
+        closed = 0
+        for pool in self._pools():
+            if hasattr(pool, "reap"):
+                self._configure_pool(pool)
+                closed += pool.reap()
+        return closed
+
+    def _configure_pool(self, conn):
+        conn.max_idle_time = self.max_idle_time
+        conn.max_lifetime = self.max_lifetime
+
+    def _reap_interval(self):
+        limits = [t for t in (self.max_idle_time, self.max_lifetime) if t is not None]
+        return min(max(min(limits, default=60) / 2, 0.05), 60)
+
     def request_url(self, request, proxies):
         """Obtain the url to use when making the final request.
 
@@ -629,6 +1273,20 @@ class HTTPAdapter(BaseAdapter):
         :rtype: requests.Response
         """
 
+        breaker = self.circuit_breaker
+        origin = None
+        if breaker is not None:
+            try:
+                parsed = parse_url(request.url)
+            except LocationValueError as e:
+                raise InvalidURL(e, request=request)
+            port = parsed.port or DEFAULT_PORTS.get(parsed.scheme)
+            origin = f"{parsed.scheme}://{parsed.host}:{port}".lower()
+            if not breaker.allow_request(origin):
+                raise CircuitOpenError(
+                    f"Circuit breaker open for {origin}", request=request
+                )
+
         try:
             conn = self.get_connection_with_tls_context(
                 request, verify, proxies=proxies, cert=cert
@@ -637,6 +1295,7 @@ class HTTPAdapter(BaseAdapter):
             raise InvalidURL(e, request=request)
 
         self.cert_verify(conn, request.url, verify, cert)
+        self._configure_pool(conn)
         url = self.request_url(request, proxies)
         self.add_headers(
             request,
@@ -663,6 +1322,12 @@ class HTTPAdapter(BaseAdapter):
         else:
             timeout = TimeoutSauce(connect=timeout, read=timeout)
 
+        budget = getattr(self.max_retries, "budget", None)
+        if budget is not None:
+            budget.deposit()
+
+        resp = None
+        timings = _timings.current = Timings()
         try:
             resp = conn.urlopen(
                 method=request.method,
@@ -716,4 +1381,13 @@ class HTTPAdapter(BaseAdapter):
             else:
                 raise
 
-        return self.build_response(request, resp)
+        finally:
+            _timings.current = None
+            if origin is not None:
+                breaker.record(
+                    origin, resp is None or resp.status in breaker.failure_statuses
+                )
+
+        response = self.build_response(request, resp)
+        response.timings = timings
+        return response
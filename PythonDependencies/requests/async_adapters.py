@@ -0,0 +1,883 @@
+"""
+requests.async_adapters
+~~~~~~~~~~~~~~~~~~~~~~~
+
+This module contains the asyncio transport adapter that
+:class:`AsyncSession <requests.async_sessions.AsyncSession>` uses to
+define and maintain connections without blocking the event loop.
+"""
+
+import asyncio
+import os.path
+import ssl
+import time
+import zlib
+from collections import OrderedDict, deque
+from http.client import parse_headers
+from io import BytesIO
+
+from urllib3.util import Timeout as TimeoutSauce
+from urllib3.util.ssl_ import create_urllib3_context
+
+from .adapters import (
+    DEFAULT_POOLBLOCK,
+    DEFAULT_POOLSIZE,
+    DEFAULT_RETRIES,
+    BaseAdapter,
+    _preloaded_ssl_context,
+)
+from .compat import basestring, urlparse
+from .cookies import extract_cookies_to_jar
+from .exceptions import (
+    ChunkedEncodingError,
+    ConnectionError,
+    ConnectTimeout,
+    ContentDecodingError,
+    InvalidSchema,
+    InvalidURL,
+    ProxyError,
+    ReadTimeout,
+    SSLError,
+)
+from .models import Response
+from .structures import CaseInsensitiveDict
+from .utils import (
+    DEFAULT_PORTS,
+    get_encoding_from_headers,
+    select_proxy,
+)
+
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+#: Largest status line or header block we are willing to buffer.
+MAX_HEADER_SIZE = 64 * 1024
+#: Size of the reads used to pull file-like request bodies.
+BODY_CHUNK_SIZE = 64 * 1024
+
+# Status codes that never carry a response body.
+_NO_BODY_STATI = frozenset((204, 304))
+
+# Errors that mean a pooled keep-alive connection went away while idle.
+_STALE_CONNECTION_ERRORS = (
+    BrokenPipeError,
+    ConnectionResetError,
+    asyncio.IncompleteReadError,
+)
+
+
+def _split_timeout(timeout):
+    """Returns the (connect, read) timeouts for a requests-style timeout."""
+    if isinstance(timeout, tuple):
+        try:
+            connect, read = timeout
+        except ValueError:
+            raise ValueError(
+                f"Invalid timeout {timeout}. Pass a (connect, read) timeout tuple, "
+                f"or a single float to set both timeouts to the same value."
+            )
+        return connect, read
+    if isinstance(timeout, TimeoutSauce):
+        connect, read = timeout.connect_timeout, timeout.read_timeout
+        return (
+            connect if isinstance(connect, (int, float)) else None,
+            read if isinstance(read, (int, float)) else None,
+        )
+    return timeout, timeout
+
+
+class _Decoder:
+    """Incrementally decodes a ``Content-Encoding`` chain."""
+
+    def __init__(self, content_encoding):
+        self._decoders = []
+        encodings = [e.strip().lower() for e in content_encoding.split(",")]
+        # Encodings are listed in the order they were applied.
+        for encoding in reversed(encodings):
+            if encoding in ("gzip", "x-gzip"):
+                self._decoders.append(zlib.decompressobj(16 + zlib.MAX_WBITS))
+            elif encoding == "deflate":
+                self._decoders.append(_DeflateDecoder())
+            elif encoding == "br" and brotli is not None:
+                self._decoders.append(_BrotliDecoder())
+            elif encoding == "zstd" and zstandard is not None:
+                self._decoders.append(_ZstdDecoder())
+
+    def __bool__(self):
+        return bool(self._decoders)
+
+    def decompress(self, data):
+        try:
+            for decoder in self._decoders:
+                data = decoder.decompress(data)
+        except Exception as e:
+            raise ContentDecodingError(
+                "Received response with content-encoding, but failed to decode it.", e
+            )
+        return data
+
+    def flush(self):
+        data = b""
+        for decoder in self._decoders:
+            if data:
+                data = decoder.decompress(data)
+            flush = getattr(decoder, "flush", None)
+            if flush is not None:
+                data += flush()
+        return data
+
+
+class _DeflateDecoder:
+    """Handles both zlib-wrapped and raw deflate streams."""
+
+    def __init__(self):
+        self._first_try = True
+        self._data = b""
+        self._obj = zlib.decompressobj()
+
+    def decompress(self, data):
+        if not self._first_try:
+            return self._obj.decompress(data)
+
+        self._data += data
+        try:
+            decompressed = self._obj.decompress(data)
+            if decompressed:
+                self._first_try = False
+                self._data = None
+            return decompressed
+        except zlib.error:
+            self._first_try = False
+            self._obj = zlib.decompressobj(-zlib.MAX_WBITS)
+            try:
+                return self.decompress(self._data)
+            finally:
+                self._data = None
+
+    def flush(self):
+        return self._obj.flush()
+
+
+class _BrotliDecoder:
+    def __init__(self):
+        self._obj = brotli.Decompressor()
+        self.decompress = getattr(self._obj, "decompress", None) or self._obj.process
+
+
+class _ZstdDecoder:
+    """Decodes bodies made of several Zstandard frames."""
+
+    def __init__(self):
+        self._obj = zstandard.ZstdDecompressor().decompressobj()
+
+    def decompress(self, data):
+        parts = [self._obj.decompress(data)]
+        while getattr(self._obj, "eof", False) and self._obj.unused_data:
+            unused_data = self._obj.unused_data
+            self._obj = zstandard.ZstdDecompressor().decompressobj()
+            parts.append(self._obj.decompress(unused_data))
+        return b"".join(parts)
+
+
+class _OriginalResponse:
+    """Exposes the parsed headers the way ``http.cookiejar`` expects them."""
+
+    def __init__(self, msg):
+        self.msg = msg
+
+
+class AsyncConnection:
+    """A single keep-alive HTTP/1.1 connection on top of asyncio streams."""
+
+    def __init__(self, key, reader, writer):
+        self.key = key
+        self.reader = reader
+        self.writer = writer
+        self.created = time.monotonic()
+        #: Number of requests that have been sent over this connection.
+        self.requests = 0
+
+    @property
+    def is_reusable(self):
+        return not (self.writer.is_closing() or self.reader.at_eof())
+
+    def close(self):
+        self.writer.close()
+
+
+class AsyncConnectionPool:
+    """Keeps idle :class:`AsyncConnection` objects per origin.
+
+    :param num_pools: The number of origins to keep idle connections for.
+    :param maxsize: The maximum number of idle connections kept per origin
+        (and, when ``block`` is set, the maximum number open at once).
+    :param block: Wait for a connection to be returned instead of opening
+        more than ``maxsize`` connections to one origin.
+    """
+
+    def __init__(
+        self, num_pools=DEFAULT_POOLSIZE, maxsize=DEFAULT_POOLSIZE, block=False
+    ):
+        self.num_pools = num_pools
+        self.maxsize = maxsize
+        self.block = block
+        self._idle = OrderedDict()
+        self._limits = {}
+
+    def _limit(self, key):
+        if key not in self._limits:
+            self._limits[key] = asyncio.Semaphore(self.maxsize)
+        return self._limits[key]
+
+    async def acquire(self, key, connect):
+        """Returns an idle connection for ``key``, or a new one from ``connect``.
+
+        :rtype: (AsyncConnection, bool)
+        :returns: The connection and whether it was reused from the pool.
+        """
+        if self.block:
+            await self._limit(key).acquire()
+
+        try:
+            idle = self._idle.get(key)
+            while idle:
+                conn = idle.pop()
+                if conn.is_reusable:
+                    return conn, True
+                conn.close()
+
+            reader, writer = await connect()
+        except BaseException:
+            if self.block:
+                self._limit(key).release()
+            raise
+
+        return AsyncConnection(key, reader, writer), False
+
+    def release(self, conn, reusable=True):
+        """Returns ``conn`` to the pool, closing it if it can't be reused."""
+        if self.block:
+            self._limit(conn.key).release()
+
+        if not (reusable and conn.is_reusable):
+            conn.close()
+            return
+
+        idle = self._idle.setdefault(conn.key, deque())
+        self._idle.move_to_end(conn.key)
+        if len(idle) >= self.maxsize:
+            conn.close()
+        else:
+            idle.append(conn)
+
+        # Forget the least recently used origins beyond ``num_pools``.
+        while len(self._idle) > self.num_pools:
+            _, evicted = self._idle.popitem(last=False)
+            for stale in evicted:
+                stale.close()
+
+    def clear(self):
+        """Closes every idle connection."""
+        for idle in self._idle.values():
+            for conn in idle:
+                conn.close()
+        self._idle.clear()
+
+
+class AsyncHTTPResponse:
+    """The raw body of a response received by :class:`AsyncHTTPAdapter`.
+
+    It stands in for urllib3's ``HTTPResponse`` as ``Response.raw``. The body
+    is read with the coroutines :meth:`aread` and :meth:`astream`; the
+    connection goes back to the pool once the body has been consumed.
+    """
+
+    def __init__(
+        self,
+        adapter,
+        conn,
+        status,
+        reason,
+        version,
+        msg,
+        framing,
+        length=None,
+        decode_content=True,
+        read_timeout=None,
+    ):
+        self._adapter = adapter
+        self._conn = conn
+        self.status = status
+        self.reason = reason
+        self.version = version
+        self.msg = msg
+        self._original_response = _OriginalResponse(msg)
+        self._framing = framing
+        self._remaining = length
+        self._chunk_left = 0
+        self._read_timeout = read_timeout
+        self._decoder = (
+            _Decoder(msg.get("content-encoding", "")) if decode_content else None
+        )
+        self._done = framing == "empty"
+        self._keep_alive = framing in ("length", "chunked", "empty") and not (
+            "close" in msg.get("connection", "").lower() or version < 11
+        )
+        if self._done:
+            self.release_conn()
+
+    @property
+    def closed(self):
+        return self._conn is None
+
+    def release_conn(self):
+        """Returns the connection to the pool if the body was fully read."""
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            self._adapter.poolmanager.release(conn, self._done and self._keep_alive)
+
+    def close(self):
+        """Closes the underlying connection without reading the body."""
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            self._adapter.poolmanager.release(conn, reusable=False)
+
+    async def aclose(self):
+        self.close()
+
+    def read(self, *args, **kwargs):
+        raise RuntimeError(
+            "The body of an asynchronous response must be read with "
+            "'await response.raw.aread()' or 'response.raw.astream()'."
+        )
+
+    async def _recv(self, coro):
+        try:
+            if self._read_timeout is None:
+                return await coro
+            return await asyncio.wait_for(coro, self._read_timeout)
+        except asyncio.TimeoutError as e:
+            self.close()
+            raise ReadTimeout(e)
+        except asyncio.IncompleteReadError as e:
+            self.close()
+            raise ChunkedEncodingError(
+                f"Connection broken: {len(e.partial)} bytes read, "
+                f"{e.expected} more expected",
+            )
+        except (OSError, asyncio.LimitOverrunError, ValueError) as e:
+            self.close()
+            raise ConnectionError(e)
+
+    async def _read_raw(self, amt):
+        """Reads up to ``amt`` undecoded body bytes; ``b''`` at the end."""
+        if self._done or self._conn is None:
+            return b""
+        reader = self._conn.reader
+
+        if self._framing == "length":
+            if not self._remaining:
+                data = b""
+            else:
+                data = await self._recv(reader.read(min(amt, self._remaining)))
+                if not data:
+                    self.close()
+                    raise ChunkedEncodingError(
+                        f"Connection broken: {self._remaining} bytes missing"
+                    )
+                self._remaining -= len(data)
+            if not self._remaining:
+                self._done = True
+
+        elif self._framing == "chunked":
+            if not self._chunk_left:
+                line = await self._recv(reader.readuntil(b"\r\n"))
+                try:
+                    self._chunk_left = int(line.split(b";", 1)[0], 16)
+                except ValueError:
+                    self.close()
+                    raise ChunkedEncodingError(f"Invalid chunk length: {line!r}")
+                if not self._chunk_left:
+                    # Skip trailers up to the terminating empty line.
+                    while line not in (b"\r\n", b"\n", b""):
+                        line = await self._recv(reader.readline())
+                    self._done = True
+                    data = b""
+            if not self._done:
+                data = await self._recv(reader.readexactly(min(amt, self._chunk_left)))
+                self._chunk_left -= len(data)
+                if not self._chunk_left:
+                    await self._recv(reader.readexactly(2))
+
+        else:
+            data = await self._recv(reader.read(amt))
+            if not data:
+                self._done = True
+
+        if self._done:
+            self.release_conn()
+        return data
+
+    async def astream(self, amt=BODY_CHUNK_SIZE, decode_content=True):
+        """Yields the body in chunks of at most ``amt`` raw bytes."""
+        decoder = self._decoder if decode_content else None
+        while True:
+            data = await self._read_raw(amt or BODY_CHUNK_SIZE)
+            if not data:
+                break
+            if decoder:
+                data = decoder.decompress(data)
+            if data:
+                yield data
+        if decoder:
+            data = decoder.flush()
+            if data:
+                yield data
+
+    async def aread(self, amt=None, decode_content=True):
+        """Reads and returns the rest of the body (or ``amt`` raw bytes)."""
+        if amt is not None:
+            data = await self._read_raw(amt)
+            decoder = self._decoder if decode_content else None
+            if decoder:
+                data = decoder.decompress(data)
+                if self._done:
+                    data += decoder.flush()
+            return data
+
+        return b"".join(
+            [chunk async for chunk in self.astream(decode_content=decode_content)]
+        )
+
+
+class AsyncHTTPAdapter(BaseAdapter):
+    """An HTTP/1.1 transport adapter built on non-blocking asyncio streams.
+
+    Provides the Transport Adapter interface for :class:`AsyncSession
+    <requests.async_sessions.AsyncSession>`, except that :meth:`send` is a
+    coroutine. Connections are kept alive in an :class:`AsyncConnectionPool`,
+    so many concurrent requests cost coroutines rather than threads.
+
+    :param pool_connections: The number of origins to keep idle connections for.
+    :param pool_maxsize: The maximum number of connections to save in the pool.
+    :param max_retries: The number of times to retry establishing a
+        connection. Like :class:`HTTPAdapter <requests.adapters.HTTPAdapter>`,
+        requests where data has made it to the server are never retried.
+    :param pool_block: Whether the connection pool should block for connections.
+
+    Usage::
+
+      >>> import requests
+      >>> s = requests.AsyncSession()
+      >>> a = requests.async_adapters.AsyncHTTPAdapter(pool_maxsize=100)
+      >>> s.mount('https://', a)
+    """
+
+    __attrs__ = [
+        "max_retries",
+        "_pool_connections",
+        "_pool_maxsize",
+        "_pool_block",
+    ]
+
+    def __init__(
+        self,
+        pool_connections=DEFAULT_POOLSIZE,
+        pool_maxsize=DEFAULT_POOLSIZE,
+        max_retries=DEFAULT_RETRIES,
+        pool_block=DEFAULT_POOLBLOCK,
+    ):
+        super().__init__()
+        self.max_retries = max_retries
+        self._pool_connections = pool_connections
+        self._pool_maxsize = pool_maxsize
+        self._pool_block = pool_block
+        self._ssl_contexts = {}
+        self.init_poolmanager(pool_connections, pool_maxsize, block=pool_block)
+
+    def __getstate__(self):
+        return {attr: getattr(self, attr, None) for attr in self.__attrs__}
+
+    def __setstate__(self, state):
+        for attr, value in state.items():
+            setattr(self, attr, value)
+
+        self._ssl_contexts = {}
+        self.init_poolmanager(
+            self._pool_connections, self._pool_maxsize, block=self._pool_block
+        )
+
+    def init_poolmanager(self, connections, maxsize, block=DEFAULT_POOLBLOCK):
+        """Initializes the :class:`AsyncConnectionPool`.
+
+        This method should not be called from user code, and is only
+        exposed for use when subclassing the
+        :class:`AsyncHTTPAdapter <requests.async_adapters.AsyncHTTPAdapter>`.
+        """
+        self._pool_connections = connections
+        self._pool_maxsize = maxsize
+        self._pool_block = block
+
+        self.poolmanager = AsyncConnectionPool(
+            num_pools=connections, maxsize=maxsize, block=block
+        )
+
+    def ssl_context_for(self, verify, cert):
+        """Returns the :class:`ssl.SSLContext` for the given TLS settings.
+
+        :param verify: Either a boolean, in which case it controls whether we
+            verify the server's TLS certificate, or a string, in which case it
+            must be a path to a CA bundle to use.
+        :param cert: Any user-provided SSL certificate for client authentication.
+        :rtype: ssl.SSLContext
+        """
+        key = (verify, cert)
+        if key in self._ssl_contexts:
+            return self._ssl_contexts[key]
+
+        if verify is True and not cert and _preloaded_ssl_context is not None:
+            context = _preloaded_ssl_context
+        else:
+            context = create_urllib3_context()
+            if not verify:
+                context.check_hostname = False
+                context.verify_mode = ssl.CERT_NONE
+            elif verify is True:
+                context.load_default_certs()
+            else:
+                if not os.path.exists(verify):
+                    raise OSError(
+                        f"Could not find a suitable TLS CA certificate bundle, "
+                        f"invalid path: {verify}"
+                    )
+                if os.path.isdir(verify):
+                    context.load_verify_locations(capath=verify)
+                else:
+                    context.load_verify_locations(cafile=verify)
+
+            if cert:
+                if not isinstance(cert, basestring):
+                    context.load_cert_chain(cert[0], cert[1])
+                else:
+                    context.load_cert_chain(cert)
+
+        self._ssl_contexts[key] = context
+        return context
+
+    def build_response(self, req, resp):
+        """Builds a :class:`Response <requests.Response>` object from an
+        :class:`AsyncHTTPResponse`. This should not be called from user code,
+        and is only exposed for use when subclassing the
+        :class:`AsyncHTTPAdapter <requests.async_adapters.AsyncHTTPAdapter>`
+
+        :param req: The :class:`PreparedRequest <PreparedRequest>` used to generate the response.
+        :param resp: The :class:`AsyncHTTPResponse` object.
+        :rtype: requests.Response
+        """
+        response = Response()
+
+        response.status_code = resp.status
+
+        # Fold repeated headers the way urllib3's HTTPHeaderDict does.
+        headers = CaseInsensitiveDict()
+        for name, value in resp.msg.items():
+            if name in headers:
+                headers[name] = f"{headers[name]}, {value}"
+            else:
+                headers[name] = value
+        response.headers = headers
+
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = resp
+        response.reason = resp.reason
+
+        if isinstance(req.url, bytes):
+            response.url = req.url.decode("utf-8")
+        else:
+            response.url = req.url
+
+        extract_cookies_to_jar(response.cookies, req, resp)
+
+        response.request = req
+        response.connection = self
+
+        return response
+
+    def request_url(self, request, proxies):
+        """Obtain the path to use when making the final request.
+
+        :param request: The :class:`PreparedRequest <PreparedRequest>` being sent.
+        :param proxies: A dictionary of schemes or schemes and hosts to proxy URLs.
+        :rtype: str
+        """
+        url = request.path_url
+        if url.startswith("//"):
+            url = f"/{url.lstrip('/')}"
+        return url
+
+    def add_headers(self, request, **kwargs):
+        """Add any headers needed by the connection. This does nothing by
+        default, but is left for overriding by users that subclass the
+        :class:`AsyncHTTPAdapter <requests.async_adapters.AsyncHTTPAdapter>`.
+        """
+        pass
+
+    async def _connect(self, scheme, host, port, verify, cert, timeout):
+        context = self.ssl_context_for(verify, cert) if scheme == "https" else None
+        coro = asyncio.open_connection(
+            host,
+            port,
+            ssl=context,
+            server_hostname=host if context is not None else None,
+            limit=MAX_HEADER_SIZE,
+        )
+        try:
+            if timeout is None:
+                return await coro
+            return await asyncio.wait_for(coro, timeout)
+        except asyncio.TimeoutError as e:
+            raise ConnectTimeout(e)
+        except ssl.SSLError as e:
+            raise SSLError(e)
+        except OSError as e:
+            raise ConnectionError(e)
+
+    def _encode_head(self, request, url, host, port, scheme, chunked):
+        lines = [f"{request.method} {url} HTTP/1.1"]
+        if "Host" not in request.headers:
+            default_port = DEFAULT_PORTS.get(scheme)
+            lines.append(f"Host: {host if port == default_port else f'{host}:{port}'}")
+        for name, value in request.headers.items():
+            if isinstance(name, bytes):
+                name = name.decode("latin-1")
+            if isinstance(value, bytes):
+                value = value.decode("latin-1")
+            lines.append(f"{name}: {value}")
+        if chunked and "Transfer-Encoding" not in request.headers:
+            lines.append("Transfer-Encoding: chunked")
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+    async def _iter_body(self, body):
+        if body is None:
+            return
+        if isinstance(body, str):
+            yield body.encode("utf-8")
+        elif isinstance(body, (bytes, bytearray, memoryview)):
+            yield bytes(body)
+        elif hasattr(body, "read"):
+            # Files read from a thread, so a large upload doesn't hold up the
+            # other tasks on the loop.
+            loop = asyncio.get_running_loop()
+            while True:
+                chunk = await loop.run_in_executor(None, body.read, BODY_CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+        elif hasattr(body, "__aiter__"):
+            async for chunk in body:
+                yield chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+        else:
+            for chunk in body:
+                yield chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+
+    async def _write_request(self, conn, head, body, chunked):
+        writer = conn.writer
+        writer.write(head)
+        async for chunk in self._iter_body(body):
+            if not chunk:
+                continue
+            if chunked:
+                writer.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+            else:
+                writer.write(chunk)
+            await writer.drain()
+        if chunked:
+            writer.write(b"0\r\n\r\n")
+        await writer.drain()
+        conn.requests += 1
+
+    async def _read_head(self, conn, read_timeout):
+        """Reads the status line and headers, skipping 1xx responses."""
+        reader = conn.reader
+        while True:
+            coro = reader.readuntil(b"\r\n\r\n")
+            if read_timeout is not None:
+                coro = asyncio.wait_for(coro, read_timeout)
+            block = await coro
+
+            status_line, _, header_block = block.partition(b"\r\n")
+            try:
+                version, status, reason = (
+                    status_line.decode("latin-1").split(" ", 2) + [""]
+                )[:3]
+                status = int(status)
+            except ValueError:
+                raise ConnectionError(f"Invalid HTTP status line: {status_line!r}")
+            if not version.startswith("HTTP/"):
+                raise ConnectionError(f"Invalid HTTP status line: {status_line!r}")
+
+            if 100 <= status < 200 and status != 101:
+                continue
+
+            msg = parse_headers(BytesIO(header_block))
+            return (
+                11 if version == "HTTP/1.1" else 10,
+                status,
+                reason.strip(),
+                msg,
+            )
+
+    @staticmethod
+    def _body_framing(method, status, msg):
+        if method == "HEAD" or status in _NO_BODY_STATI or status < 200:
+            return "empty", 0
+        if "chunked" in msg.get("transfer-encoding", "").lower():
+            return "chunked", None
+        length = msg.get("content-length")
+        if length is not None:
+            try:
+                lengths = {int(v) for v in length.split(",")}
+            except ValueError:
+                raise ConnectionError(f"Invalid Content-Length header: {length!r}")
+            if len(lengths) != 1 or min(lengths) < 0:
+                raise ConnectionError(f"Invalid Content-Length header: {length!r}")
+            length = lengths.pop()
+            return ("length" if length else "empty"), length
+        return "close", None
+
+    async def send(
+        self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None
+    ):
+        """Sends PreparedRequest object. Returns Response object.
+
+        This is a coroutine.
+
+        :param request: The :class:`PreparedRequest <PreparedRequest>` being sent.
+        :param stream: (optional) Whether to stream the request content.
+        :param timeout: (optional) How long to wait for the server to send
+            data before giving up, as a float, or a :ref:`(connect timeout,
+            read timeout) <timeouts>` tuple.
+        :type timeout: float or tuple or urllib3 Timeout object
+        :param verify: (optional) Either a boolean, in which case it controls whether
+            we verify the server's TLS certificate, or a string, in which case it
+            must be a path to a CA bundle to use
+        :param cert: (optional) Any user-provided SSL certificate to be trusted.
+        :param proxies: (optional) The proxies dictionary to apply to the request.
+        :rtype: requests.Response
+        """
+        if select_proxy(request.url, proxies):
+            raise ProxyError(
+                "AsyncHTTPAdapter does not support proxies.", request=request
+            )
+
+        parsed = urlparse(request.url)
+        scheme = parsed.scheme.lower()
+        if scheme not in DEFAULT_PORTS:
+            raise InvalidSchema(
+                f"No connection adapters were found for {request.url!r}"
+            )
+        host = parsed.hostname
+        if not host:
+            raise InvalidURL(
+                f"Invalid URL {request.url!r}: No host supplied", request=request
+            )
+        try:
+            port = parsed.port or DEFAULT_PORTS[scheme]
+        except ValueError as e:
+            raise InvalidURL(e, request=request)
+
+        self.add_headers(
+            request,
+            stream=stream,
+            timeout=timeout,
+            verify=verify,
+            cert=cert,
+            proxies=proxies,
+        )
+
+        connect_timeout, read_timeout = _split_timeout(timeout)
+        chunked = not (request.body is None or "Content-Length" in request.headers)
+        head = self._encode_head(
+            request, self.request_url(request, proxies), host, port, scheme, chunked
+        )
+        # Only bodies we can replay may be resent on a fresh connection.
+        replayable = request.body is None or isinstance(
+            request.body, (basestring, bytearray)
+        )
+        key = (scheme, host, port, verify if scheme == "https" else None, cert)
+
+        def connect():
+            return self._connect(scheme, host, port, verify, cert, connect_timeout)
+
+        retries = self.max_retries if isinstance(self.max_retries, int) else 0
+        while True:
+            try:
+                conn, reused = await self.poolmanager.acquire(key, connect)
+            except ConnectionError:
+                if retries > 0:
+                    retries -= 1
+                    continue
+                raise
+
+            try:
+                await self._write_request(conn, head, request.body, chunked)
+                version, status, reason, msg = await self._read_head(conn, read_timeout)
+                framing, length = self._body_framing(request.method, status, msg)
+            except _STALE_CONNECTION_ERRORS as e:
+                self.poolmanager.release(conn, reusable=False)
+                if reused and replayable:
+                    # The server closed an idle keep-alive connection.
+                    continue
+                raise ConnectionError(e, request=request)
+            except asyncio.TimeoutError as e:
+                self.poolmanager.release(conn, reusable=False)
+                raise ReadTimeout(e, request=request)
+            except asyncio.LimitOverrunError as e:
+                self.poolmanager.release(conn, reusable=False)
+                raise ConnectionError(e, request=request)
+            except ssl.SSLError as e:
+                self.poolmanager.release(conn, reusable=False)
+                raise SSLError(e, request=request)
+            except OSError as e:
+                self.poolmanager.release(conn, reusable=False)
+                raise ConnectionError(e, request=request)
+            except BaseException:
+                self.poolmanager.release(conn, reusable=False)
+                raise
+            break
+
+        raw = AsyncHTTPResponse(
+            self,
+            conn,
+            status,
+            reason,
+            version,
+            msg,
+            framing,
+            length=length,
+            read_timeout=read_timeout,
+        )
+        response = self.build_response(request, raw)
+
+        if not stream:
+            response._content = await raw.aread()
+            response._content_consumed = True
+
+        return response
+
+    def close(self):
+        """Disposes of any internal state.
+
+        Currently, this closes every idle pooled connection.
+        """
+        self.poolmanager.clear()
@@ -0,0 +1,312 @@
+"""
+requests.async_sessions
+~~~~~~~~~~~~~~~~~~~~~~~
+
+This module provides an AsyncSession object, a Session whose requests are
+sent from coroutines over non-blocking connections.
+"""
+
+import asyncio
+import inspect
+from datetime import timedelta
+
+from .async_adapters import AsyncHTTPAdapter
+from .compat import urlparse
+from .cookies import extract_cookies_to_jar
+from .exceptions import (
+    ChunkedEncodingError,
+    ConnectionError,
+    ContentDecodingError,
+    ReadTimeout,
+    TooManyRedirects,
+)
+from .hooks import dispatch_hook
+from .models import (
+    CONTENT_CHUNK_SIZE,
+    REDIRECT_DRAIN_LIMIT,
+    RedirectRecord,
+    Request,
+)
+from .sessions import Session, preferred_clock
+from .structures import PrefixDict
+
+
+class AsyncSession(Session):
+    """A Requests session for asyncio applications.
+
+    Request preparation, cookies, authentication, hooks and redirect
+    handling are shared with :class:`Session <requests.sessions.Session>`;
+    only sending is asynchronous. :meth:`send` is a coroutine, and so are
+    the results of :meth:`request`, :meth:`get`, :meth:`post` and friends.
+
+    With ``stream=True`` the body is not read by the session; consume it
+    with ``await r.raw.aread()`` or ``async for chunk in r.raw.astream()``.
+
+    Basic Usage::
+
+      >>> import requests
+      >>> async with requests.AsyncSession() as s:
+      ...     await s.get('https://httpbin.org/get')
+      <Response [200]>
+    """
+
+    def __init__(self):
+        super().__init__()
+
+        # Default connection adapters.
+        self.adapters = PrefixDict()
+        self.mount("https://", AsyncHTTPAdapter())
+        self.mount("http://", AsyncHTTPAdapter())
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        self.close()
+
+    def download(self, url, path, *args, **kwargs):
+        """Not supported: :meth:`Session.download <requests.Session.download>`
+        fetches its parts from threads, with blocking requests. Use a
+        :class:`Session <requests.Session>` to download files in parts.
+        """
+        raise NotImplementedError("AsyncSession does not support download()")
+
+    async def send(self, request, **kwargs):
+        """Send a given PreparedRequest.
+
+        This is a coroutine.
+
+        :rtype: requests.Response
+        """
+        # Set defaults that the hooks can utilize to ensure they always have
+        # the correct parameters to reproduce the previous request.
+        kwargs.setdefault("stream", self.stream)
+        kwargs.setdefault("verify", self.verify)
+        kwargs.setdefault("cert", self.cert)
+        if "proxies" not in kwargs:
+            kwargs["proxies"] = self._resolve_proxies(request, self.proxies)
+
+        # It's possible that users might accidentally send a Request object.
+        # Guard against that specific failure case.
+        if isinstance(request, Request):
+            raise ValueError("You can only send PreparedRequests.")
+
+        allow_redirects = kwargs.pop("allow_redirects", True)
+        # Only full history hands the bodies of followed redirects back.
+        keep_bodies = not allow_redirects or self.redirect_history == "full"
+
+        r = await self._send(request, keep_redirect_body=keep_bodies, **kwargs)
+
+        # Resolve redirects if allowed.
+        if allow_redirects:
+            history = []
+            redirects = 0
+            req = request
+            while self.get_redirect_target(r):
+                if redirects >= self.max_redirects:
+                    await self._drain(r, keep_body=keep_bodies)
+                    raise TooManyRedirects(
+                        f"Exceeded {self.max_redirects} redirects.", response=r
+                    )
+
+                req = await self._next_redirect(r, req, keep_body=keep_bodies, **kwargs)
+                kwargs["proxies"] = self.rebuild_proxies(req, kwargs["proxies"])
+                redirects += 1
+                if self.redirect_history == "full":
+                    history.append(r)
+                elif self.redirect_history == "light":
+                    history.append(RedirectRecord.from_response(r))
+                r = await self._send(req, keep_redirect_body=keep_bodies, **kwargs)
+
+            if history:
+                r.history = history
+
+        # If redirects aren't being followed, store the response on the Request for Response.next().
+        elif self.get_redirect_target(r):
+            r._next = await self._next_redirect(r, request, **kwargs)
+
+        return r
+
+    async def _send(self, request, keep_redirect_body=True, **kwargs):
+        """Sends a single request, without following redirects.
+
+        Without ``keep_redirect_body``, the body of a redirect is dropped
+        rather than read whole, even if ``stream`` is false.
+        """
+        hooks = request.hooks
+
+        # Get the appropriate adapter to use
+        adapter = self.get_adapter(url=request.url)
+
+        # Start time (approximately) of the request
+        start = preferred_clock()
+
+        # Send the request; blocking adapters may be mounted too. The body is
+        # streamed when it may be a redirect's, which isn't read whole.
+        defer_body = not keep_redirect_body and not kwargs["stream"]
+        r = adapter.send(request, **dict(kwargs, stream=True) if defer_body else kwargs)
+        if inspect.isawaitable(r):
+            r = await r
+        if defer_body:
+            if self.get_redirect_target(r):
+                await self._drain(r, keep_body=False)
+            elif hasattr(r.raw, "aread"):
+                r._content = await r.raw.aread()
+                r._content_consumed = True
+
+        # Total elapsed time of the request (approximately)
+        elapsed = preferred_clock() - start
+        r.elapsed = timedelta(seconds=elapsed)
+        self._apply_encoding_policy(r)
+
+        # Response manipulation hooks
+        r = dispatch_hook("response", hooks, r, **kwargs)
+
+        # Persist cookies
+        if r.history:
+            # If the hooks create history then we want those cookies too
+            for resp in r.history:
+                extract_cookies_to_jar(self.cookies, resp.request, resp.raw)
+
+        extract_cookies_to_jar(self.cookies, request, r.raw)
+
+        return r
+
+    async def _drain(self, resp, keep_body=True):
+        """Reads the body of ``resp`` so its connection can be released.
+
+        Without ``keep_body``, the body is dropped as it is read, and a body
+        longer than ``REDIRECT_DRAIN_LIMIT`` closes the connection instead,
+        as :meth:`Session._drain_redirect` does.
+        """
+        raw = resp.raw
+        aread = getattr(raw, "aread", None)
+        if resp._content_consumed or aread is None:
+            return
+        if keep_body:
+            try:
+                resp._content = await aread()
+            except (ChunkedEncodingError, ContentDecodingError):
+                resp._content = b""
+        else:
+            resp._content = b""
+            left = REDIRECT_DRAIN_LIMIT
+            try:
+                while left > 0:
+                    chunk = await aread(
+                        min(left, CONTENT_CHUNK_SIZE), decode_content=False
+                    )
+                    if not chunk:
+                        break
+                    left -= len(chunk)
+                else:
+                    raw.close()
+            except (ChunkedEncodingError, ConnectionError, ReadTimeout):
+                pass
+        resp._content_consumed = True
+
+    async def _next_redirect(self, resp, req, keep_body=True, **kwargs):
+        """Returns the PreparedRequest that the redirect ``resp`` points to."""
+        await self._drain(resp, keep_body=keep_body)
+        return next(self.resolve_redirects(resp, req, yield_requests=True, **kwargs))
+
+    async def map(
+        self,
+        requests,
+        ordered=False,
+        per_host=None,
+        cancel_on_error=False,
+        return_exceptions=False,
+        **kwargs,
+    ):
+        r"""Sends many requests concurrently and yields their responses.
+
+        This is an asynchronous generator. Every request runs as its own task
+        on the running event loop.
+
+        :param requests: An iterable of :class:`Request <Request>` or
+            :class:`PreparedRequest <PreparedRequest>` objects. Plain requests
+            are prepared with this session's settings.
+        :param ordered: (optional) Yield responses in the order the requests
+            were given instead of in the order they complete.
+        :param per_host: (optional) Maximum number of requests in flight to a
+            single host (``scheme://host:port``) at any time.
+        :param cancel_on_error: (optional) Cancel every outstanding request as
+            soon as one of them fails.
+        :param return_exceptions: (optional) Yield the exception raised by a
+            failed request in place of its response instead of raising it.
+        :param \*\*kwargs: Optional arguments that ``request`` takes for
+            sending, i.e. ``timeout``, ``allow_redirects``, ``proxies``,
+            ``stream``, ``verify`` and ``cert``.
+        :rtype: async generator of requests.Response
+        """
+        limits = {}
+
+        def host_limit(url):
+            parsed = urlparse(url)
+            key = (parsed.scheme, parsed.hostname, parsed.port)
+            if key not in limits:
+                limits[key] = asyncio.Semaphore(per_host)
+            return limits[key]
+
+        async def send(request):
+            if per_host is None:
+                return await self._send_mapped(request, **kwargs)
+            async with host_limit(request.url):
+                return await self._send_mapped(request, **kwargs)
+
+        tasks = [asyncio.ensure_future(send(request)) for request in requests]
+        failures = []
+
+        if cancel_on_error:
+
+            def cancel_pending(task):
+                if not task.cancelled() and task.exception() is not None:
+                    failures.append(task.exception())
+                    for other in tasks:
+                        other.cancel()
+
+            for task in tasks:
+                task.add_done_callback(cancel_pending)
+
+        try:
+            pending = set(tasks)
+            while pending:
+                if ordered:
+                    done = [tasks[len(tasks) - len(pending)]]
+                    await asyncio.wait(done)
+                else:
+                    done, _ = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                pending.difference_update(done)
+
+                for task in done:
+                    if task.cancelled():
+                        # Only cancel_on_error cancels work; surface the cause.
+                        if failures and not return_exceptions:
+                            raise failures[0]
+                        continue
+                    if task.exception() is not None:
+                        if not return_exceptions:
+                            raise task.exception()
+                        yield task.exception()
+                    else:
+                        yield task.result()
+        finally:
+            # Don't leave work behind if the caller stops early.
+            for task in tasks:
+                task.cancel()
+
+    async def gather(self, requests, **kwargs):
+        r"""Sends many requests concurrently and returns their responses.
+
+        This is :meth:`map` with ``ordered=True``, collected into a list.
+
+        :param requests: An iterable of :class:`Request <Request>` or
+            :class:`PreparedRequest <PreparedRequest>` objects.
+        :param \*\*kwargs: Optional arguments that ``map`` takes.
+        :rtype: list
+        """
+        kwargs["ordered"] = True
+        return [resp async for resp in self.map(requests, **kwargs)]
@@ -0,0 +1,782 @@
+"""
+requests.cache
+~~~~~~~~~~~~~~
+
+This module contains a transport adapter that caches responses following
+the HTTP caching rules (RFC 9111) for a private cache, and the storage
+backends it can keep them in.
+"""
+
+import hashlib
+import io
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from email.utils import mktime_tz, parsedate_tz
+
+from .adapters import HTTPAdapter
+from .compat import urldefrag
+from .models import Response
+from .structures import CaseInsensitiveDict
+from .utils import get_encoding_from_headers, parse_dict_header
+
+#: Status codes whose responses may be stored.
+CACHEABLE_STATUS_CODES = frozenset((200, 203, 300, 301, 308))
+
+#: Methods that modify a resource and so invalidate its cached responses.
+INVALIDATING_METHODS = frozenset(("POST", "PUT", "PATCH", "DELETE"))
+
+# Headers that describe the body as sent over the wire; cached bodies are
+# stored decoded.
+_TRANSFER_HEADERS = frozenset(
+    ("content-encoding", "content-length", "transfer-encoding")
+)
+
+DEFAULT_MEMORY_CACHE_SIZE = 64 * 1024 * 1024
+
+
+def _cache_control(headers):
+    """Returns the directives of the Cache-Control header of ``headers``.
+
+    :rtype: dict
+    """
+    directives = parse_dict_header(headers.get("cache-control", ""))
+    if "no-cache" in headers.get("pragma", "").lower():
+        directives.setdefault("no-cache", None)
+    return {name.lower(): value for name, value in directives.items()}
+
+
+def _seconds(directives, name):
+    """Returns the delta-seconds value of a directive, or None."""
+    try:
+        return max(0, int(directives[name]))
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _http_date(value):
+    """Returns an HTTP date header value as a timestamp, or None."""
+    parsed = parsedate_tz(value) if value else None
+    return mktime_tz(parsed) if parsed is not None else None
+
+
+class BaseCache:
+    """The storage interface used by :class:`CacheAdapter`.
+
+    Entries are a JSON-serializable ``meta`` dict describing the response
+    and the bytes of its (decoded) body.
+    """
+
+    def get(self, key):
+        """Returns ``(meta, body)`` for ``key``, where ``body`` is a readable
+        binary file object, or None if nothing is stored.
+        """
+        raise NotImplementedError
+
+    def open(self, key, meta):
+        """Returns a writer storing an entry for ``key`` as its body is read.
+
+        The writer has ``write(data)``, ``commit()``, which stores the entry
+        in place of any previous one, and ``abort()``.
+        """
+        raise NotImplementedError
+
+    def update(self, key, meta):
+        """Replaces the ``meta`` of the entry for ``key``, keeping its body."""
+        raise NotImplementedError
+
+    def delete(self, key):
+        """Removes the entry for ``key``, if any."""
+        raise NotImplementedError
+
+    def close(self):
+        """Cleans up backend specific items."""
+
+
+class _BufferWriter:
+    """Collects a body in memory, then hands it to ``store``."""
+
+    def __init__(self, store, limit=None):
+        self._store = store
+        self._limit = limit
+        self._buffer = bytearray()
+
+    def write(self, data):
+        if self._buffer is not None:
+            self._buffer += data
+            if self._limit is not None and len(self._buffer) > self._limit:
+                self._buffer = None
+
+    def commit(self):
+        if self._buffer is not None:
+            self._store(bytes(self._buffer))
+        self._buffer = None
+
+    def abort(self):
+        self._buffer = None
+
+
+class MemoryCache(BaseCache):
+    """Keeps entries in memory, evicting the least recently used ones once
+    their bodies take more than ``max_bytes`` in total.
+
+    :param max_bytes: (optional) Size limit of the cache in bytes.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MEMORY_CACHE_SIZE):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        return {"max_bytes": self.max_bytes}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            meta, body = entry
+        return dict(meta), io.BytesIO(body)
+
+    def open(self, key, meta):
+        def store(body):
+            with self._lock:
+                self._remove(key)
+                self._entries[key] = (meta, body)
+                self._size += len(body)
+                while self._size > self.max_bytes:
+                    self._remove(next(iter(self._entries)))
+
+        return _BufferWriter(store, limit=self.max_bytes)
+
+    def update(self, key, meta):
+        with self._lock:
+            if key in self._entries:
+                self._entries[key] = (meta, self._entries[key][1])
+
+    def delete(self, key):
+        with self._lock:
+            self._remove(key)
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry[1])
+
+
+class _FileWriter:
+    """Writes a body to a temporary file next to its final location."""
+
+    def __init__(self, cache, key, meta):
+        self._cache = cache
+        self._key = key
+        self._meta = meta
+        directory, name = os.path.split(cache._path(key))
+        os.makedirs(directory, exist_ok=True)
+        self._file = tempfile.NamedTemporaryFile(
+            dir=directory, prefix=name + "-", suffix=".body", delete=False
+        )
+
+    def write(self, data):
+        self._file.write(data)
+
+    def commit(self):
+        self._file.close()
+        self._cache._replace(self._key, self._meta, os.path.basename(self._file.name))
+
+    def abort(self):
+        self._file.close()
+        try:
+            os.remove(self._file.name)
+        except OSError:
+            pass
+
+
+class FileCache(BaseCache):
+    """Keeps entries as files in a directory sharded by key hash.
+
+    Each entry is a small metadata file naming a separate body file, so
+    bodies are streamed from disk on hits and updating an entry's metadata
+    leaves its body untouched. Files are replaced atomically, so several
+    processes may share the directory.
+
+    :param directory: The directory to keep the cache in.
+    """
+
+    def __init__(self, directory):
+        self.directory = os.fspath(directory)
+
+    def _path(self, key):
+        digest = hashlib.sha224(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, digest[:2], digest[2:4], digest)
+
+    def _load(self, key):
+        try:
+            with open(self._path(key) + ".meta", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_meta(self, key, record):
+        path = self._path(key) + ".meta"
+        directory, name = os.path.split(path)
+        with tempfile.NamedTemporaryFile(
+            "w", dir=directory, prefix=name + "-", delete=False, encoding="utf-8"
+        ) as f:
+            json.dump(record, f)
+        os.replace(f.name, path)
+
+    def _remove_body(self, key, record):
+        if record is not None:
+            try:
+                os.remove(
+                    os.path.join(os.path.dirname(self._path(key)), record["body"])
+                )
+            except OSError:
+                pass
+
+    def _replace(self, key, meta, body):
+        previous = self._load(key)
+        self._write_meta(key, {"meta": meta, "body": body})
+        if previous is not None and previous["body"] != body:
+            self._remove_body(key, previous)
+
+    def get(self, key):
+        record = self._load(key)
+        if record is None:
+            return None
+        try:
+            body = open(
+                os.path.join(os.path.dirname(self._path(key)), record["body"]), "rb"
+            )
+        except OSError:
+            return None
+        return record["meta"], body
+
+    def open(self, key, meta):
+        return _FileWriter(self, key, meta)
+
+    def update(self, key, meta):
+        record = self._load(key)
+        if record is not None:
+            self._write_meta(key, {"meta": meta, "body": record["body"]})
+
+    def delete(self, key):
+        record = self._load(key)
+        try:
+            os.remove(self._path(key) + ".meta")
+        except OSError:
+            pass
+        self._remove_body(key, record)
+
+
+class _SQLiteBody(io.RawIOBase):
+    """Reads a body stored as chunk rows one row at a time."""
+
+    def __init__(self, cache, body, chunks):
+        self._cache = cache
+        self._body = body
+        self._chunks = chunks
+        self._seq = 0
+        self._pending = memoryview(b"")
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if not self._pending:
+            if self._seq >= self._chunks:
+                return 0
+            data = self._cache._chunk(self._body, self._seq)
+            if data is None:
+                raise OSError("The cached body was replaced while being read.")
+            self._pending = memoryview(data)
+            self._seq += 1
+
+        n = min(len(buffer), len(self._pending))
+        buffer[:n] = self._pending[:n]
+        self._pending = self._pending[n:]
+        return n
+
+    def close(self):
+        if not self.closed:
+            self._cache._release(self._body)
+        super().close()
+
+
+class _SQLiteWriter:
+    """Stores a body as chunk rows while it is read."""
+
+    def __init__(self, cache, key, meta):
+        self._cache = cache
+        self._key = key
+        self._meta = meta
+        self._body = cache._new_body()
+        self._buffer = bytearray()
+        self._seq = 0
+
+    def write(self, data):
+        self._buffer += data
+        while len(self._buffer) >= self._cache.chunk_size:
+            self._flush(self._cache.chunk_size)
+
+    def _flush(self, size):
+        self._cache._add_chunk(self._body, self._seq, bytes(self._buffer[:size]))
+        del self._buffer[:size]
+        self._seq += 1
+
+    def commit(self):
+        if self._buffer:
+            self._flush(len(self._buffer))
+        self._cache._replace(self._key, self._meta, self._body, self._seq)
+
+    def abort(self):
+        self._buffer = bytearray()
+        self._cache._drop_body(self._body)
+
+
+class SQLiteCache(BaseCache):
+    """Keeps entries in a SQLite database.
+
+    Bodies are split into ``chunk_size`` rows that are read one at a time,
+    so hits are streamed from disk.
+
+    :param path: The database file.
+    """
+
+    chunk_size = 256 * 1024
+
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        self._lock = threading.Lock()
+        # Bodies being read, and those to drop once their readers are done.
+        self._readers = {}
+        self._retired = set()
+        self._db = sqlite3.connect(
+            self.path, check_same_thread=False, isolation_level=None
+        )
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, meta TEXT NOT NULL, "
+                "body INTEGER NOT NULL, chunks INTEGER NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS bodies "
+                "(id INTEGER PRIMARY KEY AUTOINCREMENT)"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS chunks ("
+                "body INTEGER NOT NULL, seq INTEGER NOT NULL, "
+                "data BLOB NOT NULL, PRIMARY KEY (body, seq))"
+            )
+
+    def __getstate__(self):
+        return {"path": self.path}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def _new_body(self):
+        with self._lock:
+            return self._db.execute("INSERT INTO bodies DEFAULT VALUES").lastrowid
+
+    def _add_chunk(self, body, seq, data):
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO chunks (body, seq, data) VALUES (?, ?, ?)",
+                (body, seq, data),
+            )
+
+    def _chunk(self, body, seq):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT data FROM chunks WHERE body = ? AND seq = ?", (body, seq)
+            ).fetchone()
+        return None if row is None else row[0]
+
+    def _drop_body(self, body):
+        with self._lock:
+            self._retire(body)
+
+    def _retire(self, body):
+        # Called with the lock held.
+        if self._readers.get(body):
+            self._retired.add(body)
+        else:
+            self._db.execute("DELETE FROM chunks WHERE body = ?", (body,))
+            self._db.execute("DELETE FROM bodies WHERE id = ?", (body,))
+
+    def _release(self, body):
+        with self._lock:
+            self._readers[body] -= 1
+            if not self._readers[body]:
+                del self._readers[body]
+                if body in self._retired and self._db is not None:
+                    self._retired.discard(body)
+                    self._retire(body)
+
+    def _replace(self, key, meta, body, chunks):
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute(
+                    "SELECT body FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, meta, body, chunks) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(meta), body, chunks),
+                )
+                if row is not None:
+                    self._retire(row[0])
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+
+    def get(self, key):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT meta, body, chunks FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            meta, body, chunks = row
+            self._readers[body] = self._readers.get(body, 0) + 1
+        return json.loads(meta), io.BufferedReader(_SQLiteBody(self, body, chunks))
+
+    def open(self, key, meta):
+        return _SQLiteWriter(self, key, meta)
+
+    def update(self, key, meta):
+        with self._lock:
+            self._db.execute(
+                "UPDATE responses SET meta = ? WHERE key = ?", (json.dumps(meta), key)
+            )
+
+    def delete(self, key):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._retire(row[0])
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+class _CachingBody:
+    """Wraps a urllib3 response, storing its body in the cache as it is read.
+
+    Only decoded data is stored; reading an encoded body without decoding
+    it abandons the entry.
+    """
+
+    def __init__(self, raw, writer):
+        self._raw = raw
+        self._writer = writer
+        self._encoded = raw.headers.get("content-encoding", "identity") != "identity"
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def _save(self, data, decode_content):
+        if self._writer is None or not data:
+            return
+        if self._encoded and not decode_content:
+            self.abort()
+        else:
+            self._writer.write(data)
+
+    def _finish(self):
+        if self._writer is not None:
+            writer, self._writer = self._writer, None
+            writer.commit()
+
+    def abort(self):
+        if self._writer is not None:
+            writer, self._writer = self._writer, None
+            writer.abort()
+
+    def stream(self, amt=2**16, decode_content=None):
+        try:
+            for chunk in self._raw.stream(amt, decode_content=decode_content):
+                self._save(chunk, decode_content)
+                yield chunk
+        except BaseException:
+            self.abort()
+            raise
+        self._finish()
+
+    def read(self, amt=None, decode_content=None, cache_content=False):
+        try:
+            data = self._raw.read(
+                amt, decode_content=decode_content, cache_content=cache_content
+            )
+        except BaseException:
+            self.abort()
+            raise
+        self._save(data, decode_content)
+        if amt is None or (not data and self._raw.closed):
+            self._finish()
+        return data
+
+    def close(self):
+        self.abort()
+        self._raw.close()
+
+    def release_conn(self):
+        self.abort()
+        self._raw.release_conn()
+
+
+class CacheAdapter(HTTPAdapter):
+    """An HTTP adapter that caches responses.
+
+    It behaves as a private cache: ``GET`` responses are stored following
+    their Cache-Control, Expires and Vary headers, fresh ones are served
+    without contacting the server, and stale ones with an ETag or
+    Last-Modified validator are revalidated with a conditional request.
+    Successful ``POST``, ``PUT``, ``PATCH`` and ``DELETE`` requests drop the
+    cached response for their url. Responses carry a ``from_cache``
+    attribute telling whether they were served from the cache.
+
+    Requests that carry their own conditional or Range headers, or a
+    ``no-store`` Cache-Control directive, bypass the cache.
+
+    :param cache: (optional) The :class:`BaseCache` to store responses in;
+        a :class:`MemoryCache` by default.
+
+    Other arguments are those of :class:`HTTPAdapter <requests.adapters.HTTPAdapter>`.
+
+    Usage::
+
+      >>> import requests
+      >>> from requests.cache import CacheAdapter, FileCache
+      >>> s = requests.Session()
+      >>> s.mount('https://', CacheAdapter(FileCache('.http-cache')))
+    """
+
+    __attrs__ = HTTPAdapter.__attrs__ + ["cache"]
+
+    def __init__(self, cache=None, **kwargs):
+        self.cache = MemoryCache() if cache is None else cache
+        super().__init__(**kwargs)
+
+    def cache_key(self, request):
+        """Returns the key that responses to ``request`` are stored under.
+
+        :rtype: str
+        """
+        return urldefrag(request.url)[0]
+
+    def send(
+        self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None
+    ):
+        """Sends PreparedRequest object, answering it from the cache if
+        possible. Returns Response object.
+
+        Takes the same arguments as :meth:`HTTPAdapter.send
+        <requests.adapters.HTTPAdapter.send>`.
+
+        :rtype: requests.Response
+        """
+        kwargs = {
+            "stream": stream,
+            "timeout": timeout,
+            "verify": verify,
+            "cert": cert,
+            "proxies": proxies,
+        }
+        directives = _cache_control(request.headers)
+
+        if (
+            request.method != "GET"
+            or "no-store" in directives
+            or "if-none-match" in request.headers
+            or "if-modified-since" in request.headers
+            or "range" in request.headers
+            or "if-range" in request.headers
+        ):
+            resp = super().send(request, **kwargs)
+            if request.method in INVALIDATING_METHODS and resp.status_code < 400:
+                self.cache.delete(self.cache_key(request))
+            resp.from_cache = False
+            return resp
+
+        key = self.cache_key(request)
+        entry = self.cache.get(key)
+        if entry is not None and not self._matches(entry[0], request):
+            entry[1].close()
+            entry = None
+
+        sent = request
+        if entry is not None:
+            meta, body = entry
+            if "no-cache" not in directives and self._is_fresh(meta, directives):
+                return self._cached_response(request, meta, body)
+
+            sent = self._conditional(request, meta)
+            if sent is None:
+                body.close()
+                entry = None
+                sent = request
+
+        try:
+            resp = super().send(sent, **kwargs)
+        except BaseException:
+            if entry is not None:
+                entry[1].close()
+            raise
+        resp.request = request
+
+        if entry is not None:
+            if resp.status_code == 304:
+                resp.close()
+                meta = self._freshen(meta, resp)
+                self.cache.update(key, meta)
+                return self._cached_response(request, meta, body)
+            body.close()
+
+        meta = self._storable(request, resp)
+        if meta is not None:
+            resp.raw = _CachingBody(resp.raw, self.cache.open(key, meta))
+        resp.from_cache = False
+        return resp
+
+    def close(self):
+        """Disposes of any internal state and closes the cache."""
+        super().close()
+        self.cache.close()
+
+    def _matches(self, meta, request):
+        """Whether the request headers named by Vary match the stored ones."""
+        return all(
+            request.headers.get(name) == value for name, value in meta["vary"].items()
+        )
+
+    def _is_fresh(self, meta, directives):
+        headers = CaseInsensitiveDict(meta["headers"])
+        stored = _cache_control(headers)
+        if "no-cache" in stored:
+            return False
+
+        lifetime = _seconds(stored, "max-age")
+        if lifetime is None:
+            expires = _http_date(headers.get("expires"))
+            if expires is None:
+                return False
+            lifetime = expires - (meta["date"] or meta["response_time"])
+
+        now = time.time()
+        age = (
+            max(0, meta["response_time"] - (meta["date"] or meta["response_time"]))
+            + (_seconds(headers, "age") or 0)
+            + (now - meta["response_time"])
+        )
+        max_age = _seconds(directives, "max-age")
+        if max_age is not None and age > max_age:
+            return False
+        return lifetime - age > (_seconds(directives, "min-fresh") or 0)
+
+    def _conditional(self, request, meta):
+        """Returns a copy of ``request`` revalidating the stored response, or
+        None if the stored response has no validator.
+        """
+        headers = CaseInsensitiveDict(meta["headers"])
+        etag = headers.get("etag")
+        last_modified = headers.get("last-modified")
+        if etag is None and last_modified is None:
+            return None
+
+        conditional = request.copy()
+        if etag is not None:
+            conditional.headers["If-None-Match"] = etag
+        if last_modified is not None:
+            conditional.headers["If-Modified-Since"] = last_modified
+        return conditional
+
+    def _storable(self, request, resp):
+        """Returns the meta to store ``resp`` with, or None if it may not be
+        stored.
+        """
+        headers = resp.headers
+        directives = _cache_control(headers)
+        vary = [v.strip().lower() for v in headers.get("vary", "").split(",")]
+        if (
+            resp.status_code not in CACHEABLE_STATUS_CODES
+            or "no-store" in directives
+            or "*" in vary
+            or not hasattr(resp.raw, "stream")
+        ):
+            return None
+        if not (
+            "max-age" in directives
+            or "expires" in headers
+            or "etag" in headers
+            or "last-modified" in headers
+        ):
+            return None
+
+        now = time.time()
+        return {
+            "url": resp.url,
+            "status": resp.status_code,
+            "reason": resp.reason,
+            "headers": self._stored_headers(resp),
+            "date": _http_date(headers.get("date")),
+            "response_time": now,
+            "vary": {name: request.headers.get(name) for name in vary if name},
+        }
+
+    def _stored_headers(self, resp):
+        encoded = resp.headers.get("content-encoding", "identity") != "identity"
+        return [
+            [name, value]
+            for name, value in resp.headers.items()
+            if name.lower() not in _TRANSFER_HEADERS
+            or (name.lower() == "content-length" and not encoded)
+        ]
+
+    def _freshen(self, meta, resp):
+        """Updates stored meta with the headers of a 304 response."""
+        headers = CaseInsensitiveDict(meta["headers"])
+        for name, value in resp.headers.items():
+            if name.lower() not in _TRANSFER_HEADERS:
+                headers[name] = value
+
+        meta = dict(meta)
+        meta["headers"] = [list(item) for item in headers.items()]
+        meta["date"] = _http_date(headers.get("date"))
+        meta["response_time"] = time.time()
+        return meta
+
+    def _cached_response(self, request, meta, body):
+        response = Response()
+        response.status_code = meta["status"]
+        response.headers = CaseInsensitiveDict(meta["headers"])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = body
+        response.reason = meta["reason"]
+        response.url = meta["url"]
+        response.request = request
+        response.connection = self
+        response.from_cache = True
+        return response
@@ -9,7 +9,9 @@ requests.utils imports from here, so be careful with imports.
 
 import calendar
 import copy
+import heapq
 import time
+import weakref
 
 from ._internal_utils import to_native_string
 from .compat import Morsel, MutableMapping, cookielib, urlparse, urlunparse
@@ -437,6 +439,332 @@ class RequestsCookieJar(cookielib.CookieJar, MutableMapping):
         return self._policy
 
 
+class IndexedCookieJar(RequestsCookieJar):
+    """A :class:`RequestsCookieJar` that stays fast with many cookies.
+
+    A plain jar visits every cookie it holds to build the ``Cookie`` header
+    of a request, to look a cookie up by name and to drop expired cookies.
+    This one only visits the domains the request's host can receive cookies
+    from, looks names up in an index, and keeps the cookies that expire in
+    a heap ordered by expiry. It behaves like a ``RequestsCookieJar``
+    otherwise, and sends the same ``Cookie`` headers.
+
+    :meth:`copy` takes constant time: the copy shares the cookies of this
+    jar until either jar is changed, and then takes cookies of its own.
+    Changing this jar stays as cheap while copies of it are in use, so
+    sessions prepare requests from it without copying every cookie.
+
+    Usage::
+
+      >>> import requests
+      >>> from requests.cookies import IndexedCookieJar
+      >>> s = requests.Session()
+      >>> s.cookies = IndexedCookieJar()
+
+    Domains are only looked up this way with the default
+    ``http.cookiejar.DefaultCookiePolicy``; with another policy every domain
+    is visited, as in a plain jar.
+    """
+
+    #: Length of the undo list past which entries no copy needs are dropped.
+    _undo_limit = 64
+
+    def __init__(self, policy=None):
+        super().__init__(policy)
+        # The jar whose cookies this copy shares, as they were when that
+        # jar's version was self._version, or None for a jar of its own.
+        self._source = None
+        # Bumped on each change to a cookie of a jar of its own.
+        self._version = 0
+        # Copies sharing the cookies of this jar, by id, and while any of
+        # them is in use, (version, domain, path, name, cookie, has_path,
+        # order) of each cookie changed since, as it was before the change.
+        self._copies = weakref.WeakValueDictionary()
+        self._undo = []
+        self._reset_index()
+
+    def _reset_index(self):
+        # {name: {(domain, path): cookie}} of every cookie in the jar.
+        self._by_name = {}
+        # Order in which the domains were added to self._cookies.
+        self._domain_order = {}
+        self._next_domain = 0
+        # Heap of (expires, domain, path, name), some of which may be stale.
+        self._expiry = []
+        self._size = 0
+
+    def _record(self, domain, path, name):
+        # Called before the cookie is changed, to keep what it was for the
+        # copies sharing the cookies.
+        if self._copies:
+            paths = self._cookies.get(domain)
+            names = None if paths is None else paths.get(path)
+            self._undo.append(
+                (
+                    self._version,
+                    domain,
+                    path,
+                    name,
+                    None if names is None else names.get(name),
+                    names is not None,
+                    None if paths is None else self._domain_order[domain],
+                )
+            )
+            if len(self._undo) > self._undo_limit:
+                oldest = min(
+                    (jar._version for jar in self._copies.values()),
+                    default=self._version,
+                )
+                self._undo = [entry for entry in self._undo if entry[0] >= oldest]
+                self._undo_limit = max(type(self)._undo_limit, 2 * len(self._undo))
+        elif self._undo:
+            self._undo = []
+            self._undo_limit = type(self)._undo_limit
+        self._version += 1
+
+    def _sync(self):
+        # A copy stops sharing cookies its source has changed since.
+        if self._source is not None and self._source._version != self._version:
+            with self._cookies_lock:
+                self._own()
+
+    def _own(self):
+        # Take cookies of its own for a copy, as they were in the source when
+        # it was copied: the source's cookies, with the changes made since
+        # undone.
+        source = self._source
+        with source._cookies_lock:
+            undo = source._undo
+            start = len(undo)
+            while start and undo[start - 1][0] >= self._version:
+                start -= 1
+            undo = undo[start:]
+            cookies = {
+                domain: {path: names.copy() for path, names in paths.items()}
+                for domain, paths in source._cookies.items()
+            }
+            domain_order = source._domain_order.copy()
+            self._next_domain = source._next_domain
+            source._copies.pop(id(self), None)
+        for _, domain, path, name, cookie, has_path, order in reversed(undo):
+            if order is None:
+                cookies.pop(domain, None)
+                domain_order.pop(domain, None)
+                continue
+            paths = cookies.setdefault(domain, {})
+            domain_order[domain] = order
+            if not has_path:
+                paths.pop(path, None)
+            elif cookie is not None:
+                paths.setdefault(path, {})[name] = cookie
+            else:
+                paths.setdefault(path, {}).pop(name, None)
+        by_name = {}
+        expiry = []
+        for domain, paths in cookies.items():
+            for path, names in paths.items():
+                for name, cookie in names.items():
+                    cookie = names[name] = copy.copy(cookie)
+                    by_name.setdefault(name, {})[domain, path] = cookie
+                    if cookie.expires is not None:
+                        expiry.append((cookie.expires, domain, path, name))
+        heapq.heapify(expiry)
+        self._cookies = cookies
+        self._by_name = by_name
+        self._domain_order = domain_order
+        self._expiry = expiry
+        self._size = sum(map(len, by_name.values()))
+        self._source = None
+
+    def _push_expiry(self, expires, domain, path, name):
+        heapq.heappush(self._expiry, (expires, domain, path, name))
+        if len(self._expiry) > 2 * self._size + 64:
+            # Mostly entries of cookies set again since; start over.
+            self._expiry = [
+                (cookie.expires, domain, path, name)
+                for name, cookies in self._by_name.items()
+                for (domain, path), cookie in cookies.items()
+                if cookie.expires is not None
+            ]
+            heapq.heapify(self._expiry)
+
+    def set_cookie(self, cookie, *args, **kwargs):
+        with self._cookies_lock:
+            if self._source is not None:
+                self._own()
+            domain, path, name = cookie.domain, cookie.path, cookie.name
+            self._record(domain, path, name)
+            if domain not in self._cookies:
+                self._domain_order[domain] = self._next_domain
+                self._next_domain += 1
+            super().set_cookie(cookie, *args, **kwargs)
+            cookies = self._by_name.setdefault(name, {})
+            if (domain, path) not in cookies:
+                self._size += 1
+            cookies[domain, path] = cookie
+            if cookie.expires is not None:
+                self._push_expiry(cookie.expires, domain, path, name)
+
+    def clear(self, domain=None, path=None, name=None):
+        with self._cookies_lock:
+            if domain is None and path is None and name is None:
+                if self._source is not None:
+                    self._source._copies.pop(id(self), None)
+                    self._source = None
+                for cookie_name, cookies in list(self._by_name.items()):
+                    for cookie_domain, cookie_path in cookies:
+                        self._record(cookie_domain, cookie_path, cookie_name)
+                super().clear()
+                self._reset_index()
+                return
+            if self._source is not None:
+                self._own()
+            paths = self._cookies.get(domain, {})
+            if name is not None:
+                removed = [(path, name)] if name in paths.get(path, {}) else []
+            elif path is not None:
+                removed = [(path, name) for name in paths.get(path, {})]
+            else:
+                removed = [(path, name) for path in paths for name in paths[path]]
+            for cookie_path, cookie_name in removed:
+                self._record(domain, cookie_path, cookie_name)
+            # Raises like CookieJar.clear() before the index is touched.
+            super().clear(domain, path, name)
+            for cookie_path, cookie_name in removed:
+                cookies = self._by_name[cookie_name]
+                del cookies[domain, cookie_path]
+                if not cookies:
+                    del self._by_name[cookie_name]
+                self._size -= 1
+            if path is None and name is None:
+                del self._domain_order[domain]
+
+    def clear_expired_cookies(self):
+        now = time.time()
+        with self._cookies_lock:
+            self._sync()
+            if not self._expiry or self._expiry[0][0] > now:
+                return
+            if self._source is not None:
+                self._own()
+            expiry = self._expiry
+            while expiry and expiry[0][0] <= now:
+                expires, domain, path, name = heapq.heappop(expiry)
+                cookie = self._cookies.get(domain, {}).get(path, {}).get(name)
+                if cookie is None or cookie.expires is None:
+                    continue
+                if cookie.is_expired(now):
+                    self.clear(domain, path, name)
+                elif cookie.expires != expires:
+                    # Its expiry was changed in place.
+                    self._push_expiry(cookie.expires, domain, path, name)
+                    expiry = self._expiry
+
+    def _cookies_for_request(self, request):
+        self._sync()
+        if type(self._policy) is not cookielib.DefaultCookiePolicy:
+            return super()._cookies_for_request(request)
+        # DefaultCookiePolicy.domain_return_ok() only accepts the domains
+        # "", "{suffix}" and ".{suffix}" for the suffixes of the request's
+        # host made of whole labels, so only those need to be visited. They
+        # are visited in the order a plain jar visits them.
+        req_host, erhn = cookielib.eff_request_host(request)
+        candidates = {""}
+        for host in (req_host, erhn):
+            labels = host.split(".")
+            for i in range(len(labels)):
+                suffix = ".".join(labels[i:])
+                candidates.add(suffix)
+                candidates.add("." + suffix)
+        domains = [domain for domain in candidates if domain in self._cookies]
+        domains.sort(key=self._domain_order.__getitem__)
+        cookies = []
+        for domain in domains:
+            cookies.extend(self._cookies_for_domain(domain, request))
+        return cookies
+
+    def __iter__(self):
+        self._sync()
+        return super().__iter__()
+
+    def __len__(self):
+        self._sync()
+        return self._size
+
+    def _find(self, name, domain=None, path=None):
+        self._sync()
+        cookies = self._by_name.get(name, {})
+        for (cookie_domain, cookie_path), cookie in cookies.items():
+            if domain is None or cookie_domain == domain:
+                if path is None or cookie_path == path:
+                    return cookie.value
+
+        raise KeyError(f"name={name!r}, domain={domain!r}, path={path!r}")
+
+    def _find_no_duplicates(self, name, domain=None, path=None):
+        self._sync()
+        toReturn = None
+        cookies = self._by_name.get(name, {})
+        for (cookie_domain, cookie_path), cookie in cookies.items():
+            if domain is None or cookie_domain == domain:
+                if path is None or cookie_path == path:
+                    if toReturn is not None:
+                        raise CookieConflictError(
+                            f"There are multiple cookies with name, {name!r}"
+                        )
+                    toReturn = cookie.value
+
+        if toReturn:
+            return toReturn
+        raise KeyError(f"name={name!r}, domain={domain!r}, path={path!r}")
+
+    def copy(self):
+        """Return a copy of this IndexedCookieJar, sharing its cookies until
+        either jar is changed.
+        """
+        new_cj = IndexedCookieJar()
+        new_cj.set_policy(self.get_policy())
+        with self._cookies_lock:
+            self._sync()
+            # A copy of a copy shares the cookies of the same source.
+            source = self if self._source is None else self._source
+            with source._cookies_lock:
+                new_cj._cookies = self._cookies
+                new_cj._by_name = self._by_name
+                new_cj._domain_order = self._domain_order
+                new_cj._next_domain = self._next_domain
+                new_cj._expiry = self._expiry
+                new_cj._size = self._size
+                new_cj._source = source
+                new_cj._version = source._version
+                source._copies[id(new_cj)] = new_cj
+        return new_cj
+
+    def __getstate__(self):
+        with self._cookies_lock:
+            if self._source is not None:
+                self._own()
+            state = super().__getstate__()
+        # Copies of this jar are not pickled with it.
+        state.pop("_copies")
+        state.pop("_undo_limit", None)
+        state["_undo"] = []
+        return state
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        self._copies = weakref.WeakValueDictionary()
+
+
+def _session_cookie_jar(jar):
+    """Returns the jar a request prepared by a session with the cookie jar
+    ``jar`` starts from, holding copies of its cookies.
+    """
+    if isinstance(jar, IndexedCookieJar):
+        return jar.copy()
+    return merge_cookies(RequestsCookieJar(), jar)
+
+
 def _copy_cookie_jar(jar):
     if jar is None:
         return None
@@ -530,8 +858,9 @@ def cookiejar_from_dict(cookie_dict, cookiejar=None, overwrite=True):
     if cookiejar is None:
         cookiejar = RequestsCookieJar()
 
-    if cookie_dict is not None:
-        names_from_jar = [cookie.name for cookie in cookiejar]
+    if cookie_dict:
+        if not overwrite:
+            names_from_jar = {cookie.name for cookie in cookiejar}
         for name in cookie_dict:
             if overwrite or (name not in names_from_jar):
                 cookiejar.set_cookie(create_cookie(name, cookie_dict[name]))
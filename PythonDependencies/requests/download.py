@@ -0,0 +1,296 @@
+"""
+requests.download
+~~~~~~~~~~~~~~~~~
+
+This module implements :meth:`Session.download
+<requests.sessions.Session.download>`, which fetches a large file as
+several byte ranges at once and can pick up an interrupted download where
+it stopped.
+"""
+
+import json
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .exceptions import DownloadError
+from .models import SAVE_CHUNK_SIZE
+
+#: Suffix of the file a download is written to until it is complete.
+PARTIAL_SUFFIX = ".part"
+#: Suffix of the record of the progress of each part, next to it.
+PROGRESS_SUFFIX = ".part.json"
+#: Smallest part a download is split into.
+MIN_PART_SIZE = 1024 * 1024
+#: Bytes written between two saves of the progress record.
+CHECKPOINT_SIZE = 16 * 1024 * 1024
+
+_CONTENT_RANGE_RE = re.compile(r"^bytes (\d+)-(\d+)/(\d+|\*)$")
+
+if hasattr(os, "pwrite"):
+
+    def _pwrite(fd, data, offset, lock):
+        view = memoryview(data)
+        while view:
+            written = os.pwrite(fd, view, offset)
+            view = view[written:]
+            offset += written
+
+else:  # Windows
+
+    def _pwrite(fd, data, offset, lock):
+        with lock:
+            os.lseek(fd, offset, os.SEEK_SET)
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view) :]
+
+
+class _RangedDownload:
+    """The state of one download of ``length`` bytes from ``url``.
+
+    ``parts`` holds ``[start, end, position]`` of every byte range, where
+    ``position`` is the next byte of it to fetch.
+    """
+
+    def __init__(self, session, url, path, length, etag, last_modified, kwargs):
+        self.session = session
+        self.url = url
+        self.path = path
+        self.length = length
+        self.etag = etag
+        self.last_modified = last_modified
+        self.kwargs = kwargs
+        self.parts = []
+        self._fd = None
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._unsaved = 0
+        self._stopped = threading.Event()
+
+    @property
+    def _progress_path(self):
+        return self.path + PROGRESS_SUFFIX
+
+    @property
+    def _partial_path(self):
+        return self.path + PARTIAL_SUFFIX
+
+    def _record(self):
+        return {
+            "url": self.url,
+            "length": self.length,
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+            "parts": self.parts,
+        }
+
+    def _resume(self):
+        """Picks up the parts of an earlier download of the same file."""
+        try:
+            with open(self._progress_path) as f:
+                record = json.load(f)
+            size = os.path.getsize(self._partial_path)
+        except (OSError, ValueError):
+            return False
+        parts = record.pop("parts", None)
+        current = self._record()
+        del current["parts"]
+        if record != current or size != self.length or not parts:
+            return False
+        self.parts = [list(part) for part in parts]
+        return True
+
+    def _split(self, parts):
+        count = max(1, min(parts, -(-self.length // MIN_PART_SIZE)))
+        size = -(-self.length // count)
+        self.parts = [
+            [start, min(start + size, self.length) - 1, start]
+            for start in range(0, self.length, size)
+        ]
+
+    def _save(self):
+        with self._lock:
+            record = self._record()
+            record["parts"] = [list(part) for part in self.parts]
+            self._unsaved = 0
+            # The bytes recorded as fetched must be on disk before the record.
+            os.fsync(self._fd)
+            tmp = self._progress_path + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump(record, f)
+            os.replace(tmp, self._progress_path)
+
+    def _advance(self, part, count):
+        part[2] += count
+        with self._lock:
+            self._unsaved += count
+            checkpoint = self._unsaved >= CHECKPOINT_SIZE
+        if checkpoint:
+            self._save()
+
+    def run(self, parts, chunk_size):
+        resumed = self._resume()
+        if not resumed:
+            self._split(parts)
+        flags = os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0)
+        if not resumed:
+            flags |= os.O_TRUNC
+        self._fd = os.open(self._partial_path, flags, 0o666)
+        try:
+            if not resumed:
+                os.ftruncate(self._fd, self.length)
+            pending = [part for part in self.parts if part[2] <= part[1]]
+            if pending:
+                self._fetch_all(pending, chunk_size)
+            if os.fstat(self._fd).st_size != self.length:
+                raise DownloadError(
+                    f"{self._partial_path} does not hold the {self.length} bytes "
+                    f"of {self.url}"
+                )
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+        os.replace(self._partial_path, self.path)
+        try:
+            os.remove(self._progress_path)
+        except FileNotFoundError:
+            pass
+        return self.length
+
+    def _fetch_all(self, pending, chunk_size):
+        with ThreadPoolExecutor(
+            max_workers=len(pending), thread_name_prefix="requests-download"
+        ) as executor:
+            futures = [
+                executor.submit(self._fetch, part, chunk_size) for part in pending
+            ]
+            try:
+                for future in futures:
+                    future.result()
+            except BaseException:
+                self._stopped.set()
+                raise
+            finally:
+                # Waits for the other parts to stop before saving them.
+                executor.shutdown(wait=True)
+                self._save()
+
+    def _fetch(self, part, chunk_size):
+        start, end, position = part
+        headers = dict(self.kwargs.get("headers") or {})
+        headers["Range"] = f"bytes={position}-{end}"
+        headers["Accept-Encoding"] = "identity"
+        # A changed file is then sent whole instead of the range asked for.
+        if self.etag or self.last_modified:
+            headers["If-Range"] = self.etag or self.last_modified
+        kwargs = dict(self.kwargs, headers=headers, stream=True)
+
+        with self.session.get(self.url, **kwargs) as r:
+            r.raise_for_status()
+            if r.status_code != 206:
+                raise DownloadError(
+                    f"{self.url} changed or does not support byte ranges "
+                    f"(got {r.status_code} for a range)",
+                    response=r,
+                )
+            match = _CONTENT_RANGE_RE.match(r.headers.get("Content-Range", ""))
+            if match is None or (
+                int(match.group(1)),
+                int(match.group(2)),
+                match.group(3),
+            ) != (position, end, str(self.length)):
+                raise DownloadError(
+                    f"Unexpected Content-Range {r.headers.get('Content-Range')!r} "
+                    f"for bytes {position}-{end}/{self.length} of {self.url}",
+                    response=r,
+                )
+            if self.etag and r.headers.get("ETag") != self.etag:
+                raise DownloadError(
+                    f"ETag of {self.url} changed from {self.etag} to "
+                    f"{r.headers.get('ETag')} during the download",
+                    response=r,
+                )
+
+            for chunk in r.iter_content_into(bytearray(chunk_size)):
+                if self._stopped.is_set():
+                    return
+                if part[2] + len(chunk) > end + 1:
+                    raise DownloadError(
+                        f"Received more than bytes {position}-{end} of {self.url}",
+                        response=r,
+                    )
+                _pwrite(self._fd, chunk, part[2], self._write_lock)
+                self._advance(part, len(chunk))
+
+        if part[2] != end + 1:
+            raise DownloadError(
+                f"Bytes {part[2]}-{end} of {self.url} are missing", response=r
+            )
+
+
+def download(session, url, path, parts=4, chunk_size=SAVE_CHUNK_SIZE, **kwargs):
+    """Downloads ``url`` to ``path`` with ``session``; see
+    :meth:`Session.download <requests.sessions.Session.download>`.
+    """
+    head_headers = dict(kwargs.get("headers") or {})
+    head_headers["Accept-Encoding"] = "identity"
+    head_kwargs = dict(kwargs, headers=head_headers, allow_redirects=True)
+    head = session.head(url, **head_kwargs)
+    if head.status_code in (405, 501):
+        # HEAD isn't supported, so neither is anything clever.
+        return _download_whole(session, head.url, os.fspath(path), chunk_size, kwargs)
+    head.raise_for_status()
+
+    length = head.headers.get("Content-Length")
+    ranges = "bytes" in head.headers.get("Accept-Ranges", "").lower()
+    path = os.fspath(path)
+    if not ranges or length is None or not length.isdigit():
+        return _download_whole(session, head.url, path, chunk_size, kwargs)
+
+    etag = head.headers.get("ETag")
+    if etag is not None and etag.startswith("W/"):
+        # Weak validators can't be used with If-Range.
+        etag = None
+    kwargs.pop("allow_redirects", None)
+    job = _RangedDownload(
+        session,
+        head.url,
+        path,
+        int(length),
+        etag,
+        head.headers.get("Last-Modified"),
+        kwargs,
+    )
+    if not job.length:
+        open(path, "wb").close()
+        return 0
+    return job.run(parts, chunk_size)
+
+
+def _download_whole(session, url, path, chunk_size, kwargs):
+    """Downloads ``url`` in a single request, for servers without ranges."""
+    kwargs = dict(kwargs, stream=True)
+    partial = path + PARTIAL_SUFFIX
+    with session.get(url, **kwargs) as r:
+        r.raise_for_status()
+        written = r.save_to(partial, chunk_size)
+        length = r.headers.get("Content-Length")
+        if (
+            length is not None
+            and length.isdigit()
+            and "Content-Encoding" not in r.headers
+            and written != int(length)
+        ):
+            raise DownloadError(
+                f"Received {written} of the {length} bytes of {url}", response=r
+            )
+    os.replace(partial, path)
+    try:
+        # Left behind by an earlier ranged attempt.
+        os.remove(path + PROGRESS_SUFFIX)
+    except FileNotFoundError:
+        pass
+    return written
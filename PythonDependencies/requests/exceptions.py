@@ -64,6 +64,10 @@ class ProxyError(ConnectionError):
     """A proxy error occurred."""
 
 
+class CircuitOpenError(ConnectionError):
+    """The circuit breaker of the origin is open, so the request was not sent."""
+
+
 class SSLError(ConnectionError):
     """An SSL error occurred."""
 
@@ -136,6 +140,10 @@ class UnrewindableBodyError(RequestException):
     """Requests encountered an error when trying to rewind a body."""
 
 
+class DownloadError(RequestException):
+    """A download did not receive the file it expected."""
+
+
 # Warnings
 
 
@@ -0,0 +1,290 @@
+"""
+requests.metrics
+~~~~~~~~~~~~~~~~
+
+This module provides the timing breakdown attached to responses as
+:attr:`Response.timings <requests.Response.timings>`, a response hook that
+aggregates it per host, and the connection pool statistics reported by
+:meth:`HTTPAdapter.pool_stats <requests.adapters.HTTPAdapter.pool_stats>`.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+
+from .compat import urlparse
+
+clock = time.perf_counter
+
+
+class Timings:
+    """Timing breakdown of a single request, in seconds.
+
+    ``dns``, ``connect`` and ``tls`` are the host name lookup, TCP connect
+    and TLS handshake (including any proxy tunnel) of a new connection;
+    they are None when a pooled connection was reused, which ``reused``
+    tells (it is None when the connection was not instrumented). ``send``
+    covers getting a connection from the pool and writing the request,
+    ``ttfb`` the wait for the response headers after that, and ``download``
+    reading the body, which is None until the body has been read. ``total``
+    is the sum of the phases that happened. ``tls_resumed`` tells whether
+    the TLS handshake of a new connection resumed an earlier session.
+    """
+
+    _phases = ("dns", "connect", "tls", "send", "ttfb", "download")
+
+    def __init__(self):
+        self.dns = None
+        self.connect = None
+        self.tls = None
+        self.send = None
+        self.ttfb = None
+        self.download = None
+        self.reused = None
+        self.tls_resumed = None
+
+        self.started = clock()
+        self._sent = None
+        self._headers = None
+        self._callbacks = []
+        self._finished = False
+
+    def __repr__(self):
+        phases = ", ".join(
+            f"{name}={value * 1000:.2f}ms"
+            for name, value in self.as_dict().items()
+            if isinstance(value, float)
+        )
+        return f"<Timings [{phases}, reused={self.reused}]>"
+
+    @property
+    def total(self):
+        return sum(getattr(self, name) or 0.0 for name in self._phases)
+
+    def as_dict(self):
+        """Returns the phases and ``reused`` as a dict.
+
+        :rtype: dict
+        """
+        timings = {name: getattr(self, name) for name in self._phases}
+        timings["total"] = self.total
+        timings["reused"] = self.reused
+        return timings
+
+    def connected(self, dns, connect, tls, tls_resumed=None):
+        """Records the setup of the new connection the request is sent over."""
+        self.dns = dns
+        self.connect = connect
+        self.tls = tls
+        self.tls_resumed = tls_resumed
+        self.reused = False
+
+    def request_sent(self):
+        """Records that the request has been written to the connection."""
+        self._sent = clock()
+
+    def headers_received(self):
+        """Records the arrival of the response headers."""
+        self._headers = clock()
+        if self.reused is None:
+            self.reused = True
+        if self._sent is None:
+            self._sent = self._headers
+        setup = (self.dns or 0.0) + (self.connect or 0.0) + (self.tls or 0.0)
+        self.send = max(0.0, self._sent - self.started - setup)
+        self.ttfb = self._headers - self._sent
+
+    def finish(self, complete=True):
+        """Records the end of the response, once its body has been read or
+        it was closed early (``complete`` is False), and runs the callbacks
+        added with :meth:`add_done_callback`. Only the first call counts.
+        """
+        if self._finished:
+            return
+        self._finished = True
+        if complete and self._headers is not None:
+            self.download = clock() - self._headers
+
+        callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback(self)
+
+    def add_done_callback(self, callback):
+        """Calls ``callback(timings)`` once the response is finished."""
+        if self._finished:
+            callback(self)
+        else:
+            self._callbacks.append(callback)
+
+
+class Histogram:
+    """A histogram of durations in seconds, over fixed buckets spaced
+    roughly logarithmically from 1 ms to 10 s.
+    """
+
+    bounds = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+    def __init__(self):
+        self.buckets = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        self.buckets[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, q):
+        """Returns the upper bound of the bucket holding the ``q``-th
+        percentile, or the largest value seen for the last bucket.
+        """
+        if not self.count:
+            return None
+        rank = q / 100 * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.buckets):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "mean": self.sum / self.count if self.count else None,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "buckets": dict(zip(self.bounds + (float("inf"),), self.buckets)),
+        }
+
+
+class PoolStats:
+    """Connection counters of one connection pool.
+
+    ``created`` and ``discarded`` count connections opened and closed by
+    the pool (dropped by the server, expired, or handed back to a full
+    pool), ``in_use`` and ``peak_in_use`` the connections checked out, and
+    ``wait`` is a :class:`Histogram` of the time spent getting one.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.created = 0
+        self.discarded = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.wait = Histogram()
+
+    def connection_created(self):
+        with self._lock:
+            self.created += 1
+
+    def connection_discarded(self):
+        with self._lock:
+            self.discarded += 1
+
+    def checked_out(self, wait):
+        with self._lock:
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+            self.wait.add(wait)
+
+    def checked_in(self):
+        with self._lock:
+            self.in_use -= 1
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                "created": self.created,
+                "discarded": self.discarded,
+                "in_use": self.in_use,
+                "peak_in_use": self.peak_in_use,
+                "wait": self.wait.as_dict(),
+            }
+
+
+class HostMetrics:
+    """A response hook that aggregates :attr:`Response.timings
+    <requests.Response.timings>` into per-host histograms.
+
+    A response is recorded once its body has been read or it is closed.
+
+    Usage::
+
+      >>> import requests
+      >>> from requests.metrics import HostMetrics
+      >>> metrics = HostMetrics()
+      >>> s = requests.Session()
+      >>> s.hooks['response'].append(metrics)
+      >>> s.get('https://httpbin.org/get')
+      <Response [200]>
+      >>> metrics.snapshot()['https://httpbin.org']['connections']
+      {'new': 1, 'reused': 0}
+    """
+
+    phases = Timings._phases + ("total",)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hosts = {}
+
+    def __getstate__(self):
+        with self._lock:
+            return {"_hosts": self._hosts}
+
+    def __setstate__(self, state):
+        self._lock = threading.Lock()
+        self._hosts = state["_hosts"]
+
+    def __call__(self, r, *args, **kwargs):
+        timings = getattr(r, "timings", None)
+        if timings is not None:
+            parsed = urlparse(r.request.url if r.request is not None else r.url)
+            host = f"{parsed.scheme}://{parsed.netloc}".lower()
+            timings.add_done_callback(lambda t: self.record(host, t))
+
+    def record(self, host, timings):
+        """Adds ``timings`` to the histograms of ``host``."""
+        with self._lock:
+            stats = self._hosts.get(host)
+            if stats is None:
+                stats = self._hosts[host] = {
+                    "histograms": {phase: Histogram() for phase in self.phases},
+                    "new": 0,
+                    "reused": 0,
+                }
+            if timings.reused is not None:
+                stats["reused" if timings.reused else "new"] += 1
+            for phase, value in timings.as_dict().items():
+                if phase in stats["histograms"] and value is not None:
+                    stats["histograms"][phase].add(value)
+
+    def snapshot(self):
+        """Returns the histograms and connection counts of every host.
+
+        :rtype: dict
+        """
+        with self._lock:
+            return {
+                host: {
+                    "connections": {"new": stats["new"], "reused": stats["reused"]},
+                    "phases": {
+                        phase: histogram.as_dict()
+                        for phase, histogram in stats["histograms"].items()
+                    },
+                }
+                for host, stats in self._hosts.items()
+            }
+
+    def reset(self):
+        """Forgets everything recorded so far."""
+        with self._lock:
+            self._hosts.clear()
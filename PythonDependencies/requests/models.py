@@ -5,13 +5,16 @@ requests.models
 This module contains the primary objects that power Requests.
 """
 
+import codecs
 import datetime
 
 # Import encoding now, to avoid implicit import later.
 # Implicit import within threads may cause LookupError when standard library is in a ZIP,
 # such as in Embedded Python. See https://github.com/psf/requests/issues/3578.
 import encodings.idna  # noqa: F401
-from io import UnsupportedOperation
+from bisect import bisect_right
+from contextlib import contextmanager
+from io import TextIOBase, UnsupportedOperation
 
 from urllib3.exceptions import (
     DecodeError,
@@ -21,7 +24,11 @@ from urllib3.exceptions import (
     SSLError,
 )
 from urllib3.fields import RequestField
-from urllib3.filepost import encode_multipart_formdata
+from urllib3.filepost import (
+    choose_boundary,
+    encode_multipart_formdata,
+    iter_field_objects,
+)
 from urllib3.util import parse_url
 
 from ._internal_utils import to_native_string, unicode_is_ascii
@@ -56,11 +63,13 @@ from .structures import CaseInsensitiveDict
 from .utils import (
     check_header_validity,
     get_auth_from_url,
+    get_declared_encoding,
     guess_filename,
     guess_json_utf,
     iter_slices,
     parse_header_links,
     requote_uri,
+    stream_decode_json,
     stream_decode_response_unicode,
     super_len,
     to_key_val_list,
@@ -77,8 +86,47 @@ REDIRECT_STATI = (
 )
 
 DEFAULT_REDIRECT_LIMIT = 30
+#: Most bytes of a redirect's body read to reuse its connection, when the
+#: session doesn't keep redirect responses.
+REDIRECT_DRAIN_LIMIT = 64 * 1024
 CONTENT_CHUNK_SIZE = 10 * 1024
 ITER_CHUNK_SIZE = 512
+SAVE_CHUNK_SIZE = 1024 * 1024
+ENCODING_DETECTION_LIMIT = 64 * 1024
+#: Total size of the files of a multipart upload above which the body is
+#: streamed from the files instead of being built in memory.
+MULTIPART_STREAM_THRESHOLD = 1024 * 1024
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+@contextmanager
+def _translate_read_errors():
+    """Re-raises urllib3 errors from reading a body as Requests exceptions."""
+    try:
+        yield
+    except ProtocolError as e:
+        raise ChunkedEncodingError(e)
+    except DecodeError as e:
+        raise ContentDecodingError(e)
+    except ReadTimeoutError as e:
+        raise ConnectionError(e)
+    except SSLError as e:
+        raise RequestsSSLError(e)
+
+
+def _undecoded_fp(raw):
+    """Returns the file object under the urllib3 response ``raw`` when its
+    body needs no decoding, so it can be read without a copy, else None.
+    """
+    fp = getattr(raw, "_fp", None)
+    if (
+        not hasattr(fp, "readinto")
+        or not hasattr(raw, "_error_catcher")
+        or getattr(raw, "_decoded_buffer", None)
+        or raw.headers.get("content-encoding", "identity").lower() != "identity"
+    ):
+        return None
+    return fp
 
 
 class RequestEncodingMixin:
@@ -142,6 +190,8 @@ class RequestEncodingMixin:
         if parameters are supplied as a dict.
         The tuples may be 2-tuples (filename, fileobj), 3-tuples (filename, fileobj, contentype)
         or 4-tuples (filename, fileobj, contentype, custom_headers).
+        When the files add up to ``MULTIPART_STREAM_THRESHOLD`` bytes or more,
+        the body is a :class:`MultipartEncoder` that reads them as it is sent.
         """
         if not files:
             raise ValueError("Files must be provided.")
@@ -185,24 +235,176 @@ class RequestEncodingMixin:
                 fn = guess_filename(v) or k
                 fp = v
 
-            if isinstance(fp, (str, bytes, bytearray)):
-                fdata = fp
-            elif hasattr(fp, "read"):
-                fdata = fp.read()
-            elif fp is None:
+            if fp is None:
                 continue
-            else:
-                fdata = fp
 
-            rf = RequestField(name=k, data=fdata, filename=fn, headers=fh)
+            # File objects are read once we know whether to stream them.
+            rf = RequestField(name=k, data=fp, filename=fn, headers=fh)
             rf.make_multipart(content_type=ft)
             new_fields.append(rf)
 
+        file_fields = [
+            rf
+            for rf in new_fields
+            if isinstance(rf, RequestField) and hasattr(rf.data, "read")
+        ]
+        streamed = sum(
+            MultipartEncoder.streamable_length(rf.data) or 0 for rf in file_fields
+        )
+        if streamed >= MULTIPART_STREAM_THRESHOLD:
+            body = MultipartEncoder(new_fields)
+            return body, body.content_type
+
+        for rf in file_fields:
+            rf.data = rf.data.read()
+
         body, content_type = encode_multipart_formdata(new_fields)
 
         return body, content_type
 
 
+class MultipartEncoder:
+    """A ``multipart/form-data`` body that is read from its files while it
+    is sent, instead of being built in memory.
+
+    It produces the same bytes as :func:`urllib3.encode_multipart_formdata`
+    for the same ``fields``. The data of a field may also be a file object:
+    a seekable binary file is read from its current position when the body
+    is, any other file object up front. The encoder has a length, so that a
+    ``Content-Length`` can be sent, and can be rewound with :meth:`seek`
+    for redirects and retries.
+
+    :param fields: :class:`~urllib3.fields.RequestField` objects, or
+        ``(name, value)`` tuples, as taken by
+        :func:`~urllib3.encode_multipart_formdata`.
+    :param boundary: (optional) The multipart boundary, chosen at random
+        by default.
+    :param chunk_size: (optional) Size of the chunks yielded when iterating
+        over the body.
+    """
+
+    def __init__(self, fields, boundary=None, chunk_size=UPLOAD_CHUNK_SIZE):
+        self.boundary = boundary or choose_boundary()
+        self.content_type = f"multipart/form-data; boundary={self.boundary}"
+        self.chunk_size = chunk_size
+
+        # (offset, data, start, length) of each piece of the body, where data
+        # is either bytes or a file read from ``start``.
+        self._parts = []
+        self._offsets = []
+        self._length = 0
+        self._position = 0
+        self._current = None
+
+        pending = []
+        for field in iter_field_objects(fields):
+            pending.append(f"--{self.boundary}\r\n".encode("latin-1"))
+            pending.append(field.render_headers().encode("utf-8"))
+            data = field.data
+            length = None
+            if hasattr(data, "read"):
+                length = self.streamable_length(data)
+                if length is None:
+                    data = data.read()
+            if length is None:
+                if isinstance(data, int):
+                    data = str(data)
+                if isinstance(data, str):
+                    data = data.encode("utf-8")
+                pending.append(data)
+            else:
+                self._add(b"".join(pending), 0, None)
+                self._add(data, data.tell(), length)
+                pending = []
+            pending.append(b"\r\n")
+        pending.append(f"--{self.boundary}--\r\n".encode("latin-1"))
+        self._add(b"".join(pending), 0, None)
+
+    def __repr__(self):
+        return f"<MultipartEncoder [{self._length} bytes]>"
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        chunk = self.read(self.chunk_size)
+        while chunk:
+            yield chunk
+            chunk = self.read(self.chunk_size)
+
+    @staticmethod
+    def streamable_length(fp):
+        """Returns how many bytes are left to read from ``fp`` if it can be
+        streamed, i.e. is a seekable binary file, or None otherwise.
+        """
+        if isinstance(fp, TextIOBase) or "b" not in getattr(fp, "mode", "b"):
+            return None
+        if not hasattr(fp, "seek"):
+            return None
+        try:
+            fp.tell()
+        except (AttributeError, OSError, UnsupportedOperation):
+            return None
+        return super_len(fp)
+
+    def _add(self, data, start, length):
+        if length is None:
+            length = len(data)
+        if length:
+            self._parts.append((self._length, data, start, length))
+            self._offsets.append(self._length)
+            self._length += length
+
+    def read(self, size=-1):
+        """Reads up to ``size`` bytes of the body, or all that is left.
+
+        :rtype: bytes
+        """
+        if size is None or size < 0:
+            size = self._length - self._position
+        chunks = []
+        while size > 0 and self._position < self._length:
+            index = bisect_right(self._offsets, self._position) - 1
+            offset, data, start, length = self._parts[index]
+            skip = self._position - offset
+            amount = min(size, length - skip)
+            if isinstance(data, (bytes, bytearray)):
+                chunk = bytes(data[skip : skip + amount])
+            else:
+                if self._current != index:
+                    data.seek(start + skip)
+                    self._current = index
+                chunk = data.read(amount)
+                if not chunk:
+                    raise OSError(
+                        f"{data!r} ended {length - skip} bytes short of the "
+                        f"length it had when the request was prepared."
+                    )
+            chunks.append(chunk)
+            self._position += len(chunk)
+            size -= len(chunk)
+        return b"".join(chunks)
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset, whence=0):
+        """Moves to ``offset`` bytes from the start (``whence`` 0), the
+        current position (1) or the end (2) of the body.
+        """
+        if whence == 1:
+            offset += self._position
+        elif whence == 2:
+            offset += self._length
+        elif whence != 0:
+            raise ValueError(f"Invalid whence ({whence!r})")
+        if offset < 0:
+            raise ValueError(f"Negative seek position {offset}")
+        self._position = offset
+        self._current = None
+        return offset
+
+
 class RequestHooksMixin:
     def register_hook(self, event, hook):
         """Properly register a hook."""
@@ -553,6 +755,9 @@ class PreparedRequest(RequestEncodingMixin, RequestHooksMixin):
             # Multi-part file uploads.
             if files:
                 (body, content_type) = self._encode_files(files, data)
+                if isinstance(body, MultipartEncoder):
+                    # Lets redirects and retries rewind the streamed body.
+                    self._body_position = body.tell()
             else:
                 if data:
                     body = self._encode_params(data)
@@ -637,6 +842,47 @@ class PreparedRequest(RequestEncodingMixin, RequestHooksMixin):
             self.register_hook(event, hooks[event])
 
 
+class RedirectRecord:
+    """What a :class:`Session <requests.Session>` whose ``redirect_history``
+    is ``"light"`` keeps of a redirect response in
+    :attr:`Response.history`: its URL, status, reason, headers and elapsed
+    time, without the response itself or its body.
+    """
+
+    __slots__ = ("url", "status_code", "reason", "headers", "elapsed")
+
+    def __init__(self, url, status_code, reason, headers, elapsed):
+        self.url = url
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+        self.elapsed = elapsed
+
+    @classmethod
+    def from_response(cls, response):
+        return cls(
+            response.url,
+            response.status_code,
+            response.reason,
+            response.headers,
+            response.elapsed,
+        )
+
+    def __repr__(self):
+        return f"<RedirectRecord [{self.status_code}] {self.url}>"
+
+    @property
+    def is_redirect(self):
+        return "location" in self.headers and self.status_code in REDIRECT_STATI
+
+    @property
+    def is_permanent_redirect(self):
+        return "location" in self.headers and self.status_code in (
+            codes.moved_permanently,
+            codes.permanent_redirect,
+        )
+
+
 class Response:
     """The :class:`Response <Response>` object, which contains a
     server's response to an HTTP request.
@@ -659,6 +905,8 @@ class Response:
         self._content = False
         self._content_consumed = False
         self._next = None
+        self._read_pending = None
+        self._apparent_encoding = False
 
         #: Integer Code of responded HTTP Status, e.g. 404 or 200.
         self.status_code = None
@@ -679,6 +927,10 @@ class Response:
         #: Encoding to decode with when accessing r.text.
         self.encoding = None
 
+        #: Number of leading bytes of the content that
+        #: :attr:`apparent_encoding` inspects, or None for all of it.
+        self.encoding_detection_limit = ENCODING_DETECTION_LIMIT
+
         #: A list of :class:`Response <Response>` objects from
         #: the history of the Request. Any redirect responses will end
         #: up here. The list is sorted from the oldest to the most recent request.
@@ -698,6 +950,12 @@ class Response:
         #: value of the ``stream`` keyword argument.
         self.elapsed = datetime.timedelta(0)
 
+        #: A :class:`Timings <requests.metrics.Timings>` breakdown of where
+        #: the time of the request went (DNS, connect, TLS, time to first
+        #: byte and body download) and whether its connection was reused,
+        #: or None when the adapter doesn't record one.
+        self.timings = None
+
         #: The :class:`PreparedRequest <PreparedRequest>` object to which this
         #: is a response.
         self.request = None
@@ -723,6 +981,10 @@ class Response:
         # pickled objects do not have .raw
         setattr(self, "_content_consumed", True)
         setattr(self, "raw", None)
+        setattr(self, "_read_pending", None)
+        setattr(self, "timings", None)
+        setattr(self, "_apparent_encoding", False)
+        setattr(self, "encoding_detection_limit", ENCODING_DETECTION_LIMIT)
 
     def __repr__(self):
         return f"<Response [{self.status_code}]>"
@@ -788,9 +1050,32 @@ class Response:
 
     @property
     def apparent_encoding(self):
-        """The apparent encoding, provided by the charset_normalizer or chardet libraries."""
+        """The apparent encoding, provided by the charset_normalizer or chardet libraries.
+
+        Only the first :attr:`encoding_detection_limit` bytes of the content
+        are inspected. An encoding declared by a ``<meta>`` tag or XML
+        declaration in them is used as is; otherwise they are handed to the
+        detection library. The result is computed once per response.
+        """
+        if self._apparent_encoding is False:
+            self._apparent_encoding = self._detect_encoding()
+        return self._apparent_encoding
+
+    def _detect_encoding(self):
+        content = self.content or b""
+        limit = self.encoding_detection_limit
+        sample = content if limit is None else content[:limit]
+
+        encoding = get_declared_encoding(sample)
+        if encoding is not None:
+            return encoding
+
         if chardet is not None:
-            return chardet.detect(self.content)["encoding"]
+            encoding = chardet.detect(sample)["encoding"]
+            if encoding == "ascii" and len(sample) < len(content):
+                # The rest may not be ASCII; UTF-8 decodes ASCII all the same.
+                encoding = "utf-8"
+            return encoding
         else:
             # If no character detection library is available, we'll fall back
             # to a standard Python utf-8 str.
@@ -816,16 +1101,8 @@ class Response:
         def generate():
             # Special case for urllib3.
             if hasattr(self.raw, "stream"):
-                try:
+                with _translate_read_errors():
                     yield from self.raw.stream(chunk_size, decode_content=True)
-                except ProtocolError as e:
-                    raise ChunkedEncodingError(e)
-                except DecodeError as e:
-                    raise ContentDecodingError(e)
-                except ReadTimeoutError as e:
-                    raise ConnectionError(e)
-                except SSLError as e:
-                    raise RequestsSSLError(e)
             else:
                 # Standard file-like object.
                 while True:
@@ -835,6 +1112,7 @@ class Response:
                     yield chunk
 
             self._content_consumed = True
+            self._finish_timings()
 
         if self._content_consumed and isinstance(self._content, bool):
             raise StreamConsumedError()
@@ -854,6 +1132,143 @@ class Response:
 
         return chunks
 
+    def readinto(self, buffer):
+        """Reads the response data into a pre-allocated, writable buffer.
+
+        ``buffer`` may be any object supporting the writable buffer protocol,
+        e.g. a ``bytearray``, an ``mmap`` or a C-contiguous numpy array. The
+        buffer is filled until it is full or the body ends, so fewer bytes
+        than its size are only returned for the final read. Data is decoded
+        just as with :meth:`iter_content`.
+
+        A body without a ``Content-Encoding`` is read from the connection
+        straight into ``buffer``. A body that is decoded is read into a
+        fresh chunk first, which is then copied into ``buffer``.
+
+        Reads continue from where the previous :meth:`readinto` stopped;
+        mixing them with :meth:`iter_content` on the same response is not
+        supported.
+
+        :param buffer: The buffer to fill.
+        :return: The number of bytes written to ``buffer``, ``0`` once the
+            body is exhausted.
+        :rtype: int
+        """
+        with memoryview(buffer) as mv, mv.cast("B") as view:
+            filled = 0
+            while filled < len(view):
+                n = self._readinto(view[filled:])
+                if not n:
+                    break
+                filled += n
+            return filled
+
+    def _readinto(self, view):
+        """Writes at most ``len(view)`` bytes of the body into ``view``.
+
+        :rtype: int
+        """
+        pending = self._read_pending
+        if not pending and self._content_consumed:
+            if pending is not None:
+                return 0
+            if isinstance(self._content, bool):
+                raise StreamConsumedError()
+            # The body has been read already; hand it out again from memory.
+            pending = memoryview(self._content or b"")
+
+        if not pending:
+            fp = _undecoded_fp(self.raw)
+            if fp is not None:
+                # Nothing to decode: http.client fills view straight from the
+                # connection, and urllib3's byte counts are kept up to date.
+                with _translate_read_errors(), self.raw._error_catcher():
+                    n = fp.readinto(view[: 2**31 - 1]) or 0
+                if n:
+                    self.raw._fp_bytes_read += n
+                    if self.raw.length_remaining is not None:
+                        self.raw.length_remaining -= n
+                    return n
+                # The end of the body goes through read() below, so urllib3
+                # checks its length and releases the connection.
+
+            if hasattr(self.raw, "stream"):
+                # urllib3 decodes into a fresh chunk that we copy from. A
+                # decoder may swallow a whole read, so only a closed
+                # connection marks the end of the body.
+                with _translate_read_errors():
+                    pending = self.raw.read(len(view), decode_content=True)
+                    while not pending and not self.raw.closed:
+                        pending = self.raw.read(len(view), decode_content=True)
+            elif hasattr(self.raw, "readinto"):
+                # Standard file-like object; let it write into view directly.
+                n = self.raw.readinto(view) or 0
+                if not n:
+                    self._content_consumed = True
+                    self._read_pending = memoryview(b"")
+                    self._finish_timings()
+                return n
+            else:
+                pending = self.raw.read(len(view))
+
+            if not pending:
+                self._content_consumed = True
+                self._read_pending = memoryview(b"")
+                self._finish_timings()
+                return 0
+            pending = memoryview(pending)
+
+        n = min(len(view), len(pending))
+        view[:n] = pending[:n]
+        self._read_pending = pending[n:]
+        return n
+
+    def iter_content_into(self, buffer):
+        """Iterates over the response data, reusing ``buffer`` for every chunk.
+
+        Each item is a ``memoryview`` of the start of ``buffer`` holding the
+        bytes just read; it is only valid until the next item is requested,
+        as the buffer is then overwritten. See :meth:`readinto` for the
+        buffers that are accepted.
+
+        :param buffer: The buffer to fill.
+        :rtype: generator of memoryview
+        """
+        view = memoryview(buffer).cast("B")
+        if not view:
+            raise ValueError("buffer must not be empty.")
+
+        while True:
+            n = self.readinto(view)
+            if not n:
+                break
+            yield view[:n]
+
+    def save_to(self, path, chunk_size=SAVE_CHUNK_SIZE):
+        """Writes the response data to ``path``.
+
+        The body is streamed through a single ``chunk_size`` buffer, so memory
+        use does not grow with the size of the response.
+
+        :param path: A filesystem path, or a file object opened for writing
+            in binary mode.
+        :param chunk_size: (optional) Size of the buffer in bytes.
+        :return: The number of bytes written.
+        :rtype: int
+        """
+        buffer = bytearray(chunk_size)
+        if hasattr(path, "write"):
+            return self._write_into(path, buffer)
+        with open(path, "wb") as f:
+            return self._write_into(f, buffer)
+
+    def _write_into(self, f, buffer):
+        written = 0
+        for chunk in self.iter_content_into(buffer):
+            f.write(chunk)
+            written += len(chunk)
+        return written
+
     def iter_lines(
         self, chunk_size=ITER_CHUNK_SIZE, decode_unicode=False, delimiter=None
     ):
@@ -979,6 +1394,80 @@ class Response:
             # This aliases json.JSONDecodeError and simplejson.JSONDecodeError
             raise RequestsJSONDecodeError(e.msg, e.doc, e.pos)
 
+    def iter_json(self, path="item", chunk_size=CONTENT_CHUNK_SIZE, **kwargs):
+        r"""Decodes the JSON response body incrementally, yielding the values
+        found at ``path``.
+
+        The body is parsed as it is read from :meth:`iter_content`, and only
+        the values at ``path`` are decoded, so a large document can be
+        consumed with ``stream=True`` without holding it in memory.
+
+        ``path`` is a dotted list of object keys in which ``item`` stands for
+        every element of an array: ``"items.item"`` yields each element of
+        the ``items`` array of the top-level object, the default ``"item"``
+        each element of a top-level array.
+
+        :param path: (optional) Location of the values to yield.
+        :param chunk_size: (optional) Number of bytes read at a time.
+        :param \*\*kwargs: Optional arguments that ``json.loads`` takes.
+        :raises requests.exceptions.JSONDecodeError: If the response body does not
+            contain valid json.
+        :rtype: generator
+        """
+        decoder = self._json_decoder(**kwargs)
+        try:
+            yield from stream_decode_json(
+                self._iter_json_text(chunk_size), path, decoder
+            )
+        except JSONDecodeError as e:
+            raise RequestsJSONDecodeError(e.msg, e.doc, e.pos)
+
+    def iter_ndjson(self, chunk_size=CONTENT_CHUNK_SIZE, **kwargs):
+        r"""Decodes a newline-delimited JSON (JSON Lines) response body,
+        yielding one value per line as it is read. Blank lines are skipped.
+
+        :param chunk_size: (optional) Number of bytes read at a time.
+        :param \*\*kwargs: Optional arguments that ``json.loads`` takes.
+        :raises requests.exceptions.JSONDecodeError: If a line does not
+            contain valid json.
+        :rtype: generator
+        """
+        decoder = self._json_decoder(**kwargs)
+        encoding = self.encoding or "utf-8"
+
+        for line in self.iter_lines(chunk_size=chunk_size):
+            if not line.strip():
+                continue
+            try:
+                value = decoder.decode(line.decode(encoding, errors="replace"))
+            except JSONDecodeError as e:
+                raise RequestsJSONDecodeError(e.msg, e.doc, e.pos)
+            yield value
+
+    def _json_decoder(self, cls=None, **kwargs):
+        """Returns the decoder that ``json.loads`` would use for ``kwargs``."""
+        return (cls or complexjson.JSONDecoder)(**kwargs)
+
+    def _iter_json_text(self, chunk_size):
+        """Iterates over the response data decoded for JSON parsing."""
+        chunks = self.iter_content(chunk_size)
+        encoding = self.encoding
+        head = b""
+
+        if encoding is None:
+            # As in json(), the first bytes tell UTF-8, -16 and -32 apart.
+            for chunk in chunks:
+                head += chunk
+                if len(head) >= 4:
+                    break
+            encoding = guess_json_utf(head) or "utf-8"
+
+        decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        yield decoder.decode(head)
+        for chunk in chunks:
+            yield decoder.decode(chunk)
+        yield decoder.decode(b"", final=True)
+
     @property
     def links(self):
         """Returns the parsed header links of the response, if any."""
@@ -1025,12 +1514,18 @@ class Response:
         if http_error_msg:
             raise HTTPError(http_error_msg, response=self)
 
+    def _finish_timings(self, complete=True):
+        """Marks the end of the response in :attr:`timings`."""
+        if self.timings is not None:
+            self.timings.finish(complete)
+
     def close(self):
         """Releases the connection back to the pool. Once this method has been
         called the underlying ``raw`` object must not be accessed again.
 
         *Note: Should not normally need to be called explicitly.*
         """
+        self._finish_timings(complete=self._content_consumed)
         if not self._content_consumed:
             self.raw.close()
 
@@ -0,0 +1,291 @@
+"""
+requests.retry
+~~~~~~~~~~~~~~
+
+This module provides the retry policies of
+:class:`HTTPAdapter <requests.adapters.HTTPAdapter>` that keep a struggling
+origin from being flooded: a retry budget shared by many requests, a
+:class:`~urllib3.util.retry.Retry` with jittered backoff that draws on it,
+and a per-origin circuit breaker.
+"""
+
+import random
+import threading
+import time
+
+from urllib3.exceptions import MaxRetryError, ResponseError
+from urllib3.util.retry import Retry
+
+
+class RetryBudget:
+    """A token bucket limiting retries to a share of the requests sent.
+
+    Every request adds ``ratio`` tokens and every retry takes one, so that
+    at most about ``ratio`` retries are made per request however many
+    requests fail. ``min_per_second`` tokens are added each second on top,
+    so that a quiet client can still retry, and the bucket never holds more
+    than ``max_tokens``. It starts with one second's worth of them.
+
+    Share one budget between the adapters of a session, or between
+    sessions, to bound the retries they make together::
+
+      >>> import requests
+      >>> from requests.retry import BudgetedRetry, RetryBudget
+      >>> retries = BudgetedRetry(3, budget=RetryBudget(ratio=0.1))
+      >>> s = requests.Session()
+      >>> s.mount('https://', requests.adapters.HTTPAdapter(max_retries=retries))
+      >>> s.mount('http://', requests.adapters.HTTPAdapter(max_retries=retries))
+    """
+
+    def __init__(self, ratio=0.2, min_per_second=1.0, max_tokens=100.0):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+        self._lock = threading.Lock()
+        self._tokens = min(min_per_second, max_tokens)
+        self._updated = time.monotonic()
+
+    def __repr__(self):
+        return f"<RetryBudget [{self.available:.1f} tokens]>"
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._updated = time.monotonic()
+
+    def _refill(self, tokens=0.0):
+        now = time.monotonic()
+        tokens += (now - self._updated) * self.min_per_second
+        self._tokens = min(self.max_tokens, self._tokens + tokens)
+        self._updated = now
+
+    @property
+    def available(self):
+        """The number of retries that can be made right now."""
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def deposit(self):
+        """Records that a request is being sent."""
+        with self._lock:
+            self._refill(self.ratio)
+
+    def withdraw(self):
+        """Takes a token for a retry, if there is one.
+
+        :rtype: bool
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class BudgetedRetry(Retry):
+    """A :class:`~urllib3.util.retry.Retry` whose retries are paid for from
+    a :class:`RetryBudget`, and whose backoff is jittered.
+
+    Once the budget is spent, :meth:`increment` gives up as if the retries
+    were exhausted. With ``jitter``, the backoff before a retry is drawn
+    uniformly between zero and the exponential backoff, so that clients
+    failing together don't retry together.
+
+    :param budget: (optional) The :class:`RetryBudget` to draw on. Without
+        one, retries are only limited by the counts, as with ``Retry``.
+    :param jitter: (optional) Whether to randomize the backoff.
+    """
+
+    def __init__(self, *args, budget=None, jitter=True, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.budget = budget
+        self.jitter = jitter
+
+    def new(self, **kw):
+        kw.setdefault("budget", self.budget)
+        kw.setdefault("jitter", self.jitter)
+        return super().new(**kw)
+
+    def get_backoff_time(self):
+        backoff = super().get_backoff_time()
+        if self.jitter:
+            return random.uniform(0, backoff)
+        return backoff
+
+    def increment(self, method=None, url=None, response=None, error=None, **kwargs):
+        new_retry = super().increment(
+            method, url, response=response, error=error, **kwargs
+        )
+        if self.budget is not None and not self.budget.withdraw():
+            reason = error or ResponseError("retry budget exhausted")
+            raise MaxRetryError(kwargs.get("_pool"), url, reason) from reason
+        return new_retry
+
+
+class _Circuit:
+    """The recent outcomes of the requests to one origin."""
+
+    def __init__(self, buckets):
+        self.state = CircuitBreaker.CLOSED
+        self.opened_at = None
+        # [start, requests, failures] of each slice of the window.
+        self.buckets = [[0.0, 0, 0] for _ in range(buckets)]
+
+
+class CircuitBreaker:
+    """Fails requests fast while an origin's error rate is too high.
+
+    Once at least ``min_requests`` requests were sent to an origin
+    (``scheme://host:port``) within the last ``window`` seconds and
+    ``failure_ratio`` of them failed, the circuit opens: requests to the
+    origin fail with :class:`~requests.exceptions.CircuitOpenError` without
+    being sent. After ``reset_timeout`` seconds a single request is let
+    through; the circuit closes again if it succeeds, and stays open for
+    another ``reset_timeout`` otherwise.
+
+    A request fails when it raises a connection error or timeout, or when
+    its response status is in ``failure_statuses``.
+
+    Usage::
+
+      >>> import requests
+      >>> from requests.retry import CircuitBreaker
+      >>> breaker = CircuitBreaker(failure_ratio=0.5)
+      >>> s = requests.Session()
+      >>> s.mount('https://', requests.adapters.HTTPAdapter(circuit_breaker=breaker))
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    #: Number of slices the window is counted in.
+    buckets = 10
+    # Number of circuits above which idle ones are dropped before adding one.
+    _prune_at = 64
+
+    def __init__(
+        self,
+        failure_ratio=0.5,
+        min_requests=20,
+        window=10.0,
+        reset_timeout=30.0,
+        failure_statuses=frozenset(range(500, 600)),
+    ):
+        self.failure_ratio = failure_ratio
+        self.min_requests = min_requests
+        self.window = window
+        self.reset_timeout = reset_timeout
+        self.failure_statuses = failure_statuses
+        self._lock = threading.Lock()
+        self._circuits = {}
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        state["_circuits"] = {}
+        state.pop("_prune_at", None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _circuit(self, origin, now):
+        circuit = self._circuits.get(origin)
+        if circuit is None:
+            if len(self._circuits) >= self._prune_at:
+                self._prune(now)
+            circuit = self._circuits[origin] = _Circuit(self.buckets)
+        return circuit
+
+    def _prune(self, now):
+        # A closed circuit with no outcome left in the window is the same as
+        # a new one, so it is dropped rather than kept for every origin ever
+        # seen. Pruning again waits until the number of circuits doubles.
+        self._circuits = {
+            origin: circuit
+            for origin, circuit in self._circuits.items()
+            if circuit.state != self.CLOSED
+            or any(
+                count and now - start < self.window
+                for start, count, _ in circuit.buckets
+            )
+        }
+        self._prune_at = max(type(self)._prune_at, 2 * len(self._circuits))
+
+    def allow_request(self, origin):
+        """Returns whether a request to ``origin`` may be sent now.
+
+        :rtype: bool
+        """
+        now = time.monotonic()
+        with self._lock:
+            circuit = self._circuits.get(origin)
+            if circuit is None or circuit.state == self.CLOSED:
+                return True
+            # Let one request through to probe the origin, and another one
+            # if that probe never reported back.
+            if now - circuit.opened_at >= self.reset_timeout:
+                circuit.state = self.HALF_OPEN
+                circuit.opened_at = now
+                return True
+            return False
+
+    def record(self, origin, failed):
+        """Records the outcome of a request sent to ``origin``."""
+        now = time.monotonic()
+        with self._lock:
+            circuit = self._circuit(origin, now)
+            if circuit.state == self.HALF_OPEN:
+                if failed:
+                    circuit.state = self.OPEN
+                    circuit.opened_at = now
+                else:
+                    circuit.state = self.CLOSED
+                    circuit.buckets = _Circuit(self.buckets).buckets
+                return
+
+            width = self.window / self.buckets
+            start = now - now % width
+            bucket = circuit.buckets[int(now // width) % self.buckets]
+            if bucket[0] != start:
+                bucket[:] = [start, 0, 0]
+            bucket[1] += 1
+            bucket[2] += bool(failed)
+
+            if failed and circuit.state == self.CLOSED:
+                requests = failures = 0
+                for bucket_start, count, failed_count in circuit.buckets:
+                    if now - bucket_start < self.window:
+                        requests += count
+                        failures += failed_count
+                if (
+                    requests >= self.min_requests
+                    and failures >= self.failure_ratio * requests
+                ):
+                    circuit.state = self.OPEN
+                    circuit.opened_at = now
+
+    def state(self, origin):
+        """Returns the state of the circuit of ``origin``: ``"closed"``,
+        ``"open"`` or ``"half-open"``.
+
+        :rtype: str
+        """
+        with self._lock:
+            circuit = self._circuits.get(origin)
+            return self.CLOSED if circuit is None else circuit.state
+
+    def reset(self):
+        """Closes every circuit and forgets the recorded outcomes."""
+        with self._lock:
+            self._circuits.clear()
+            self._prune_at = type(self)._prune_at
@@ -6,21 +6,28 @@ This module provides a Session object to manage and persist settings across
 requests (cookies, auth, proxies).
 """
 import os
+import re
 import sys
+import threading
 import time
-from collections import OrderedDict
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from datetime import timedelta
 
+from urllib3.exceptions import HTTPError as _HTTPError
+
 from ._internal_utils import to_native_string
-from .adapters import HTTPAdapter
-from .auth import _basic_auth_str
+from .adapters import DEFAULT_POOLSIZE, HTTPAdapter
+from .auth import HTTPBasicAuth, _basic_auth_str
 from .compat import Mapping, cookielib, urljoin, urlparse
 from .cookies import (
     RequestsCookieJar,
+    _session_cookie_jar,
     cookiejar_from_dict,
     extract_cookies_to_jar,
     merge_cookies,
 )
+from .download import download as _download
 from .exceptions import (
     ChunkedEncodingError,
     ContentDecodingError,
@@ -31,15 +38,22 @@ from .hooks import default_hooks, dispatch_hook
 
 # formerly defined here, reexposed here for backward compatibility
 from .models import (  # noqa: F401
+    CONTENT_CHUNK_SIZE,
     DEFAULT_REDIRECT_LIMIT,
+    ENCODING_DETECTION_LIMIT,
+    REDIRECT_DRAIN_LIMIT,
     REDIRECT_STATI,
+    SAVE_CHUNK_SIZE,
     PreparedRequest,
+    RedirectRecord,
     Request,
 )
 from .status_codes import codes
-from .structures import CaseInsensitiveDict
+from .structures import CaseInsensitiveDict, PrefixDict
 from .utils import (  # noqa: F401
     DEFAULT_PORTS,
+    NETRC_FILES,
+    check_header_validity,
     default_headers,
     get_auth_from_url,
     get_environ_proxies,
@@ -57,6 +71,49 @@ if sys.platform == "win32":
 else:
     preferred_clock = time.time
 
+# Environment variables that feed the proxy, CA bundle and netrc settings a
+# Session caches; the cache is dropped whenever one of them changes.
+_ENVIRONMENT_KEYS = (
+    "http_proxy",
+    "HTTP_PROXY",
+    "https_proxy",
+    "HTTPS_PROXY",
+    "all_proxy",
+    "ALL_PROXY",
+    "no_proxy",
+    "NO_PROXY",
+    "REQUEST_METHOD",
+    "REQUESTS_CA_BUNDLE",
+    "CURL_CA_BUNDLE",
+    "NETRC",
+    "HOME",
+)
+
+# Upper bound on cached entries, so sessions crawling many hosts stay small.
+_ENVIRONMENT_CACHE_SIZE = 1024
+
+# Template paths made only of these characters need no requoting.
+_QUOTED_PATH_RE = re.compile(r"[A-Za-z0-9\-._~!$&'()*+,;=:@/]*\Z")
+
+
+def _netrc_signature():
+    """Identifies the netrc file ``get_netrc_auth`` would read, and its
+    current version, so that edits to it can be noticed.
+    """
+    netrc_file = os.environ.get("NETRC")
+    if netrc_file is not None:
+        netrc_locations = (netrc_file,)
+    else:
+        netrc_locations = (f"~/{f}" for f in NETRC_FILES)
+
+    for f in netrc_locations:
+        try:
+            st = os.stat(os.path.expanduser(f))
+        except OSError:
+            continue
+        return f, st.st_mtime_ns, st.st_size
+    return None
+
 
 def merge_setting(request_setting, session_setting, dict_class=OrderedDict):
     """Determines appropriate setting for a given request, taking into account
@@ -76,7 +133,11 @@ def merge_setting(request_setting, session_setting, dict_class=OrderedDict):
     ):
         return request_setting
 
-    merged_setting = dict_class(to_key_val_list(session_setting))
+    if type(session_setting) is dict_class:
+        # Cheap for a CaseInsensitiveDict, which copies on write.
+        merged_setting = session_setting.copy()
+    else:
+        merged_setting = dict_class(to_key_val_list(session_setting))
     merged_setting.update(to_key_val_list(request_setting))
 
     # Remove keys that are set to None. Extract keys first to avoid altering
@@ -170,27 +231,36 @@ class SessionRedirectMixin:
     ):
         """Receives a Response. Returns a generator of Responses or Requests."""
 
+        mode = getattr(self, "redirect_history", "full")
         hist = []  # keep track of history
+        redirects = 0
 
         url = self.get_redirect_target(resp)
         previous_fragment = urlparse(req.url).fragment
         while url:
             prepared_request = req.copy()
 
-            # Update history and keep track of redirects.
-            # resp.history must ignore the original request in this loop
-            hist.append(resp)
-            resp.history = hist[1:]
-
-            try:
-                resp.content  # Consume socket so it can be released
-            except (ChunkedEncodingError, ContentDecodingError, RuntimeError):
-                resp.raw.read(decode_content=False)
+            # Responses handed back to the caller keep their body.
+            if mode == "full" or yield_requests:
+                # Update history and keep track of redirects.
+                # resp.history must ignore the original request in this loop
+                hist.append(resp)
+                resp.history = hist[1:]
+
+                try:
+                    resp.content  # Consume socket so it can be released
+                except (ChunkedEncodingError, ContentDecodingError, RuntimeError):
+                    resp.raw.read(decode_content=False)
+            else:
+                if mode == "light":
+                    hist.append(RedirectRecord.from_response(resp))
+                self._drain_redirect(resp)
 
-            if len(resp.history) >= self.max_redirects:
+            if redirects >= self.max_redirects:
                 raise TooManyRedirects(
                     f"Exceeded {self.max_redirects} redirects.", response=resp
                 )
+            redirects += 1
 
             # Release the connection back into the pool.
             resp.close()
@@ -274,11 +344,35 @@ class SessionRedirectMixin:
                 )
 
                 extract_cookies_to_jar(self.cookies, prepared_request, resp.raw)
+                if mode != "full":
+                    resp.history = list(hist)
 
                 # extract redirect url, if any, for the next loop
                 url = self.get_redirect_target(resp)
                 yield resp
 
+    def _drain_redirect(self, resp):
+        """Reads and drops the body of the redirect ``resp`` so that its
+        connection can be reused, unless it is longer than
+        ``REDIRECT_DRAIN_LIMIT``; closing the response then closes the
+        connection instead.
+        """
+        raw = resp.raw
+        if resp._content_consumed or raw is None:
+            return
+        # Only urllib3 responses can skip decoding a body nobody will read.
+        kwargs = {"decode_content": False} if hasattr(raw, "release_conn") else {}
+        left = REDIRECT_DRAIN_LIMIT
+        try:
+            while left > 0:
+                chunk = raw.read(min(left, CONTENT_CHUNK_SIZE), **kwargs)
+                if not chunk:
+                    resp._content_consumed = True
+                    return
+                left -= len(chunk)
+        except (_HTTPError, OSError):
+            pass
+
     def rebuild_auth(self, prepared_request, response):
         """When being redirected we may want to strip authentication from the
         request to avoid leaking credentials. This method intelligently removes
@@ -295,7 +389,7 @@ class SessionRedirectMixin:
             del headers["Authorization"]
 
         # .netrc might have more auth for us on our new host.
-        new_auth = get_netrc_auth(url) if self.trust_env else None
+        new_auth = self._get_netrc_auth(url) if self.trust_env else None
         if new_auth is not None:
             prepared_request.prepare_auth(new_auth)
 
@@ -313,7 +407,7 @@ class SessionRedirectMixin:
         """
         headers = prepared_request.headers
         scheme = urlparse(prepared_request.url).scheme
-        new_proxies = resolve_proxies(prepared_request, proxies, self.trust_env)
+        new_proxies = self._resolve_proxies(prepared_request, proxies)
 
         if "Proxy-Authorization" in headers:
             del headers["Proxy-Authorization"]
@@ -385,6 +479,9 @@ class Session(SessionRedirectMixin):
         "stream",
         "trust_env",
         "max_redirects",
+        "redirect_history",
+        "default_encoding",
+        "encoding_detection_limit",
     ]
 
     def __init__(self):
@@ -433,21 +530,49 @@ class Session(SessionRedirectMixin):
         #: 30.
         self.max_redirects = DEFAULT_REDIRECT_LIMIT
 
+        #: What :attr:`Response.history` keeps of the redirects followed:
+        #: ``"full"`` keeps every :class:`Response <Response>` with its
+        #: body read, ``"light"`` a :class:`RedirectRecord
+        #: <requests.models.RedirectRecord>` of each, and ``"none"`` nothing.
+        #: Unless it is ``"full"``, redirect bodies are discarded, and only
+        #: read as far as ``REDIRECT_DRAIN_LIMIT`` to reuse the connection.
+        self.redirect_history = "full"
+
         #: Trust environment settings for proxy configuration, default
         #: authentication and similar.
         self.trust_env = True
 
+        #: Encoding assumed for responses whose headers don't declare one,
+        #: e.g. ``'utf-8'``. When set, :attr:`Response.text` and decoded
+        #: :meth:`Response.iter_content` never run encoding detection.
+        self.default_encoding = None
+
+        #: Number of leading bytes of a response that
+        #: :attr:`Response.apparent_encoding` inspects, or None for all of it.
+        #: This defaults to requests.models.ENCODING_DETECTION_LIMIT, which is
+        #: 64 KiB.
+        self.encoding_detection_limit = ENCODING_DETECTION_LIMIT
+
         #: A CookieJar containing all currently outstanding cookies set on this
         #: session. By default it is a
         #: :class:`RequestsCookieJar <requests.cookies.RequestsCookieJar>`, but
-        #: may be any other ``cookielib.CookieJar`` compatible object.
+        #: may be any other ``cookielib.CookieJar`` compatible object, such as
+        #: an :class:`IndexedCookieJar <requests.cookies.IndexedCookieJar>`
+        #: for sessions that collect many cookies.
         self.cookies = cookiejar_from_dict({})
 
         # Default connection adapters.
-        self.adapters = OrderedDict()
+        self.adapters = PrefixDict()
         self.mount("https://", HTTPAdapter())
         self.mount("http://", HTTPAdapter())
 
+        # Worker pool used by :meth:`map` and :meth:`gather`, created lazily.
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+        # Settings read from the environment, see :meth:`refresh_environment`.
+        self.refresh_environment()
+
     def __enter__(self):
         return self
 
@@ -471,14 +596,12 @@ class Session(SessionRedirectMixin):
             cookies = cookiejar_from_dict(cookies)
 
         # Merge with session cookies
-        merged_cookies = merge_cookies(
-            merge_cookies(RequestsCookieJar(), self.cookies), cookies
-        )
+        merged_cookies = merge_cookies(_session_cookie_jar(self.cookies), cookies)
 
         # Set environment's basic authentication if not explicitly set.
         auth = request.auth
         if self.trust_env and not auth and not self.auth:
-            auth = get_netrc_auth(request.url)
+            auth = self._get_netrc_auth(request.url)
 
         p = PreparedRequest()
         p.prepare(
@@ -497,6 +620,38 @@ class Session(SessionRedirectMixin):
         )
         return p
 
+    def prepare_template(
+        self, method, base_url, headers=None, params=None, auth=None, hooks=None
+    ):
+        """Constructs a :class:`RequestTemplate <RequestTemplate>` for sending
+        many requests that differ only in path, query, body and headers.
+
+        The template validates the URL and headers and merges them with
+        this session's settings once, so that each request made from it
+        only prepares what changes between calls.
+
+        :param method: method for the requests made from the template.
+        :param base_url: URL the paths of the requests are joined to.
+        :param headers: (optional) Dictionary of HTTP Headers to send with
+            every request.
+        :param params: (optional) Dictionary or bytes to be sent in the query
+            string of every request.
+        :param auth: (optional) Auth tuple or callable to enable
+            Basic/Digest/Custom HTTP Auth.
+        :param hooks: (optional) Dictionary mapping hook name to one event or
+            list of events, event must be callable.
+        :rtype: requests.sessions.RequestTemplate
+        """
+        return RequestTemplate(
+            self,
+            method,
+            base_url,
+            headers=headers,
+            params=params,
+            auth=auth,
+            hooks=hooks,
+        )
+
     def request(
         self,
         method,
@@ -681,7 +836,7 @@ class Session(SessionRedirectMixin):
         kwargs.setdefault("verify", self.verify)
         kwargs.setdefault("cert", self.cert)
         if "proxies" not in kwargs:
-            kwargs["proxies"] = resolve_proxies(request, self.proxies, self.trust_env)
+            kwargs["proxies"] = self._resolve_proxies(request, self.proxies)
 
         # It's possible that users might accidentally send a Request object.
         # Guard against that specific failure case.
@@ -705,6 +860,7 @@ class Session(SessionRedirectMixin):
         # Total elapsed time of the request (approximately)
         elapsed = preferred_clock() - start
         r.elapsed = timedelta(seconds=elapsed)
+        self._apply_encoding_policy(r)
 
         # Response manipulation hooks
         r = dispatch_hook("response", hooks, r, **kwargs)
@@ -721,7 +877,13 @@ class Session(SessionRedirectMixin):
         if allow_redirects:
             # Redirect resolving generator.
             gen = self.resolve_redirects(r, request, **kwargs)
-            history = [resp for resp in gen]
+            if self.redirect_history == "full":
+                history = [resp for resp in gen]
+            else:
+                # The last response already carries the history it should.
+                for r in gen:
+                    pass
+                history = []
         else:
             history = []
 
@@ -747,6 +909,243 @@ class Session(SessionRedirectMixin):
 
         return r
 
+    def map(
+        self,
+        requests,
+        ordered=False,
+        per_host=None,
+        cancel_on_error=False,
+        return_exceptions=False,
+        **kwargs,
+    ):
+        r"""Sends many requests concurrently and yields their responses.
+
+        The requests are sent on a worker pool owned by the session, sized to
+        the largest ``pool_maxsize`` of the mounted adapters, so that every
+        worker can hold a pooled connection.
+
+        :param requests: An iterable of :class:`Request <Request>` or
+            :class:`PreparedRequest <PreparedRequest>` objects. Plain requests
+            are prepared with this session's settings.
+        :param ordered: (optional) Yield responses in the order the requests
+            were given instead of in the order they complete.
+        :param per_host: (optional) Maximum number of requests in flight to a
+            single host (``scheme://host:port``) at any time.
+        :param cancel_on_error: (optional) Cancel every request that has not
+            started yet as soon as one of them fails.
+        :param return_exceptions: (optional) Yield the exception raised by a
+            failed request in place of its response instead of raising it.
+        :param \*\*kwargs: Optional arguments that ``request`` takes for
+            sending, i.e. ``timeout``, ``allow_redirects``, ``proxies``,
+            ``stream``, ``verify`` and ``cert``.
+        :rtype: generator of requests.Response
+        """
+        executor = self._get_executor()
+        if per_host is None:
+            futures = [
+                executor.submit(self._send_mapped, request, **kwargs)
+                for request in requests
+            ]
+        else:
+            futures = self._submit_per_host(executor, requests, per_host, kwargs)
+        failures = []
+
+        if cancel_on_error:
+
+            def cancel_pending(future):
+                if not future.cancelled() and future.exception() is not None:
+                    failures.append(future.exception())
+                    for other in futures:
+                        other.cancel()
+
+            for future in futures:
+                future.add_done_callback(cancel_pending)
+
+        try:
+            for future in futures if ordered else as_completed(futures):
+                if future.cancelled():
+                    # Only cancel_on_error cancels work; surface the cause.
+                    if failures and not return_exceptions:
+                        raise failures[0]
+                    continue
+                try:
+                    resp = future.result()
+                except Exception as e:
+                    if not return_exceptions:
+                        raise
+                    yield e
+                else:
+                    yield resp
+        finally:
+            # Don't leave queued work behind if the caller stops early.
+            for future in futures:
+                future.cancel()
+
+    def _submit_per_host(self, executor, requests, per_host, kwargs):
+        """Submits ``requests`` to ``executor`` for :meth:`map`, at most
+        ``per_host`` to a host at a time, and returns a future for each.
+
+        Requests over the limit wait in a queue of their host, not in a
+        worker, and the next one is submitted when one of the host's
+        requests finishes.
+        """
+        hosts = {}  # host -> [requests submitted, deque of (request, future)]
+        lock = threading.Lock()
+
+        def run(request, future):
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                result = self._send_mapped(request, **kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+        def submit(host, request, future):
+            try:
+                work = executor.submit(run, request, future)
+            except RuntimeError as e:  # The session was closed.
+                if future.set_running_or_notify_cancel():
+                    future.set_exception(e)
+                release(host)
+            else:
+                work.add_done_callback(lambda _: release(host))
+
+        def release(host):
+            with lock:
+                state = hosts[host]
+                waiting = state[1]
+                while waiting and waiting[0][1].cancelled():
+                    waiting.popleft()
+                if not waiting:
+                    state[0] -= 1
+                    return
+                request, future = waiting.popleft()
+            submit(host, request, future)
+
+        futures = []
+        for request in requests:
+            parsed = urlparse(request.url)
+            host = (parsed.scheme, parsed.hostname, parsed.port)
+            future = Future()
+            futures.append(future)
+            with lock:
+                state = hosts.setdefault(host, [0, deque()])
+                if state[0] >= per_host:
+                    state[1].append((request, future))
+                    continue
+                state[0] += 1
+            submit(host, request, future)
+        return futures
+
+    def gather(self, requests, **kwargs):
+        r"""Sends many requests concurrently and returns their responses.
+
+        This is :meth:`map` with ``ordered=True``, collected into a list.
+
+        :param requests: An iterable of :class:`Request <Request>` or
+            :class:`PreparedRequest <PreparedRequest>` objects.
+        :param \*\*kwargs: Optional arguments that ``map`` takes.
+        :rtype: list
+        """
+        kwargs["ordered"] = True
+        return list(self.map(requests, **kwargs))
+
+    def _send_mapped(
+        self,
+        request,
+        timeout=None,
+        allow_redirects=True,
+        proxies=None,
+        stream=None,
+        verify=None,
+        cert=None,
+    ):
+        """Prepares (if needed) and sends one request on behalf of :meth:`map`."""
+        if isinstance(request, Request):
+            request = self.prepare_request(request)
+
+        settings = self.merge_environment_settings(
+            request.url, dict(proxies or {}), stream, verify, cert
+        )
+        return self.send(
+            request, timeout=timeout, allow_redirects=allow_redirects, **settings
+        )
+
+    def _get_executor(self):
+        """Returns the session's worker pool, creating it on first use."""
+        with self._executor_lock:
+            if self._executor is None:
+                max_workers = max(
+                    (
+                        getattr(adapter, "_pool_maxsize", DEFAULT_POOLSIZE)
+                        for adapter in self.adapters.values()
+                    ),
+                    default=DEFAULT_POOLSIZE,
+                )
+                self._executor = ThreadPoolExecutor(
+                    max_workers=max_workers, thread_name_prefix="requests"
+                )
+            return self._executor
+
+    def warm_up(self, url, connections=1, timeout=None):
+        """Opens connections to the origin of ``url`` ahead of the requests
+        that will use them, with this session's proxy and TLS settings. See
+        :meth:`HTTPAdapter.warm_up <requests.adapters.HTTPAdapter.warm_up>`.
+
+        :param url: A URL of the origin to connect to.
+        :param connections: (optional) How many connections to open.
+        :param timeout: (optional) Connect timeout, in seconds.
+        :returns: The number of connections opened.
+        :rtype: int
+        """
+        adapter = self.get_adapter(url)
+        if not hasattr(adapter, "warm_up"):
+            return 0
+        settings = self.merge_environment_settings(url, {}, None, None, None)
+        return adapter.warm_up(
+            url,
+            connections,
+            verify=settings["verify"],
+            cert=settings["cert"],
+            proxies=settings["proxies"],
+            timeout=timeout,
+        )
+
+    def download(self, url, path, parts=4, chunk_size=SAVE_CHUNK_SIZE, **kwargs):
+        r"""Downloads ``url`` to the file ``path``, in ``parts`` byte ranges
+        fetched at the same time.
+
+        The length and validators of the file come from a HEAD request. The
+        ranges are then requested concurrently over the session's connection
+        pool and written straight into place in ``path + ".part"``, which is
+        renamed to ``path`` once every byte has arrived. Each response must
+        cover exactly its range of a file of that length, with the same
+        ``ETag``. If the file changes during the download,
+        :class:`~requests.exceptions.DownloadError` is raised.
+
+        The progress of each part is recorded next to the partial file, so
+        calling :meth:`download` again after an interruption only fetches
+        what is missing, provided the file did not change meanwhile. Servers
+        that don't support byte ranges get a single plain request.
+
+        To fetch more than ``pool_maxsize`` parts at once, mount an adapter
+        with a larger pool.
+
+        :param url: URL of the file.
+        :param path: Path of the file to write.
+        :param parts: (optional) Number of ranges to fetch at the same time.
+            Files are not split into parts smaller than 1 MiB.
+        :param chunk_size: (optional) Size of the buffer each part is read
+            through, in bytes.
+        :param \*\*kwargs: Optional arguments that ``request`` takes, such as
+            ``headers``, ``auth`` or ``timeout``.
+        :return: The number of bytes of the file.
+        :rtype: int
+        """
+        return _download(self, url, path, parts, chunk_size, **kwargs)
+
     def merge_environment_settings(self, url, proxies, stream, verify, cert):
         """
         Check the environment and merge it with some settings.
@@ -757,7 +1156,7 @@ class Session(SessionRedirectMixin):
         if self.trust_env:
             # Set environment's proxies.
             no_proxy = proxies.get("no_proxy") if proxies is not None else None
-            env_proxies = get_environ_proxies(url, no_proxy=no_proxy)
+            env_proxies = self._get_environ_proxies(url, no_proxy=no_proxy)
             for k, v in env_proxies.items():
                 proxies.setdefault(k, v)
 
@@ -765,8 +1164,11 @@ class Session(SessionRedirectMixin):
             # and be compatible with cURL.
             if verify is True or verify is None:
                 verify = (
-                    os.environ.get("REQUESTS_CA_BUNDLE")
-                    or os.environ.get("CURL_CA_BUNDLE")
+                    self._environment_cached(
+                        ("verify",),
+                        lambda: os.environ.get("REQUESTS_CA_BUNDLE")
+                        or os.environ.get("CURL_CA_BUNDLE"),
+                    )
                     or verify
                 )
 
@@ -778,21 +1180,105 @@ class Session(SessionRedirectMixin):
 
         return {"proxies": proxies, "stream": stream, "verify": verify, "cert": cert}
 
+    def refresh_environment(self):
+        """Forgets the settings this session has read from the environment.
+
+        Proxies, the CA bundle and netrc credentials taken from the
+        environment are cached per scheme and host, and are re-read on their
+        own when the relevant environment variables or the netrc file change.
+        Call this after changing anything the session can't observe, such as
+        the system proxy configuration on macOS or Windows.
+        """
+        self._environment_cache = {}
+        self._environment_fingerprint = None
+
+    def _environment_cached(self, key, compute):
+        """Returns the cached environment-derived value for ``key``, calling
+        ``compute`` to fill it if the environment changed since it was stored.
+        """
+        fingerprint = tuple(map(os.environ.get, _ENVIRONMENT_KEYS))
+        if (
+            fingerprint != self._environment_fingerprint
+            or len(self._environment_cache) >= _ENVIRONMENT_CACHE_SIZE
+        ):
+            self._environment_cache = {}
+            self._environment_fingerprint = fingerprint
+
+        try:
+            return self._environment_cache[key]
+        except KeyError:
+            value = self._environment_cache[key] = compute()
+            return value
+
+    def _get_environ_proxies(self, url, no_proxy=None):
+        """Cached :func:`get_environ_proxies <requests.utils.get_environ_proxies>`.
+
+        :rtype: dict
+        """
+        parsed = urlparse(url)
+        return self._environment_cached(
+            ("proxies", parsed.scheme, parsed.netloc, no_proxy),
+            lambda: get_environ_proxies(url, no_proxy=no_proxy),
+        )
+
+    def _get_netrc_auth(self, url):
+        """Cached :func:`get_netrc_auth <requests.utils.get_netrc_auth>`."""
+        return self._environment_cached(
+            ("netrc", urlparse(url).hostname, _netrc_signature()),
+            lambda: get_netrc_auth(url),
+        )
+
+    def _resolve_proxies(self, request, proxies):
+        """:func:`resolve_proxies <requests.utils.resolve_proxies>` for this
+        session, using the cached environment proxies.
+
+        :rtype: dict
+        """
+        if not self.trust_env:
+            return resolve_proxies(request, proxies, trust_env=False)
+
+        proxies = proxies if proxies is not None else {}
+        new_proxies = proxies.copy()
+        scheme = urlparse(request.url).scheme
+        environ_proxies = self._get_environ_proxies(
+            request.url, no_proxy=proxies.get("no_proxy")
+        )
+
+        proxy = environ_proxies.get(scheme, environ_proxies.get("all"))
+        if proxy:
+            new_proxies.setdefault(scheme, proxy)
+        return new_proxies
+
+    def _apply_encoding_policy(self, r):
+        """Applies the session's encoding settings to a new response."""
+        if r.encoding is None:
+            r.encoding = self.default_encoding
+        r.encoding_detection_limit = self.encoding_detection_limit
+
     def get_adapter(self, url):
         """
         Returns the appropriate connection adapter for the given URL.
 
         :rtype: requests.adapters.BaseAdapter
         """
-        for prefix, adapter in self.adapters.items():
-            if url.lower().startswith(prefix.lower()):
+        if isinstance(self.adapters, PrefixDict):
+            adapter = self.adapters.match(url)
+            if adapter is not None:
                 return adapter
+        else:
+            for prefix, adapter in self.adapters.items():
+                if url.lower().startswith(prefix.lower()):
+                    return adapter
 
         # Nothing matches :-/
         raise InvalidSchema(f"No connection adapters were found for {url!r}")
 
     def close(self):
         """Closes all adapters and as such the session"""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
         for v in self.adapters.values():
             v.close()
 
@@ -812,9 +1298,180 @@ class Session(SessionRedirectMixin):
         return state
 
     def __setstate__(self, state):
+        self.redirect_history = "full"
+        self.default_encoding = None
+        self.encoding_detection_limit = ENCODING_DETECTION_LIMIT
         for attr, value in state.items():
             setattr(self, attr, value)
 
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self.refresh_environment()
+
+
+class RequestTemplate:
+    """A request prepared once, for sending many requests that differ only
+    in path, query, body and headers. Made by
+    :meth:`Session.prepare_template <Session.prepare_template>`.
+
+    Headers, auth, hooks, proxies and TLS settings are merged with the
+    session's when the template is made; only cookies are taken from the
+    session on every request.
+
+    Usage::
+
+      >>> import requests
+      >>> s = requests.Session()
+      >>> api = s.prepare_template('GET', 'https://httpbin.org',
+      ...                          headers={'Accept': 'application/json'})
+      >>> api.request('anything/1', params={'q': 'x'})
+      <Response [200]>
+    """
+
+    def __init__(
+        self,
+        session,
+        method,
+        base_url,
+        headers=None,
+        params=None,
+        auth=None,
+        hooks=None,
+    ):
+        self.session = session
+
+        p = PreparedRequest()
+        p.prepare_method(method)
+        p.prepare_url(base_url, None)
+        p.prepare_headers(
+            merge_setting(headers, session.headers, dict_class=CaseInsensitiveDict)
+        )
+
+        #: HTTP verb of the requests made from the template.
+        self.method = p.method
+        #: Base URL, without its query string.
+        self.url, _, self._query = p.url.partition("#")[0].partition("?")
+        self._prefix = self.url.rstrip("/") + "/"
+        self._params = p._encode_params(merge_setting(params, session.params))
+        #: Validated headers, copied into every request.
+        self.headers = p.headers
+
+        # Same precedence as Session.prepare_request and prepare_auth.
+        if session.trust_env and not auth and not session.auth:
+            auth = session._get_netrc_auth(p.url)
+        auth = merge_setting(auth, session.auth)
+        if auth is None:
+            url_auth = get_auth_from_url(p.url)
+            auth = url_auth if any(url_auth) else None
+        if isinstance(auth, tuple) and len(auth) == 2:
+            auth = HTTPBasicAuth(*auth)
+        self.auth = auth
+
+        self.hooks = merge_hooks(hooks, session.hooks)
+        self._settings = session.merge_environment_settings(p.url, {}, None, None, None)
+
+    def __repr__(self):
+        return f"<RequestTemplate [{self.method} {self.url}]>"
+
+    def prepare(
+        self, path="", params=None, data=None, json=None, files=None, headers=None
+    ):
+        """Constructs a :class:`PreparedRequest <PreparedRequest>` from the
+        template.
+
+        :param path: (optional) Path joined to the base URL with a single
+            slash. It may carry a query string of its own.
+        :param params: (optional) Dictionary or bytes to be sent in the query
+            string, appended to the template's.
+        :param data: (optional) Dictionary, list of tuples, bytes, or file-like
+            object to send in the body.
+        :param json: (optional) json to send in the body.
+        :param files: (optional) Dictionary of ``'filename': file-like-objects``
+            for multipart encoding upload.
+        :param headers: (optional) Dictionary of HTTP Headers added to the
+            template's; a value of None removes a header.
+        :rtype: requests.PreparedRequest
+        """
+        p = PreparedRequest()
+        p.method = self.method
+
+        url, query = self.url, [self._query]
+        if path:
+            path, _, path_query = path.partition("#")[0].partition("?")
+            if not _QUOTED_PATH_RE.match(path):
+                path = requote_uri(path)
+            url = self._prefix + path.lstrip("/")
+            query.append(requote_uri(path_query))
+        query.append(self._params)
+        if params:
+            if isinstance(params, (str, bytes)):
+                params = to_native_string(params)
+            query.append(p._encode_params(params))
+        query = "&".join(filter(None, query))
+        p.url = f"{url}?{query}" if query else url
+
+        p.headers = self.headers.copy()
+        if headers:
+            for header in headers.items():
+                name, value = header
+                if value is None:
+                    p.headers.pop(name, None)
+                    continue
+                check_header_validity(header)
+                p.headers[to_native_string(name)] = value
+
+        # Copy the session's cookies, as prepare_request does, since
+        # redirects write to the request's jar.
+        if len(self.session.cookies):
+            p.prepare_cookies(_session_cookie_jar(self.session.cookies))
+        else:
+            p._cookies = RequestsCookieJar()
+
+        p.prepare_body(data, files, json)
+        if self.auth is not None:
+            p.prepare_auth(self.auth)
+        p.prepare_hooks(self.hooks)
+        return p
+
+    def request(
+        self,
+        path="",
+        params=None,
+        data=None,
+        json=None,
+        files=None,
+        headers=None,
+        timeout=None,
+        allow_redirects=True,
+        proxies=None,
+        stream=None,
+        verify=None,
+        cert=None,
+    ):
+        """Prepares a request with :meth:`prepare` and sends it through the
+        session. Returns :class:`Response <Response>` object, or a coroutine
+        for an :class:`AsyncSession <requests.AsyncSession>`.
+
+        ``proxies``, ``stream``, ``verify`` and ``cert`` override the
+        settings of the template; the other arguments are those of
+        :meth:`prepare` and :meth:`Session.request <Session.request>`.
+
+        :rtype: requests.Response
+        """
+        p = self.prepare(path, params, data, json, files, headers)
+
+        settings = self._settings
+        if proxies or stream is not None or verify is not None or cert is not None:
+            settings = {
+                "proxies": merge_setting(proxies, settings["proxies"]),
+                "stream": merge_setting(stream, settings["stream"]),
+                "verify": merge_setting(verify, settings["verify"]),
+                "cert": merge_setting(cert, settings["cert"]),
+            }
+        return self.session.send(
+            p, timeout=timeout, allow_redirects=allow_redirects, **settings
+        )
+
 
 def session():
     """
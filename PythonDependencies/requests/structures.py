@@ -5,10 +5,39 @@ requests.structures
 Data structures that power Requests.
 """
 
+import sys
 from collections import OrderedDict
+from collections.abc import ItemsView
+from itertools import chain
 
 from .compat import Mapping, MutableMapping
 
+#: Most keys :func:`_lower` remembers; header names are a small set, but
+#: they may come from the network.
+_LOWER_CACHE_SIZE = 1024
+_lowered = {}
+
+
+def _lower(key):
+    """Returns ``key.lower()``, interned for str keys. Every dict looking up
+    the same name then shares one key object, whose hash is computed once
+    and which compares equal to itself by identity.
+    """
+    lowered = _lowered.get(key)
+    if lowered is None:
+        lowered = key.lower()
+        if type(lowered) is str:
+            lowered = sys.intern(lowered)
+            if len(_lowered) < _LOWER_CACHE_SIZE:
+                _lowered[key] = lowered
+    return lowered
+
+
+class _ItemsView(ItemsView):
+    def __iter__(self):
+        mapping = self._mapping
+        return zip(mapping._keys.values(), mapping._store.values())
+
 
 class CaseInsensitiveDict(MutableMapping):
     """A case-insensitive ``dict``-like object.
@@ -35,46 +64,125 @@ class CaseInsensitiveDict(MutableMapping):
     If the constructor, ``.update``, or equality comparison
     operations are given keys that have equal ``.lower()``s, the
     behavior is undefined.
+
+    A copy shares its storage with the original until either of them is
+    changed, so copying headers that are only read costs next to nothing.
     """
 
+    __slots__ = ("_store", "_keys", "_shared", "__weakref__")
+
     def __init__(self, data=None, **kwargs):
-        self._store = OrderedDict()
-        if data is None:
-            data = {}
-        self.update(data, **kwargs)
+        # Values and actual keys, both by lowercased key.
+        self._store = {}
+        self._keys = {}
+        self._shared = False
+        if data is not None or kwargs:
+            self.update(data or (), **kwargs)
+
+    def _own(self):
+        # Stop sharing storage with copies before changing it.
+        self._store = self._store.copy()
+        self._keys = self._keys.copy()
+        self._shared = False
 
     def __setitem__(self, key, value):
-        # Use the lowercased key for lookups, but store the actual
-        # key alongside the value.
-        self._store[key.lower()] = (key, value)
+        # Use the lowercased key for lookups, but remember the actual key.
+        if self._shared:
+            self._own()
+        lowered = _lower(key)
+        self._store[lowered] = value
+        self._keys[lowered] = key
 
     def __getitem__(self, key):
-        return self._store[key.lower()][1]
+        return self._store[_lower(key)]
 
     def __delitem__(self, key):
-        del self._store[key.lower()]
+        lowered = _lower(key)
+        if lowered not in self._store:
+            raise KeyError(key)
+        if self._shared:
+            self._own()
+        del self._store[lowered]
+        del self._keys[lowered]
+
+    def __contains__(self, key):
+        return _lower(key) in self._store
+
+    def get(self, key, default=None):
+        return self._store.get(_lower(key), default)
 
     def __iter__(self):
-        return (casedkey for casedkey, mappedvalue in self._store.values())
+        return iter(self._keys.values())
 
     def __len__(self):
         return len(self._store)
 
+    def items(self):
+        return _ItemsView(self)
+
+    def clear(self):
+        self._store = {}
+        self._keys = {}
+        self._shared = False
+
+    def update(self, other=(), /, **kwargs):
+        if self._shared:
+            self._own()
+        store = self._store
+        keys = self._keys
+        if isinstance(other, CaseInsensitiveDict):
+            store.update(other._store)
+            keys.update(other._keys)
+            items = kwargs.items()
+        elif isinstance(other, dict):
+            items = chain(other.items(), kwargs.items())
+        elif isinstance(other, Mapping) or hasattr(other, "keys"):
+            # Such as urllib3's HTTPHeaderDict, whose items() has a pair for
+            # every value of a repeated header.
+            items = chain(((key, other[key]) for key in other.keys()), kwargs.items())
+        else:
+            items = chain(other, kwargs.items())
+        for key, value in items:
+            lowered = _lower(key)
+            store[lowered] = value
+            keys[lowered] = key
+
     def lower_items(self):
         """Like iteritems(), but with all lowercase keys."""
-        return ((lowerkey, keyval[1]) for (lowerkey, keyval) in self._store.items())
+        return iter(self._store.items())
 
     def __eq__(self, other):
-        if isinstance(other, Mapping):
+        if not isinstance(other, CaseInsensitiveDict):
+            if not isinstance(other, Mapping):
+                return NotImplemented
             other = CaseInsensitiveDict(other)
-        else:
-            return NotImplemented
         # Compare insensitively
-        return dict(self.lower_items()) == dict(other.lower_items())
+        return self._store == other._store
+
+    __hash__ = None
 
     # Copy is required
     def copy(self):
-        return CaseInsensitiveDict(self._store.values())
+        new = CaseInsensitiveDict.__new__(CaseInsensitiveDict)
+        new._store = self._store
+        new._keys = self._keys
+        new._shared = self._shared = True
+        return new
+
+    def __getstate__(self):
+        return {"_store": self._store, "_keys": self._keys}
+
+    def __setstate__(self, state):
+        self._shared = False
+        if "_keys" in state:
+            self._store = dict(state["_store"])
+            self._keys = dict(state["_keys"])
+        else:
+            # Pickled by a version storing (key, value) by lowercased key.
+            self._store = {}
+            self._keys = {}
+            for key, value in state["_store"].values():
+                self[key] = value
 
     def __repr__(self):
         return str(dict(self.items()))
@@ -97,3 +205,105 @@ class LookupDict(dict):
 
     def get(self, key, default=None):
         return self.__dict__.get(key, default)
+
+
+class PrefixDict(OrderedDict):
+    """An ordered ``dict`` whose keys are string prefixes.
+
+    :meth:`match` finds the first key, in order, that a string starts with,
+    ignoring case. It walks a trie of the keys, so a lookup costs
+    O(len(prefix)) whatever the number of keys; the trie is rebuilt on the
+    first lookup after the dict changes, however it is changed::
+
+      >>> prefixes = PrefixDict({'http://a': 2, 'http://': 1})
+      >>> prefixes.match('http://abc')
+      2
+      >>> prefixes.pop('http://a')
+      2
+      >>> prefixes.match('http://abc')
+      1
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._trie = None
+        super().__init__(*args, **kwargs)
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._trie = None
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._trie = None
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        self._trie = None
+        return value
+
+    def popitem(self, last=True):
+        item = super().popitem(last)
+        self._trie = None
+        return item
+
+    def setdefault(self, key, default=None):
+        value = super().setdefault(key, default)
+        self._trie = None
+        return value
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._trie = None
+
+    def clear(self):
+        super().clear()
+        self._trie = None
+
+    def move_to_end(self, key, last=True):
+        super().move_to_end(key, last)
+        self._trie = None
+
+    def match(self, string, default=None):
+        """Returns the value of the first key that ``string`` starts with."""
+        if not string.isascii():
+            lowered = string.lower()
+            for prefix, value in self.items():
+                if lowered.startswith(prefix.lower()):
+                    return value
+            return default
+
+        node = self._trie
+        if node is None:
+            node = self._trie = self._build_trie()
+
+        best = node.get(None)
+        for char in string:
+            node = node.get(char)
+            if node is None:
+                break
+            found = node.get(None)
+            if found is not None and (best is None or found < best):
+                best = found
+
+        return default if best is None else best[1]
+
+    def _build_trie(self):
+        # Each node maps a character to the next node, with both cases of a
+        # letter leading to the same node, and holds (position, value) of
+        # the key ending there under None. Keys that aren't ASCII once
+        # lowercased can't prefix an ASCII string and are left out.
+        root = {}
+        for position, (prefix, value) in enumerate(self.items()):
+            lowered = prefix.lower()
+            if not lowered.isascii():
+                continue
+
+            node = root
+            for char in lowered:
+                child = node.get(char)
+                if child is None:
+                    child = node[char] = node[char.upper()] = {}
+                node = child
+            node.setdefault(None, (position, value))
+
+        return root
@@ -32,6 +32,7 @@ from ._internal_utils import (  # noqa: F401
     to_native_string,
 )
 from .compat import (
+    JSONDecodeError,
     Mapping,
     basestring,
     bytes,
@@ -501,6 +502,29 @@ def get_encodings_from_content(content):
     )
 
 
+_DECLARED_ENCODING_RES = (
+    re.compile(rb'<meta.*?charset=["\']*(.+?)["\'>]', flags=re.I),
+    re.compile(rb'<meta.*?content=["\']*;?charset=(.+?)["\'>]', flags=re.I),
+    re.compile(rb'^<\?xml.*?encoding=["\']*(.+?)["\'>]'),
+)
+
+
+def get_declared_encoding(content):
+    """Returns the encoding declared by a ``<meta>`` tag or XML declaration
+    in the given bytestring, if Python knows it.
+
+    :param content: bytestring to extract the encoding from.
+    :rtype: str
+    """
+    for declared_re in _DECLARED_ENCODING_RES:
+        for encoding in declared_re.findall(content):
+            try:
+                return codecs.lookup(encoding.decode("ascii").strip()).name
+            except (LookupError, UnicodeDecodeError):
+                continue
+    return None
+
+
 def _parse_content_type_header(header):
     """Returns content type and parameters from given header
 
@@ -868,7 +892,8 @@ def resolve_proxies(request, proxies, trust_env=True):
     no_proxy = proxies.get("no_proxy")
     new_proxies = proxies.copy()
 
-    if trust_env and not should_bypass_proxies(url, no_proxy=no_proxy):
+    if trust_env:
+        # get_environ_proxies is empty when the url bypasses proxies.
         environ_proxies = get_environ_proxies(url, no_proxy=no_proxy)
 
         proxy = environ_proxies.get(scheme, environ_proxies.get("all"))
@@ -976,6 +1001,151 @@ def guess_json_utf(data):
     return None
 
 
+_JSON_TOKEN_RE = re.compile(
+    r'[ \t\n\r]*(?:([\[\]{},:])|("[^"\\]*(?:\\.[^"\\]*)*")|([^ \t\n\r\[\]{},:"]+))'
+)
+_JSON_WHITESPACE_RE = re.compile(r"[ \t\n\r]*")
+_JSON_NUMBER_CHARS = frozenset("0123456789+-.eE")
+
+
+def stream_decode_json(iterator, path, decoder):
+    """Stream decodes the JSON values found at ``path`` in a JSON document.
+
+    ``iterator`` yields the document as str chunks. ``path`` is a dotted list
+    of object keys in which ``item`` stands for every element of an array;
+    ``"items.item"`` yields the elements of the ``items`` array of the
+    top-level object one by one, and an empty path yields the whole
+    document. Values elsewhere in the document are skipped without being
+    decoded, so memory use is bounded by the largest value yielded.
+
+    :param decoder: The ``JSONDecoder`` that decodes every value.
+    :raises JSONDecodeError: If the document is not valid json.
+    """
+    target = path.split(".") if path else []
+    chunks = iter(iterator)
+    buf = ""
+    pos = 0
+    eof = False
+
+    def fill():
+        nonlocal buf, pos, eof
+        for chunk in chunks:
+            if chunk:
+                buf = buf[pos:] + chunk
+                pos = 0
+                return
+        eof = True
+
+    def token(peek=False):
+        # Returns the next token as (group, text), with group 1 for
+        # punctuation, 2 for strings and 3 for other literals; a literal is
+        # only complete once something follows it.
+        nonlocal pos
+        while True:
+            match = _JSON_TOKEN_RE.match(buf, pos)
+            if match is not None:
+                group = match.lastindex
+                if group != 3 or match.end() < len(buf) or eof:
+                    if not peek:
+                        pos = match.end()
+                    return group, match.group(group)
+            if eof:
+                if _JSON_WHITESPACE_RE.match(buf, pos).end() == len(buf):
+                    return None, None
+                raise JSONDecodeError("Expecting value", buf, pos)
+            fill()
+
+    def expect(text, message):
+        if token()[1] != text:
+            raise JSONDecodeError(message, buf, pos)
+
+    def value():
+        nonlocal pos
+        while True:
+            pos = _JSON_WHITESPACE_RE.match(buf, pos).end()
+            try:
+                obj, end = decoder.raw_decode(buf, pos)
+            except JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                # A number only ends where something else starts.
+                if eof or (end < len(buf) and buf[end] not in _JSON_NUMBER_CHARS):
+                    pos = end
+                    return obj
+            # Incomplete; wait for twice as much of it so that a large value
+            # is only rescanned a logarithmic number of times.
+            wanted = 2 * (len(buf) - pos) + 1
+            while not eof and len(buf) - pos < wanted:
+                fill()
+
+    def skip(group, text):
+        depth = 0
+        while True:
+            if group is None:
+                raise JSONDecodeError("Expecting value", buf, pos)
+            if text in ("[", "{"):
+                depth += 1
+            elif text in ("]", "}"):
+                depth -= 1
+            if depth <= 0:
+                return
+            group, text = token()
+
+    def walk(prefix):
+        if prefix == target:
+            yield value()
+            return
+
+        group, text = token()
+        if prefix != target[: len(prefix)]:
+            skip(group, text)
+        elif text == "{":
+            if token(peek=True)[1] == "}":
+                token()
+                return
+            while True:
+                group, text = token()
+                if group != 2:
+                    raise JSONDecodeError(
+                        "Expecting property name enclosed in double quotes", buf, pos
+                    )
+                expect(":", "Expecting ':' delimiter")
+                member = prefix + [decoder.decode(text)]
+                if member == target:
+                    yield value()
+                else:
+                    yield from walk(member)
+                group, text = token()
+                if text == "}":
+                    return
+                if text != ",":
+                    raise JSONDecodeError("Expecting ',' delimiter", buf, pos)
+        elif text == "[":
+            if token(peek=True)[1] == "]":
+                token()
+                return
+            item = prefix + ["item"]
+            while True:
+                # Values at the target are decoded here, saving a generator
+                # per array element.
+                if item == target:
+                    yield value()
+                else:
+                    yield from walk(item)
+                group, text = token()
+                if text == "]":
+                    return
+                if text != ",":
+                    raise JSONDecodeError("Expecting ',' delimiter", buf, pos)
+        elif group is None or group == 1:
+            raise JSONDecodeError("Expecting value", buf, pos)
+
+    yield from walk([])
+    if token()[0] is not None:
+        raise JSONDecodeError("Extra data", buf, pos)
+
+
 def prepend_scheme_if_needed(url, new_scheme):
     """Given a URL that may or may not have a scheme, prepend the given scheme.
     Does not replace a present scheme with the one provided as an argument.
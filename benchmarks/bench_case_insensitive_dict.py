@@ -0,0 +1,97 @@
+"""
+Times CaseInsensitiveDict on the paths that create and read headers.
+
+Covers the dict on its own (building, lookups, copying), request
+preparation through Session.prepare_request, and HTTPAdapter.build_response
+followed by typical response header reads. Nothing is sent.
+
+Usage::
+
+    python benchmarks/bench_case_insensitive_dict.py [--number N]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "..", "PythonDependencies"
+    ),
+)
+
+import requests  # noqa: E402
+from requests.structures import CaseInsensitiveDict  # noqa: E402
+from urllib3 import HTTPResponse  # noqa: E402
+
+REQUEST_HEADERS = {"Accept": "application/json", "Authorization": "Bearer 0123456789"}
+RESPONSE_HEADERS = {
+    "Date": "Sun, 18 Oct 2026 03:00:00 GMT",
+    "Content-Type": "application/json; charset=utf-8",
+    "Content-Length": "1024",
+    "Connection": "keep-alive",
+    "Cache-Control": "private, max-age=0",
+    "ETag": '"0123456789abcdef"',
+    "Vary": "Accept-Encoding",
+    "Server": "nginx",
+    "Strict-Transport-Security": "max-age=31536000",
+    "X-Request-Id": "f0e1d2c3b4a5",
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    session = requests.Session()
+    session.trust_env = False
+    adapter = session.get_adapter("https://")
+    request = requests.Request(
+        "GET", "https://api.example.com/v1/users/42", headers=REQUEST_HEADERS
+    )
+    prepared = session.prepare_request(request)
+    headers = CaseInsensitiveDict(RESPONSE_HEADERS)
+
+    def lookups():
+        headers["content-type"]
+        headers["Content-Length"]
+        headers.get("etag")
+        "set-cookie" in headers
+
+    def copy_and_set():
+        copied = headers.copy()
+        copied["X-Trace"] = "1"
+
+    def build_response():
+        raw = HTTPResponse(
+            body=b"", headers=RESPONSE_HEADERS, status=200, preload_content=False
+        )
+        response = adapter.build_response(prepared, raw)
+        response.headers.get("content-type")
+        response.headers.get("content-encoding")
+        response.headers.get("location")
+        response.headers.get("set-cookie")
+
+    cases = {
+        "construct": lambda: CaseInsensitiveDict(RESPONSE_HEADERS),
+        "lookups": lookups,
+        "copy": headers.copy,
+        "copy+set": copy_and_set,
+        "lower_items": lambda: dict(headers.lower_items()),
+        "equal": lambda: headers == RESPONSE_HEADERS,
+        "prepare": lambda: session.prepare_request(request),
+        "build_response": build_response,
+    }
+
+    print(f"{'case':<16} {'time':>10}")
+    for name, func in cases.items():
+        best = min(timeit.repeat(func, number=args.number, repeat=args.repeat))
+        print(f"{name:<16} {best / args.number * 1e6:>8.2f}us")
+
+
+if __name__ == "__main__":
+    main()
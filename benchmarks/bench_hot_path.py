@@ -0,0 +1,313 @@
+"""
+Measures the request/response hot path of requests against a loopback server.
+
+Reports requests per second for small GETs over one keep-alive connection,
+streaming throughput in MB/s for several iter_content chunk sizes and for
+iter_lines, the peak memory allocated while reading a large body whole and
+streamed, and the CPU cost of the stages every request goes through
+(preparation, merge_setting, CaseInsensitiveDict, requote_uri, cookie
+extraction, build_response, iter_content and iter_lines), without I/O.
+
+The server runs in a separate process with http.server, so the request
+rates say more about changes between two runs than about requests itself.
+
+Results can be written as JSON with --json and compared with an earlier
+run, e.g. of another version, with --compare.
+
+Usage::
+
+    python benchmarks/bench_hot_path.py [--json results.json]
+    python benchmarks/bench_hot_path.py --compare results.json
+"""
+
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import time
+import timeit
+import tracemalloc
+from http.client import parse_headers
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "..", "PythonDependencies"
+    ),
+)
+
+import requests  # noqa: E402
+from requests.cookies import RequestsCookieJar, extract_cookies_to_jar  # noqa: E402
+from requests.sessions import merge_setting  # noqa: E402
+from requests.structures import CaseInsensitiveDict  # noqa: E402
+from requests.utils import requote_uri  # noqa: E402
+from urllib3 import HTTPResponse  # noqa: E402
+
+MIB = 1024 * 1024
+SMALL_BODY = b'{"id": 42, "name": "example"}'
+LINE = b"x" * 79 + b"\n"
+BLOCK = bytes(range(256)) * (MIB // 256)
+REQUEST_HEADERS = {"Accept": "application/json", "Authorization": "Bearer 0123456789"}
+RESPONSE_HEADERS = {
+    "Date": "Sun, 18 Oct 2026 03:00:00 GMT",
+    "Content-Type": "application/json; charset=utf-8",
+    "Content-Length": "1024",
+    "Connection": "keep-alive",
+    "Cache-Control": "private, max-age=0",
+    "ETag": '"0123456789abcdef"',
+    "Vary": "Accept-Encoding",
+    "Server": "nginx",
+}
+SET_COOKIE = (
+    b"Set-Cookie: session=0123456789abcdef; Path=/; HttpOnly; Secure\r\n"
+    b"Set-Cookie: theme=dark; Path=/; Max-Age=31536000\r\n"
+    b"Set-Cookie: tracking=1; Domain=.example.com; Path=/\r\n\r\n"
+)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately.
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        kind, _, size = self.path.strip("/").partition("/")
+        if kind == "bytes":
+            self._send(int(size), BLOCK)
+        elif kind == "lines":
+            self._send(int(size), LINE * (MIB // len(LINE)))
+        else:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(SMALL_BODY)))
+            self.end_headers()
+            self.wfile.write(SMALL_BODY)
+
+    def _send(self, size, block):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(size))
+        self.end_headers()
+        view = memoryview(block)
+        while size > 0:
+            self.wfile.write(view[: min(size, len(view))])
+            size -= len(view)
+
+
+def _serve(conn):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    conn.send(server.server_address[1])
+    server.serve_forever()
+
+
+def _best(func, number, repeat, timer=time.perf_counter):
+    return min(timeit.repeat(func, number=number, repeat=repeat, timer=timer))
+
+
+def bench_requests(session, base, args, record):
+    url = base + "/small"
+    session.get(url)  # Opens the connection.
+
+    def get():
+        session.get(url).content
+
+    best = _best(get, args.requests, args.repeat)
+    record("get_small", args.requests / best, "req/s", "higher")
+
+
+def bench_streaming(session, base, args, record):
+    size = args.stream_size * MIB
+    url = f"{base}/bytes/{size}"
+
+    def throughput(consume):
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            with session.get(url, stream=True) as r:
+                consume(r)
+            best = min(best, time.perf_counter() - start)
+        return size / 1e6 / best
+
+    for chunk_size in args.chunk_sizes:
+
+        def consume(r):
+            for _ in r.iter_content(chunk_size):
+                pass
+
+        mbps = throughput(consume)
+        record(f"iter_content_{chunk_size}", mbps, "MB/s", "higher")
+
+    def consume_lines(r):
+        for _ in r.iter_lines():
+            pass
+
+    url = f"{base}/lines/{size}"
+    record("iter_lines", throughput(consume_lines), "MB/s", "higher")
+
+
+def bench_memory(session, base, args, record):
+    url = f"{base}/bytes/{args.large_size * MIB}"
+
+    def peak(read):
+        tracemalloc.start()
+        try:
+            read()
+            return tracemalloc.get_traced_memory()[1] / MIB
+        finally:
+            tracemalloc.stop()
+
+    def whole():
+        session.get(url).content
+
+    def streamed():
+        with session.get(url, stream=True) as r:
+            for _ in r.iter_content(64 * 1024):
+                pass
+
+    record("peak_content", peak(whole), "MiB", "lower")
+    record("peak_iter_content", peak(streamed), "MiB", "lower")
+
+
+def bench_stages(session, args, record):
+    url = "https://api.example.com/v1/search?q=café au lait&page=2"
+    request = requests.Request("GET", url, headers=REQUEST_HEADERS)
+    prepared = session.prepare_request(request)
+    adapter = session.get_adapter("https://")
+    request_headers = CaseInsensitiveDict(REQUEST_HEADERS)
+    response_headers = CaseInsensitiveDict(RESPONSE_HEADERS)
+    raw_cookies = SimpleNamespace(
+        _original_response=SimpleNamespace(msg=parse_headers(io.BytesIO(SET_COOKIE)))
+    )
+    cookie_request = requests.Request("GET", "https://www.example.com/").prepare()
+    body = BLOCK
+    lines = LINE * (MIB // len(LINE))
+
+    def prepare():
+        requests.Request("GET", url, headers=REQUEST_HEADERS).prepare()
+
+    def build_response():
+        raw = HTTPResponse(
+            body=b"", headers=RESPONSE_HEADERS, status=200, preload_content=False
+        )
+        adapter.build_response(prepared, raw)
+
+    def extract_cookies():
+        extract_cookies_to_jar(RequestsCookieJar(), cookie_request, raw_cookies)
+
+    def in_memory(data):
+        response = requests.Response()
+        response.raw = io.BytesIO(data)
+        return response
+
+    def iter_content():
+        for _ in in_memory(body).iter_content(64 * 1024):
+            pass
+
+    def iter_lines():
+        for _ in in_memory(lines).iter_lines():
+            pass
+
+    stages = {
+        "prepare": (prepare, 1),
+        "prepare_request": (lambda: session.prepare_request(request), 1),
+        "merge_setting": (
+            lambda: merge_setting(
+                request_headers, session.headers, dict_class=CaseInsensitiveDict
+            ),
+            1,
+        ),
+        "cid_construct": (lambda: CaseInsensitiveDict(RESPONSE_HEADERS), 1),
+        "cid_copy_set": (lambda: response_headers.copy().update(Vary="*"), 1),
+        "requote_uri": (lambda: requote_uri(url), 1),
+        "extract_cookies": (extract_cookies, 1),
+        "build_response": (build_response, 1),
+        "iter_content_1mib": (iter_content, 100),
+        "iter_lines_1mib": (iter_lines, 100),
+    }
+    for name, (func, divisor) in stages.items():
+        number = max(1, args.number // divisor)
+        best = _best(func, number, args.repeat, timer=time.process_time)
+        record(f"cpu_{name}", best / number * 1e6, "us", "lower")
+
+
+def compare(results, baseline):
+    print(f"{'benchmark':<26} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, result in results.items():
+        old = baseline.get(name)
+        if old is None or not old["value"]:
+            continue
+        change = result["value"] / old["value"] - 1
+        if result["better"] == "lower":
+            change = -change
+        print(
+            f"{name:<26} {old['value']:>12.2f} {result['value']:>12.2f} "
+            f"{change:>+7.1%}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--stream-size", type=int, default=64, metavar="MIB")
+    parser.add_argument("--large-size", type=int, default=32, metavar="MIB")
+    parser.add_argument(
+        "--chunk-sizes",
+        type=lambda value: [int(size) for size in value.split(",")],
+        default=[1024, 8192, 65536, MIB],
+    )
+    parser.add_argument("--json", metavar="PATH", help="write the results here")
+    parser.add_argument("--compare", metavar="PATH", help="an earlier --json file")
+    args = parser.parse_args()
+
+    results = {}
+
+    def record(name, value, unit, better):
+        results[name] = {"value": value, "unit": unit, "better": better}
+        if not args.compare:
+            print(f"{name:<26} {value:>12.2f} {unit}")
+
+    parent, child = multiprocessing.Pipe()
+    server = multiprocessing.Process(target=_serve, args=(child,), daemon=True)
+    server.start()
+    try:
+        base = f"http://127.0.0.1:{parent.recv()}"
+        with requests.Session() as session:
+            session.trust_env = False
+            bench_requests(session, base, args, record)
+            bench_streaming(session, base, args, record)
+            bench_memory(session, base, args, record)
+            bench_stages(session, args, record)
+    finally:
+        server.terminate()
+        server.join()
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f)["results"])
+    if args.json:
+        report = {
+            "requests": requests.__version__,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "args": vars(args),
+            "results": results,
+        }
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+
+
+if __name__ == "__main__":
+    main()
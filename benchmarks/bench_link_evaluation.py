@@ -0,0 +1,270 @@
+"""
+Times how pip filters and ranks the files of projects with many wheels.
+
+For each project, every link of its index page goes through
+LinkEvaluator.evaluate_link and the candidates found through
+CandidateEvaluator.compute_best_candidate, as when pip looks for the best
+version to install. Links are parsed before timing and nothing is fetched
+while timing.
+
+The pages are Simple API JSON pages read from --pages, one <project>.json
+file per project, which --download saves from PyPI. Without --pages, pages
+shaped like those of numpy, scipy, grpcio and boto3 are generated.
+
+Results can be written as JSON with --json and compared with an earlier
+run, e.g. of another version, with --compare.
+
+This imports the pip in PythonDependencies, which must be a complete copy of
+pip: the vendored tree leaves out pip._internal.operations.build, which the
+index modules import, and the benchmark stops with an error until it is
+restored from the same pip release.
+
+Usage::
+
+    python benchmarks/bench_link_evaluation.py --download pages/
+    python benchmarks/bench_link_evaluation.py [--pages pages/] [--json results.json]
+    python benchmarks/bench_link_evaluation.py --compare results.json
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import sys
+import time
+import urllib.request
+
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "..", "PythonDependencies"
+    ),
+)
+
+if importlib.util.find_spec("pip._internal.operations.build") is None:
+    sys.exit(
+        "The pip in PythonDependencies lacks pip._internal.operations.build; "
+        "copy it from the same pip release before running this benchmark."
+    )
+
+import pip  # noqa: E402
+from pip._internal.index.collector import IndexContent, parse_links  # noqa: E402
+from pip._internal.index.package_finder import (  # noqa: E402
+    CandidateEvaluator,
+    LinkEvaluator,
+    LinkType,
+)
+from pip._internal.models import candidate, wheel  # noqa: E402
+from pip._internal.models.candidate import InstallationCandidate  # noqa: E402
+from pip._internal.models.target_python import TargetPython  # noqa: E402
+
+SIMPLE_JSON = "application/vnd.pypi.simple.v1+json"
+PROJECTS = ["numpy", "scipy", "grpcio", "boto3", "botocore", "pandas", "torch"]
+TARGETS = {
+    "host": {},
+    "linux": {
+        "platforms": ["manylinux_2_28_x86_64"],
+        "py_version_info": (3, 12),
+        "implementation": "cp",
+    },
+}
+
+LINUX = [
+    "manylinux_2_17_x86_64.manylinux2014_x86_64",
+    "manylinux_2_17_aarch64.manylinux2014_aarch64",
+    "manylinux_2_5_i686.manylinux1_i686",
+    "musllinux_1_1_x86_64",
+    "musllinux_1_1_aarch64",
+]
+MACOS = ["macosx_10_9_x86_64", "macosx_11_0_arm64", "macosx_10_9_universal2"]
+WINDOWS = ["win32", "win_amd64", "win_arm64"]
+LINUX_ARM = ["linux_armv7l", "manylinux_2_17_s390x", "manylinux_2_17_ppc64le"]
+
+
+def _generated_files(name, versions, pythons, platforms, sdist=True):
+    files = []
+    for version in versions:
+        if sdist:
+            files.append(f"{name}-{version}.tar.gz")
+        for python in pythons:
+            tag = python if python.startswith("py") else f"{python}-{python}"
+            if python.startswith("py"):
+                files.append(f"{name}-{version}-{tag}-none-any.whl")
+                continue
+            for plat in platforms:
+                files.append(f"{name}-{version}-{tag}-{plat}.whl")
+    return files
+
+
+def generated_pages():
+    """Pages with the shape, if not the exact files, of big projects."""
+    cpythons = [f"cp3{minor}" for minor in range(7, 14)]
+    projects = {
+        "numpy": _generated_files(
+            "numpy",
+            [f"1.{minor}.{patch}" for minor in range(15, 27) for patch in range(6)]
+            + [f"2.{minor}.{patch}" for minor in range(3) for patch in range(4)],
+            cpythons,
+            LINUX + MACOS + WINDOWS,
+        ),
+        "scipy": _generated_files(
+            "scipy",
+            [f"1.{minor}.{patch}" for minor in range(2, 16) for patch in range(4)],
+            cpythons,
+            LINUX + MACOS + WINDOWS[:2],
+        ),
+        "grpcio": _generated_files(
+            "grpcio",
+            [f"1.{minor}.{patch}" for minor in range(30, 71) for patch in range(2)],
+            cpythons,
+            LINUX + MACOS + WINDOWS[:2] + LINUX_ARM,
+        ),
+        "boto3": _generated_files(
+            "boto3",
+            [f"1.{minor}.{patch}" for minor in range(20, 36) for patch in range(110)],
+            ["py3"],
+            [],
+        ),
+    }
+    for name, filenames in projects.items():
+        files = [
+            {
+                "filename": filename,
+                "url": f"https://files.example.org/packages/{filename}",
+                "hashes": {"sha256": format(index, "064x")},
+                "requires-python": ">=3.7",
+            }
+            for index, filename in enumerate(filenames)
+        ]
+        yield name, json.dumps({"files": files}).encode()
+
+
+def saved_pages(directory):
+    for filename in sorted(os.listdir(directory)):
+        if filename.endswith(".json"):
+            with open(os.path.join(directory, filename), "rb") as f:
+                yield filename[: -len(".json")], f.read()
+
+
+def download(directory, projects, index_url):
+    os.makedirs(directory, exist_ok=True)
+    for project in projects:
+        request = urllib.request.Request(
+            f"{index_url.rstrip('/')}/{project}/", headers={"Accept": SIMPLE_JSON}
+        )
+        with urllib.request.urlopen(request) as response:
+            content = response.read()
+        with open(os.path.join(directory, f"{project}.json"), "wb") as f:
+            f.write(content)
+        count = len(json.loads(content)["files"])
+        print(f"saved {project} ({count} files)")
+
+
+def clear_caches():
+    # Filenames and versions may be memoized, which the first lookup of a
+    # project in a pip run doesn't benefit from.
+    for module in (candidate, wheel):
+        for value in vars(module).values():
+            if hasattr(value, "cache_clear"):
+                value.cache_clear()
+
+
+def evaluate(name, links, target_python):
+    link_evaluator = LinkEvaluator(
+        project_name=name,
+        canonical_name=name,
+        formats=frozenset(["binary", "source"]),
+        target_python=target_python,
+        allow_yanked=True,
+    )
+    candidates = []
+    for link in links:
+        result, detail = link_evaluator.evaluate_link(link)
+        if result == LinkType.candidate:
+            candidates.append(InstallationCandidate(name, detail, link))
+    candidate_evaluator = CandidateEvaluator.create(
+        project_name=name, target_python=target_python
+    )
+    return candidate_evaluator.compute_best_candidate(candidates)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--pages", metavar="DIR", help="saved Simple API pages")
+    parser.add_argument("--download", metavar="DIR", help="save pages here")
+    parser.add_argument("--index-url", default="https://pypi.org/simple")
+    parser.add_argument("--projects", default=",".join(PROJECTS))
+    parser.add_argument("--json", metavar="PATH", help="write the results here")
+    parser.add_argument("--compare", metavar="PATH", help="an earlier --json file")
+    args = parser.parse_args()
+
+    if args.download:
+        download(args.download, args.projects.split(","), args.index_url)
+        return
+
+    pages = saved_pages(args.pages) if args.pages else generated_pages()
+    projects = {}
+    for name, content in pages:
+        page = IndexContent(
+            content, SIMPLE_JSON, None, f"https://pypi.org/simple/{name}/"
+        )
+        projects[name] = list(parse_links(page))
+
+    results = {}
+
+    def record(name, value, unit, better):
+        results[name] = {"value": value, "unit": unit, "better": better}
+        if not args.compare:
+            print(f"{name:<26} {value:>12.2f} {unit}")
+
+    for target, kwargs in TARGETS.items():
+        best = {name: float("inf") for name in projects}
+        best_tags = float("inf")
+        for _ in range(args.repeat):
+            clear_caches()
+            start = time.perf_counter()
+            target_python = TargetPython(**kwargs)
+            target_python.get_sorted_tags()
+            best_tags = min(best_tags, time.perf_counter() - start)
+            for name, links in projects.items():
+                start = time.perf_counter()
+                evaluate(name, links, target_python)
+                best[name] = min(best[name], time.perf_counter() - start)
+        record(f"{target}_tags", best_tags * 1e3, "ms", "lower")
+        for name, seconds in best.items():
+            files = len(projects[name])
+            record(f"{target}_{name}_{files}", seconds * 1e3, "ms", "lower")
+        record(f"{target}_total", sum(best.values()) * 1e3, "ms", "lower")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        print(f"{'benchmark':<26} {'baseline':>12} {'current':>12} {'change':>8}")
+        for name, result in results.items():
+            old = baseline.get(name)
+            if old is None or not old["value"]:
+                continue
+            change = old["value"] / result["value"] - 1
+            print(
+                f"{name:<26} {old['value']:>12.2f} {result['value']:>12.2f} "
+                f"{change:>+7.1%}"
+            )
+    if args.json:
+        report = {
+            "pip": pip.__version__,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "args": vars(args),
+            "results": results,
+        }
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+
+
+if __name__ == "__main__":
+    main()
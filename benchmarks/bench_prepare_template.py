@@ -0,0 +1,75 @@
+"""
+Compares the per-request cost of Session.prepare_request and RequestTemplate.
+
+The template is made once with Session.prepare_template; both sides prepare
+the same requests without sending them.
+
+Usage::
+
+    python benchmarks/bench_prepare_template.py [--number N]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "..", "PythonDependencies"
+    ),
+)
+
+import requests  # noqa: E402
+
+BASE_URL = "https://api.example.com/v1"
+HEADERS = {"Accept": "application/json", "Authorization": "Bearer 0123456789abcdef"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    session = requests.Session()
+    session.trust_env = False
+    template = session.prepare_template("GET", BASE_URL, headers=HEADERS)
+    post = session.prepare_template("POST", BASE_URL, headers=HEADERS)
+
+    def prepare(method, path, **kwargs):
+        request = requests.Request(method, BASE_URL + path, headers=HEADERS, **kwargs)
+        return session.prepare_request(request)
+
+    params = {"q": "term", "page": 2}
+    event = {"id": 1, "kind": "click"}
+    cases = {
+        "get": (
+            lambda: prepare("GET", "/users/42"),
+            lambda: template.prepare("users/42"),
+        ),
+        "get+params": (
+            lambda: prepare("GET", "/search", params=params),
+            lambda: template.prepare("search", params=params),
+        ),
+        "post+json": (
+            lambda: prepare("POST", "/events", json=event),
+            lambda: post.prepare("events", json=event),
+        ),
+    }
+
+    print(f"{'case':<12} {'prepare_request':>16} {'template':>10} {'saved':>8}")
+    for name, (baseline, templated) in cases.items():
+        results = []
+        for func in (baseline, templated):
+            best = min(timeit.repeat(func, number=args.number, repeat=args.repeat))
+            results.append(best / args.number * 1e6)
+        before, after = results
+        print(
+            f"{name:<12} {before:>14.2f}us {after:>8.2f}us {1 - after / before:>7.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()